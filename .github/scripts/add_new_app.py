@@ -6,7 +6,7 @@ This script:
 1. Parses the comment for specific cask names (/approve cask1, cask2)
 2. Or extracts app names from issue title/body
 3. Searches Homebrew for each app
-4. Adds all found apps to the appropriate lists in collect_app_info.py
+4. Adds all found apps to .github/catalog.jsonl with their packaging type
 5. Outputs the results for the GitHub Action
 """
 
@@ -17,6 +17,8 @@ import json
 import requests
 from difflib import SequenceMatcher
 
+from catalog_manifest import CATALOG_FILE, CatalogManifest
+
 # Cache for the Homebrew cask list
 _cask_list_cache = None
 
@@ -287,52 +289,9 @@ def determine_app_type(homebrew_data):
     print(f"Warning: Could not determine app type for URL: {url}")
     return 'homebrew_cask_urls', 'dmg'
 
-def check_app_exists(cask_name, script_content):
+def check_app_exists(cask_name, catalog):
     """Check if the app already exists in any of the lists."""
-    pattern = rf'formulae\.brew\.sh/api/cask/{re.escape(cask_name)}\.json'
-    return bool(re.search(pattern, script_content))
-
-def add_url_to_list(script_path, list_name, cask_name, lines):
-    """Add the Homebrew URL to the appropriate list. Modifies lines in place."""
-    url_to_add = f'    "https://formulae.brew.sh/api/cask/{cask_name}.json",\n'
-
-    list_start_pattern = rf'^{re.escape(list_name)}\s*=\s*\['
-    list_start_line = -1
-    in_target_list = False
-    last_url_line = -1
-    bracket_count = 0
-
-    for i, line in enumerate(lines):
-        if re.match(list_start_pattern, line):
-            list_start_line = i
-            in_target_list = True
-            bracket_count = line.count('[') - line.count(']')
-            if 'formulae.brew.sh' in line:
-                last_url_line = i
-            continue
-
-        if in_target_list:
-            bracket_count += line.count('[') - line.count(']')
-            if 'formulae.brew.sh' in line:
-                last_url_line = i
-            if bracket_count <= 0:
-                break
-
-    if list_start_line == -1:
-        return False, f"Could not find list '{list_name}' in collect_app_info.py"
-
-    if last_url_line == -1:
-        insert_line = list_start_line + 1
-    else:
-        # Ensure the previous line has a trailing comma to avoid string concatenation
-        prev_line = lines[last_url_line].rstrip('\n')
-        if prev_line.rstrip().endswith('"') and not prev_line.rstrip().endswith('",'):
-            # Add comma to the previous line
-            lines[last_url_line] = prev_line.rstrip() + ',\n'
-        insert_line = last_url_line + 1
-
-    lines.insert(insert_line, url_to_add)
-    return True, None
+    return cask_name in catalog
 
 def main():
     issue_title = os.environ.get('ISSUE_TITLE', '')
@@ -342,12 +301,7 @@ def main():
     print(f"Issue title: {issue_title}")
     print(f"Comment body: {comment_body}")
 
-    script_path = '.github/scripts/collect_app_info.py'
-
-    # Read the script content
-    with open(script_path, 'r') as f:
-        lines = f.readlines()
-    content = ''.join(lines)
+    catalog = CatalogManifest().load(CATALOG_FILE)
 
     # Determine which casks to add
     casks_to_process = []
@@ -431,7 +385,7 @@ def main():
 
     for cask_name in casks_to_process:
         # Check if already exists
-        if check_app_exists(cask_name, content):
+        if check_app_exists(cask_name, catalog):
             print(f"Skipping {cask_name}: already exists")
             skipped_apps.append({'cask': cask_name, 'reason': 'already exists'})
             continue
@@ -450,27 +404,20 @@ def main():
         list_name, app_type = determine_app_type(homebrew_data)
         print(f"Adding {cask_name} ({app_name}) to {list_name} as {app_type}")
 
-        # Add to list
-        success, error = add_url_to_list(script_path, list_name, cask_name, lines)
-        if success:
-            # Update content for subsequent checks
-            content = ''.join(lines)
-            added_apps.append({
-                'cask': cask_name,
-                'name': app_name,
-                'url': homebrew_data.get('url', ''),
-                'score': match_scores.get(cask_name),
-                'type': app_type,
-                'list': list_name
-            })
-        else:
-            print(f"Failed to add {cask_name}: {error}")
-            failed_apps.append({'cask': cask_name, 'reason': error})
-
-    # Write the updated file if any apps were added
+        # Add to list; later casks in this request see it as existing
+        catalog.add(cask_name, list_name)
+        added_apps.append({
+            'cask': cask_name,
+            'name': app_name,
+            'url': homebrew_data.get('url', ''),
+            'score': match_scores.get(cask_name),
+            'type': app_type,
+            'list': list_name
+        })
+
+    # Write the updated catalog if any apps were added
     if added_apps:
-        with open(script_path, 'w') as f:
-            f.writelines(lines)
+        catalog.save(CATALOG_FILE)
 
         # Generate commit message
         if len(added_apps) == 1:
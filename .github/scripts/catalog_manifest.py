@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""The app catalog: which Homebrew casks IntuneBrew collects, and as what.
+
+.github/catalog.jsonl holds one JSON record per line, in processing order:
+
+    {"cask": "signal", "type": "app"}
+    {"formula": "vim", "type": "app"}
+    {"cask": "google-drive", "type": "pkg_in_dmg", "note": "DMG holding a PKG (Issue #142)"}
+
+type says how the app is packaged (see LIST_TYPES) and note is an optional
+remark for maintainers. One record per line keeps every added, removed or
+reclassified app to the lines of its own record in a diff, which the build
+workflow relies on to package only the apps a push touched.
+
+CatalogManifest loads the file into an index keyed by token, so the collector,
+add_new_app.py, reclassify_app.py and check_cask_tokens.py look up, add and
+move apps without scanning anything.
+"""
+
+import json
+import os
+
+CATALOG_FILE = ".github/catalog.jsonl"
+HOMEBREW_API = "https://formulae.brew.sh/api"
+
+# Packaging lists in the order collect_app_info.py processes them, with the
+# type each one gives an app.
+LIST_TYPES = {
+    "app_urls": "app",
+    "homebrew_cask_urls": "dmg",
+    "pkg_in_pkg_urls": "pkg_in_pkg",
+    "pkg_urls": "pkg",
+    "pkg_in_dmg_urls": "pkg_in_dmg",
+}
+TYPE_LISTS = {app_type: list_name for list_name, app_type in LIST_TYPES.items()}
+
+# Catalog entries are casks, apart from a few formulae packaged as apps.
+KINDS = ("cask", "formula")
+
+
+def api_url(token, kind="cask"):
+    """The formulae.brew.sh document a record is collected from."""
+    return f"{HOMEBREW_API}/{kind}/{token}.json"
+
+
+def record_kind(record):
+    return next((kind for kind in KINDS if kind in record), None)
+
+
+class CatalogManifest:
+    """The records of CATALOG_FILE with an index by (kind, token)."""
+
+    def __init__(self):
+        self.records = []
+        self._index = {}
+
+    def load(self, path=CATALOG_FILE):
+        """Read path. A malformed or duplicate record raises ValueError naming its
+        line, since a catalog silently missing apps is worse than a failed run."""
+        self.records = []
+        self._index = {}
+        with open(path, "r") as f:
+            for number, line in enumerate(f, 1):
+                if not line.strip():
+                    continue
+                try:
+                    record = json.loads(line)
+                    self._insert(record)
+                except ValueError as error:
+                    raise ValueError(f"{path}:{number}: {error}") from None
+        return self
+
+    def save(self, path=CATALOG_FILE):
+        temp_path = f"{path}.tmp"
+        with open(temp_path, "w") as f:
+            for record in self.records:
+                f.write(json.dumps(record, ensure_ascii=False) + "\n")
+        os.replace(temp_path, path)
+
+    def _insert(self, record):
+        kind = record_kind(record) if isinstance(record, dict) else None
+        if kind is None:
+            raise ValueError(f"record needs one of {', '.join(KINDS)}: {record}")
+        if record.get("type") not in TYPE_LISTS:
+            raise ValueError(f"unknown type {record.get('type')!r} for {record[kind]}")
+        key = (kind, record[kind])
+        if key in self._index:
+            raise ValueError(f"{kind} {record[kind]} is listed twice")
+        self.records.append(record)
+        self._index[key] = record
+
+    def get(self, token, kind="cask"):
+        return self._index.get((kind, token))
+
+    def __contains__(self, token):
+        return ("cask", token) in self._index
+
+    def __len__(self):
+        return len(self.records)
+
+    def tokens(self, kind="cask"):
+        """Tokens of one kind, in catalog order."""
+        return [record[kind] for record in self.records if kind in record]
+
+    def list_name(self, token, kind="cask"):
+        """The packaging list a token belongs to, or None when it is not listed."""
+        record = self.get(token, kind)
+        return TYPE_LISTS[record["type"]] if record else None
+
+    def urls(self, list_name):
+        """API urls of one packaging list, in catalog order."""
+        app_type = LIST_TYPES[list_name]
+        urls = []
+        for record in self.records:
+            if record["type"] == app_type:
+                kind = record_kind(record)
+                urls.append(api_url(record[kind], kind))
+        return urls
+
+    def add(self, token, list_name, note=None, kind="cask"):
+        """Append a record for token to list_name. Raises ValueError if it is listed."""
+        record = {kind: token, "type": LIST_TYPES[list_name]}
+        if note:
+            record["note"] = note
+        self._insert(record)
+        return record
+
+    def move(self, token, list_name, kind="cask"):
+        """Give a listed token another packaging list. Returns the list it left.
+
+        The record moves to the end of the catalog, so it is processed last of
+        its new list, as it was when the lists were kept separately.
+        """
+        record = self._index[(kind, token)]
+        previous = TYPE_LISTS[record["type"]]
+        record["type"] = LIST_TYPES[list_name]
+        self.records.remove(record)
+        self.records.append(record)
+        return previous
@@ -2,7 +2,7 @@
 """Check that every Homebrew cask referenced by the catalog still exists.
 
 Homebrew renames and retires casks. When that happens the token in
-collect_app_info.py stops resolving, the collector can no longer refresh that
+.github/catalog.jsonl stops resolving, the collector can no longer refresh that
 app, and its version silently freezes at whatever was last recorded. This is
 distinct from check_download_urls.py, which checks the vendor download URL of
 an app that was collected successfully.
@@ -20,13 +20,13 @@ cask-token-report.md in the working directory.
 import datetime
 import json
 import os
-import re
 import sys
 from difflib import SequenceMatcher
 
 import requests
 
-SCRIPT_FILE = ".github/scripts/collect_app_info.py"
+from catalog_manifest import CATALOG_FILE, CatalogManifest
+
 APPS_FOLDER = "Apps"
 REPORT_FILE = "cask-token-report.md"
 CASK_INDEX_URL = "https://formulae.brew.sh/api/cask.json"
@@ -37,14 +37,8 @@ SUGGESTION_THRESHOLD = 0.6
 
 
 def referenced_tokens(path):
-    """Every cask token referenced by the catalog source, in file order."""
-    with open(path) as f:
-        content = f.read()
-    # Preserve first-seen order so the report is stable between runs.
-    seen = {}
-    for match in re.finditer(r"formulae\.brew\.sh/api/cask/([^\"']+)\.json", content):
-        seen.setdefault(match.group(1), None)
-    return list(seen)
+    """Every cask token in the catalog, in catalog order so the report is stable."""
+    return CatalogManifest().load(path).tokens()
 
 
 def fetch_cask_index():
@@ -78,10 +72,13 @@ def suggest_rename(token, available):
     return None, 0.0
 
 
-def affected_app(token):
-    """Find the catalog entry that depends on a token, if one exists."""
-    if not os.path.isdir(APPS_FOLDER):
-        return None
+def affected_apps(tokens):
+    """token -> the catalog entry that depends on it, for every token in tokens
+    that backs one. Apps/ is read once, however many tokens went missing."""
+    tokens = set(tokens)
+    apps = {}
+    if not tokens or not os.path.isdir(APPS_FOLDER):
+        return apps
     for filename in sorted(os.listdir(APPS_FOLDER)):
         if not filename.endswith(".json"):
             continue
@@ -90,13 +87,14 @@ def affected_app(token):
                 data = json.load(f)
         except (ValueError, OSError):
             continue
-        if data.get("homebrew_cask") == token:
-            return {
+        token = data.get("homebrew_cask")
+        if token in tokens and token not in apps:
+            apps[token] = {
                 "name": data.get("name", filename[: -len(".json")]),
                 "version": data.get("version", ""),
                 "deprecated": bool(data.get("deprecated")),
             }
-    return None
+    return apps
 
 
 def write_report(lines):
@@ -112,7 +110,7 @@ def set_output(name, value):
 
 
 def main():
-    tokens = referenced_tokens(SCRIPT_FILE)
+    tokens = referenced_tokens(CATALOG_FILE)
     print(f"Catalog references {len(tokens)} Homebrew casks")
 
     index = fetch_cask_index()
@@ -128,16 +126,16 @@ def main():
     print(f"Homebrew currently publishes {len(available)} casks")
 
     missing = []
+    apps = affected_apps(token for token in tokens if token not in available)
     for token in tokens:
         if token in available:
             continue
         suggestion, score = suggest_rename(token, available)
-        app = affected_app(token)
         missing.append({
             "token": token,
             "suggestion": suggestion,
             "score": score,
-            "app": app,
+            "app": apps.get(token),
         })
         print(f"MISSING {token}" + (f" -> suggest {suggestion}" if suggestion else ""))
 
@@ -167,7 +165,7 @@ def main():
         lines += [
             "These casks were renamed or retired by Homebrew. The collector cannot "
             "refresh them, so their version is frozen at whatever was last recorded. "
-            "Update the token in `collect_app_info.py`, or mark the app deprecated "
+            "Update the token in `.github/catalog.jsonl`, or mark the app deprecated "
             "if it is genuinely gone. Rows are ordered with still-live apps first, "
             "since those are the ones silently serving a stale version.",
             "",
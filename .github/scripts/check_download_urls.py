@@ -21,32 +21,37 @@ import sys
 
 import requests
 
+from download_agents import AGENT_TABLE_FILE, DOWNLOAD_USER_AGENTS, AgentTable
+
 APPS_FOLDER = "Apps"
 REPORT_FILE = "url-health-report.md"
 TIMEOUT_SECONDS = 45
 MAX_WORKERS = 20
-# Different CDNs block different clients: SourceForge rejects browser user
-# agents from non-browser TLS stacks, Tableau's CDN only allows curl-style
-# agents, others require a browser agent. Try them in order and treat the
-# URL as broken only if every attempt fails.
-ATTEMPTS = [
-    {"method": "HEAD", "user_agent": "IntuneBrew-URL-Health-Check/1.0"},
-    {"method": "GET", "user_agent": "IntuneBrew-URL-Health-Check/1.0"},
-    {"method": "GET", "user_agent": "curl/8.4.0"},
-    {
-        "method": "GET",
-        "user_agent": (
-            "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
-            "(KHTML, like Gecko) Chrome/126.0 Safari/537.36"
-        ),
-    },
+# Every agent is tried in DOWNLOAD_USER_AGENTS order; the default one gets a
+# HEAD first since most hosts answer it. The URL is broken only if every
+# attempt fails.
+ATTEMPTS = [{"method": "HEAD", "user_agent": DOWNLOAD_USER_AGENTS[0]}] + [
+    {"method": "GET", "user_agent": user_agent} for user_agent in DOWNLOAD_USER_AGENTS
 ]
 
+# The agent that last worked for a host is tried first. The table is the one
+# collect_app_info.py keeps in the same cache folder; it is only read here, so
+# hosts the default agent serves never drop what the collector learned.
+CACHE_DIR = os.environ.get("COLLECTOR_CACHE_DIR", ".collector-cache")
+agent_table = AgentTable()
+
+
+def ordered_attempts(url):
+    """ATTEMPTS with every attempt using the host's last winning agent moved first."""
+    agents = list(dict.fromkeys(attempt["user_agent"] for attempt in ATTEMPTS))
+    rank = {agent: index for index, agent in enumerate(agent_table.order(url, agents))}
+    return sorted(ATTEMPTS, key=lambda attempt: rank[attempt["user_agent"]])
+
 
 def check_url(url):
     """Return (verdict, detail). Verdict is 'ok' or a failure category."""
     verdict, detail = "request_failed", "no attempt succeeded"
-    for attempt in ATTEMPTS:
+    for attempt in ordered_attempts(url):
         headers = {"User-Agent": attempt["user_agent"]}
         if attempt["method"] == "GET":
             headers["Range"] = "bytes=0-0"
@@ -73,12 +78,15 @@ def check_url(url):
             verdict, detail = "html_page", f"returns an HTML page (final URL: {response.url})"
             continue
 
+        if attempt["user_agent"] != ATTEMPTS[0]["user_agent"]:
+            agent_table.record(url, attempt["user_agent"], ATTEMPTS[0]["user_agent"])
         return "ok", content_type
 
     return verdict, detail
 
 
 def main():
+    agent_table.load(os.path.join(CACHE_DIR, AGENT_TABLE_FILE))
     apps = []
     for filename in sorted(os.listdir(APPS_FOLDER)):
         if not filename.endswith(".json"):
@@ -1,3 +1,7 @@
+import argparse
+import asyncio
+import contextlib
+import copy
 import json
 import os
 import sys
@@ -8,10 +12,18 @@ from pathlib import Path
 import subprocess
 from datetime import datetime
 import hashlib
-import tempfile
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import heapq
+import random
+import signal
+import threading
+import time
+import weakref
+from concurrent.futures import Future, ThreadPoolExecutor
 from urllib.parse import urlparse, unquote
 
+import catalog_manifest
+from download_agents import AGENT_TABLE_FILE, DOWNLOAD_USER_AGENTS, AgentTable
+
 
 def get_filename_from_url(url, app_name=None, version=None, default_ext=".dmg"):
     """
@@ -61,1307 +73,26 @@ preserve_filename_apps = [
     "tenable_nessus_agent"
 ]
 
+# The catalog lives in .github/catalog.jsonl, one record per cask with its
+# packaging type; see catalog_manifest.py. tuxera-ntfs is deliberately absent:
+# its DMG holds a directory-based PKG inside an .mpkg that needs special handling.
+CATALOG_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir, "catalog.jsonl")
+catalog = catalog_manifest.CatalogManifest().load(CATALOG_FILE)
+
 # zip, tar etc
-app_urls = [
-    "https://formulae.brew.sh/api/cask/signal.json",
-    "https://formulae.brew.sh/api/cask/medis.json",
-    "https://formulae.brew.sh/api/cask/sourcetree.json",
-    "https://formulae.brew.sh/api/cask/sequel-ace.json",
-    "https://formulae.brew.sh/api/cask/textmate.json",
-    "https://formulae.brew.sh/api/cask/free-ruler.json",
-    "https://formulae.brew.sh/api/cask/superlist.json",
-    "https://formulae.brew.sh/api/cask/viz.json",
-    "https://formulae.brew.sh/api/cask/huggingchat.json",
-    "https://formulae.brew.sh/api/cask/gather.json",
-    "https://formulae.brew.sh/api/cask/flowvision.json",
-    "https://formulae.brew.sh/api/cask/copyclip.json",
-    "https://formulae.brew.sh/api/cask/batfi.json",
-    "https://formulae.brew.sh/api/cask/bleunlock.json",
-    "https://formulae.brew.sh/api/cask/loop.json",
-    "https://formulae.brew.sh/api/cask/elgato-capture-device-utility.json",
-    "https://formulae.brew.sh/api/cask/godspeed.json",
-    "https://formulae.brew.sh/api/cask/hey-desktop.json",
-    "https://formulae.brew.sh/api/cask/tex-live-utility.json",
-    "https://formulae.brew.sh/api/cask/deskpad.json",
-    "https://formulae.brew.sh/api/cask/windowkeys.json",
-    "https://formulae.brew.sh/api/cask/huly.json",
-    "https://formulae.brew.sh/api/cask/asset-catalog-tinkerer.json",
-    "https://formulae.brew.sh/api/cask/forecast.json",
-    "https://formulae.brew.sh/api/cask/last-window-quits.json",
-    "https://formulae.brew.sh/api/cask/taskbar.json",
-    "https://formulae.brew.sh/api/cask/superwhisper.json",
-    "https://formulae.brew.sh/api/cask/notesollama.json",
-    "https://formulae.brew.sh/api/cask/oversight.json",
-    "https://formulae.brew.sh/api/cask/pronotes.json",
-    "https://formulae.brew.sh/api/cask/hammerspoon.json",
-    "https://formulae.brew.sh/api/cask/swift-shift.json",
-    "https://formulae.brew.sh/api/cask/splice.json",
-    "https://formulae.brew.sh/api/cask/screenfocus.json",
-    "https://formulae.brew.sh/api/cask/teacode.json",
-    "https://formulae.brew.sh/api/cask/alcove.json",
-    "https://formulae.brew.sh/api/cask/abstract.json",
-    "https://formulae.brew.sh/api/cask/macpass.json",
-    "https://formulae.brew.sh/api/cask/marsedit.json",
-    "https://formulae.brew.sh/api/cask/neofinder.json",
-    "https://formulae.brew.sh/api/cask/netiquette.json",
-    "https://formulae.brew.sh/api/cask/nova.json",
-    "https://formulae.brew.sh/api/cask/overflow.json",
-    "https://formulae.brew.sh/api/cask/platypus.json",
-    "https://formulae.brew.sh/api/cask/plistedit-pro.json",
-    "https://formulae.brew.sh/api/cask/principle.json",
-    "https://formulae.brew.sh/api/cask/qlab.json",
-    "https://formulae.brew.sh/api/cask/rode-connect.json",
-    "https://formulae.brew.sh/api/cask/rode-central.json",
-    "https://formulae.brew.sh/api/cask/sqlpro-for-mssql.json",
-    "https://formulae.brew.sh/api/cask/sqlpro-for-postgres.json",
-    "https://formulae.brew.sh/api/cask/sqlpro-for-mysql.json",
-    "https://formulae.brew.sh/api/cask/sqlpro-for-sqlite.json",
-    "https://formulae.brew.sh/api/cask/sqlpro-studio.json",
-    "https://formulae.brew.sh/api/cask/silentknight.json",
-    "https://formulae.brew.sh/api/cask/homerow.json",
-    "https://formulae.brew.sh/api/cask/paintbrush.json",
-    "https://formulae.brew.sh/api/cask/mattermost.json",
-    "https://formulae.brew.sh/api/cask/flycut.json",
-    "https://formulae.brew.sh/api/cask/sublime-merge.json",
-    "https://formulae.brew.sh/api/cask/netnewswire.json",
-    "https://formulae.brew.sh/api/cask/love.json",
-    "https://formulae.brew.sh/api/cask/block-goose.json",
-    "https://formulae.brew.sh/api/cask/espanso.json",
-    "https://formulae.brew.sh/api/cask/shortcat.json",
-    "https://formulae.brew.sh/api/cask/copilot-for-xcode.json",
-    "https://formulae.brew.sh/api/cask/macs-fan-control.json",
-    "https://formulae.brew.sh/api/cask/plex.json",
-    "https://formulae.brew.sh/api/cask/macwhisper.json",
-    "https://formulae.brew.sh/api/cask/reactotron.json",
-    "https://formulae.brew.sh/api/cask/macdown.json",
-    "https://formulae.brew.sh/api/cask/middleclick.json",
-    "https://formulae.brew.sh/api/cask/openmtp.json",
-    "https://formulae.brew.sh/api/cask/pearcleaner.json",
-    "https://formulae.brew.sh/api/cask/notunes.json",
-    "https://formulae.brew.sh/api/cask/keycastr.json",
-    "https://formulae.brew.sh/api/cask/itsycal.json",
-    "https://formulae.brew.sh/api/cask/vimr.json",
-    "https://formulae.brew.sh/api/cask/audio-hijack.json",
-    "https://formulae.brew.sh/api/cask/visual-studio-code.json",
-    "https://formulae.brew.sh/api/cask/microsoft-azure-storage-explorer.json",
-    "https://formulae.brew.sh/api/cask/figma.json",
-    "https://formulae.brew.sh/api/cask/postman.json",
-    "https://formulae.brew.sh/api/cask/fantastical.json",
-    "https://formulae.brew.sh/api/cask/iterm2.json",
-    "https://formulae.brew.sh/api/cask/sublime-text.json",
-    "https://formulae.brew.sh/api/cask/vivaldi.json",
-    "https://formulae.brew.sh/api/cask/github.json",
-    "https://formulae.brew.sh/api/cask/transmit.json",
-    "https://formulae.brew.sh/api/cask/1password.json",
-    "https://formulae.brew.sh/api/cask/alfred.json",
-    "https://formulae.brew.sh/api/cask/asana.json",
-    "https://formulae.brew.sh/api/cask/arc.json",
-    "https://formulae.brew.sh/api/cask/azure-data-studio.json",
-    "https://formulae.brew.sh/api/cask/bartender.json",
-    "https://formulae.brew.sh/api/cask/basecamp.json",
-    "https://formulae.brew.sh/api/cask/domzilla-caffeine.json",
-    "https://formulae.brew.sh/api/cask/claude.json",
-    "https://formulae.brew.sh/api/cask/cursor.json",
-    "https://formulae.brew.sh/api/cask/flux-app.json",
-    "https://formulae.brew.sh/api/cask/gitkraken.json",
-    "https://formulae.brew.sh/api/cask/godot.json",
-    "https://formulae.brew.sh/api/cask/hp-easy-admin.json",
-    "https://formulae.brew.sh/api/formula/vim.json",
-    "https://formulae.brew.sh/api/cask/notion-calendar.json",
-    "https://formulae.brew.sh/api/cask/ollama-app.json",
-    "https://formulae.brew.sh/api/cask/pdf-expert.json",
-    "https://formulae.brew.sh/api/cask/wine-stable.json",
-    "https://formulae.brew.sh/api/cask/alt-tab.json",
-    "https://formulae.brew.sh/api/cask/maccy.json",
-    "https://formulae.brew.sh/api/cask/whatsapp.json",
-    "https://formulae.brew.sh/api/cask/mitmproxy.json",
-    "https://formulae.brew.sh/api/cask/telegram.json",
-    "https://formulae.brew.sh/api/cask/jordanbaird-ice.json",
-    "https://formulae.brew.sh/api/cask/appcleaner.json",
-    "https://formulae.brew.sh/api/cask/cyberduck.json",
-    "https://formulae.brew.sh/api/cask/logi-options+.json",
-    "https://formulae.brew.sh/api/cask/mountain-duck.json",
-    "https://formulae.brew.sh/api/cask/acorn.json",
-    "https://formulae.brew.sh/api/cask/menubar-stats.json",
-    "https://formulae.brew.sh/api/formula/neovim.json",
-    "https://formulae.brew.sh/api/cask/sketch.json",
-    "https://formulae.brew.sh/api/cask/jumpcut.json",
-    "https://formulae.brew.sh/api/cask/daisydisk.json",
-    "https://formulae.brew.sh/api/cask/cleanmymac.json",
-    "https://formulae.brew.sh/api/cask/bettertouchtool.json",
-    "https://formulae.brew.sh/api/cask/battle-net.json",
-    "https://formulae.brew.sh/api/cask/betterzip.json",
-    "https://formulae.brew.sh/api/cask/blip.json",
-    "https://formulae.brew.sh/api/cask/boop.json",
-    "https://formulae.brew.sh/api/cask/busycal.json",
-    "https://formulae.brew.sh/api/cask/busycontacts.json",
-    "https://formulae.brew.sh/api/cask/beeper.json",
-    "https://formulae.brew.sh/api/cask/airfoil.json",
-    "https://formulae.brew.sh/api/cask/angry-ip-scanner.json",
-    "https://formulae.brew.sh/api/cask/home-assistant.json",
-    "https://formulae.brew.sh/api/cask/hyper.json",
-    "https://formulae.brew.sh/api/cask/fsmonitor.json",
-    "https://formulae.brew.sh/api/cask/fission.json",
-    "https://formulae.brew.sh/api/cask/geekbench.json",
-    "https://formulae.brew.sh/api/cask/geekbench-ai.json",
-    "https://formulae.brew.sh/api/cask/gemini.json",
-    "https://formulae.brew.sh/api/cask/coderunner.json",
-    "https://formulae.brew.sh/api/cask/devtoys.json",
-    "https://formulae.brew.sh/api/cask/drivedx.json",
-    "https://formulae.brew.sh/api/cask/dropshare.json",
-    "https://formulae.brew.sh/api/cask/easyfind.json",
-    "https://formulae.brew.sh/api/cask/beyond-compare.json",
-    "https://formulae.brew.sh/api/cask/bettermouse.json",
-    "https://formulae.brew.sh/api/cask/logitech-g-hub.json",
-    "https://formulae.brew.sh/api/cask/jumpshare.json",
-    "https://formulae.brew.sh/api/cask/keybase.json",
-    "https://formulae.brew.sh/api/cask/keyclu.json",
-    "https://formulae.brew.sh/api/formula/antigen.json",
-    "https://formulae.brew.sh/api/cask/nucleo.json",
-    "https://formulae.brew.sh/api/cask/spline.json",
-    "https://formulae.brew.sh/api/cask/mac-mouse-fix.json",
-    "https://formulae.brew.sh/api/cask/amazon-workspaces.json",
-    "https://formulae.brew.sh/api/cask/propresenter.json",
-    # New ZIP/Archive apps (batch 1 - 37 apps)
-    "https://formulae.brew.sh/api/cask/affinity-designer.json",
-    "https://formulae.brew.sh/api/cask/affinity-photo.json",
-    "https://formulae.brew.sh/api/cask/affinity-publisher.json",
-    "https://formulae.brew.sh/api/cask/carbon-copy-cloner.json",
-    "https://formulae.brew.sh/api/cask/coconutbattery.json",
-    "https://formulae.brew.sh/api/cask/dash.json",
-    "https://formulae.brew.sh/api/cask/devonthink.json",
-    "https://formulae.brew.sh/api/cask/element.json",
-    "https://formulae.brew.sh/api/cask/forklift.json",
-    "https://formulae.brew.sh/api/cask/front.json",
-    "https://formulae.brew.sh/api/cask/fsnotes.json",
-    "https://formulae.brew.sh/api/cask/gitbutler.json",
-    "https://formulae.brew.sh/api/cask/glyphs.json",
-    "https://formulae.brew.sh/api/cask/iconjar.json",
-    "https://formulae.brew.sh/api/cask/imageoptim.json",
-    "https://formulae.brew.sh/api/cask/jump-desktop.json",
-    "https://formulae.brew.sh/api/cask/kaleidoscope.json",
-    "https://formulae.brew.sh/api/cask/keyboard-maestro.json",
-    "https://formulae.brew.sh/api/cask/knockknock.json",
-    "https://formulae.brew.sh/api/cask/loopback.json",
-    "https://formulae.brew.sh/api/cask/min.json",
-    "https://formulae.brew.sh/api/cask/monodraw.json",
-    "https://formulae.brew.sh/api/cask/orion.json",
-    "https://formulae.brew.sh/api/cask/paste.json",
-    "https://formulae.brew.sh/api/cask/popclip.json",
-    "https://formulae.brew.sh/api/cask/rightfont.json",
-    "https://formulae.brew.sh/api/cask/soundsource.json",
-    "https://formulae.brew.sh/api/cask/swinsian.json",
-    "https://formulae.brew.sh/api/cask/the-unarchiver.json",
-    "https://formulae.brew.sh/api/cask/tower.json",
-    "https://formulae.brew.sh/api/cask/tripmode.json",
-    "https://formulae.brew.sh/api/cask/tunnelbear.json",
-    "https://formulae.brew.sh/api/cask/workflowy.json",
-    "https://formulae.brew.sh/api/cask/yattee.json",
-    "https://formulae.brew.sh/api/cask/yoink.json",
-    # New ZIP/Archive apps (batch 2 - 33 apps)
-    "https://formulae.brew.sh/api/cask/altair-graphql-client.json",
-    "https://formulae.brew.sh/api/cask/castr.json",
-    "https://formulae.brew.sh/api/cask/chromium.json",
-    "https://formulae.brew.sh/api/cask/coherence-x.json",
-    "https://formulae.brew.sh/api/cask/dockview.json",
-    "https://formulae.brew.sh/api/cask/dropzone.json",
-    "https://formulae.brew.sh/api/cask/ecamm-live.json",
-    "https://formulae.brew.sh/api/cask/fastscripts.json",
-    "https://formulae.brew.sh/api/cask/fluid.json",
-    "https://formulae.brew.sh/api/cask/framer.json",
-    "https://formulae.brew.sh/api/cask/guitar-pro.json",
-    "https://formulae.brew.sh/api/cask/heptabase.json",
-    "https://formulae.brew.sh/api/cask/iconset.json",
-    "https://formulae.brew.sh/api/cask/mailmate.json",
-    "https://formulae.brew.sh/api/cask/mailspring.json",
-    "https://formulae.brew.sh/api/cask/openinterminal.json",
-    "https://formulae.brew.sh/api/cask/rambox.json",
-    "https://formulae.brew.sh/api/cask/reflect.json",
-    "https://formulae.brew.sh/api/cask/remnote.json",
-    "https://formulae.brew.sh/api/cask/scrivener.json",
-    "https://formulae.brew.sh/api/cask/scroll-reverser.json",
-    "https://formulae.brew.sh/api/cask/superhuman.json",
-    "https://formulae.brew.sh/api/cask/tabby.json",
-    "https://formulae.brew.sh/api/cask/tidal.json",
-    "https://formulae.brew.sh/api/cask/ubar.json",
-    "https://formulae.brew.sh/api/cask/unclutter.json",
-    "https://formulae.brew.sh/api/cask/unite.json",
-    "https://formulae.brew.sh/api/cask/wezterm.json",
-    "https://formulae.brew.sh/api/cask/whimsical.json",
-    "https://formulae.brew.sh/api/cask/workspaces.json",
-    "https://formulae.brew.sh/api/cask/zeplin.json",
-    # New ZIP/Archive apps (batch 3 - 35 apps)
-    "https://formulae.brew.sh/api/cask/alloy.json",
-    "https://formulae.brew.sh/api/cask/altserver.json",
-    "https://formulae.brew.sh/api/cask/amadeus-pro.json",
-    "https://formulae.brew.sh/api/cask/amie.json",
-    "https://formulae.brew.sh/api/cask/android-commandlinetools.json",
-    "https://formulae.brew.sh/api/cask/android-platform-tools.json",
-    "https://formulae.brew.sh/api/cask/appgrid.json",
-    "https://formulae.brew.sh/api/cask/apptivate.json",
-    "https://formulae.brew.sh/api/cask/aurora-hdr.json",
-    "https://formulae.brew.sh/api/cask/backuploupe.json",
-    "https://formulae.brew.sh/api/cask/battery-buddy.json",
-    "https://formulae.brew.sh/api/cask/bitbar.json",
-    "https://formulae.brew.sh/api/cask/boinc.json",
-    "https://formulae.brew.sh/api/cask/catch.json",
-    "https://formulae.brew.sh/api/cask/chirp.json",
-    "https://formulae.brew.sh/api/cask/choosy.json",
-    "https://formulae.brew.sh/api/cask/cleartext.json",
-    "https://formulae.brew.sh/api/cask/colorsnapper.json",
-    "https://formulae.brew.sh/api/cask/combine-pdfs.json",
-    "https://formulae.brew.sh/api/cask/compositor.json",
-    "https://formulae.brew.sh/api/cask/crossover.json",
-    "https://formulae.brew.sh/api/cask/devkinsta.json",
-    "https://formulae.brew.sh/api/cask/devonagent.json",
-    "https://formulae.brew.sh/api/cask/elan.json",
-    "https://formulae.brew.sh/api/cask/electron.json",
-    "https://formulae.brew.sh/api/cask/electron-fiddle.json",
-    "https://formulae.brew.sh/api/cask/elgato-control-center.json",
-    "https://formulae.brew.sh/api/cask/envkey.json",
-    "https://formulae.brew.sh/api/cask/evkey.json",
-    "https://formulae.brew.sh/api/cask/filebot.json",
-    "https://formulae.brew.sh/api/cask/1password-cli.json",
-    "https://formulae.brew.sh/api/cask/activedock.json",
-    "https://formulae.brew.sh/api/cask/amethyst.json",
-    "https://formulae.brew.sh/api/cask/antigravity.json",
-    "https://formulae.brew.sh/api/cask/appium-inspector.json",
-    "https://formulae.brew.sh/api/cask/backlog.json",
-    "https://formulae.brew.sh/api/cask/bdash.json",
-    "https://formulae.brew.sh/api/cask/bezel.json",
-    "https://formulae.brew.sh/api/cask/blockblock.json",
-    "https://formulae.brew.sh/api/cask/browserstacklocal.json",
-    "https://formulae.brew.sh/api/cask/cacher.json",
-    "https://formulae.brew.sh/api/cask/camunda-modeler.json",
-    "https://formulae.brew.sh/api/cask/captin.json",
-    "https://formulae.brew.sh/api/cask/cardhop.json",
-    "https://formulae.brew.sh/api/cask/cellprofiler.json",
-    "https://formulae.brew.sh/api/cask/chime.json",
-    "https://formulae.brew.sh/api/cask/chipmunk.json",
-    "https://formulae.brew.sh/api/cask/clocker.json",
-    "https://formulae.brew.sh/api/cask/clockify.json",
-    "https://formulae.brew.sh/api/cask/cork.json",
-    "https://formulae.brew.sh/api/cask/customshortcuts.json",
-    "https://formulae.brew.sh/api/cask/debookee.json",
-    "https://formulae.brew.sh/api/cask/devonsphere-express.json",
-    "https://formulae.brew.sh/api/cask/dialpad.json",
-    "https://formulae.brew.sh/api/cask/dictionaries.json",
-    "https://formulae.brew.sh/api/cask/droplr.json",
-    "https://formulae.brew.sh/api/cask/dupeguru.json",
-    "https://formulae.brew.sh/api/cask/etrecheckpro.json",
-    "https://formulae.brew.sh/api/cask/farrago.json",
-    "https://formulae.brew.sh/api/cask/fastmail.json",
-    "https://formulae.brew.sh/api/cask/file-juicer.json",
-    "https://formulae.brew.sh/api/cask/freefilesync.json",
-    "https://formulae.brew.sh/api/cask/gitfox.json",
-    "https://formulae.brew.sh/api/cask/gitify.json",
-    "https://formulae.brew.sh/api/cask/gpodder.json",
-    "https://formulae.brew.sh/api/cask/graphicconverter.json",
-    "https://formulae.brew.sh/api/cask/grids.json",
-    "https://formulae.brew.sh/api/cask/helium.json",
-    "https://formulae.brew.sh/api/cask/hidock.json",
-    "https://formulae.brew.sh/api/cask/hot.json",
-    "https://formulae.brew.sh/api/cask/houdahspot.json",
-    "https://formulae.brew.sh/api/cask/imagej.json",
-    "https://formulae.brew.sh/api/cask/iris.json",
-    "https://formulae.brew.sh/api/cask/istat-menus.json",
-    "https://formulae.brew.sh/api/cask/keepingyouawake.json",
-    "https://formulae.brew.sh/api/cask/keyboardcleantool.json",
-    "https://formulae.brew.sh/api/cask/latest.json",
-    "https://formulae.brew.sh/api/cask/launchcontrol.json",
-    "https://formulae.brew.sh/api/cask/lifesize.json",
-    "https://formulae.brew.sh/api/cask/lingon-x.json",
-    "https://formulae.brew.sh/api/cask/locationsimulator.json",
-    "https://formulae.brew.sh/api/cask/lunasea.json",
-    "https://formulae.brew.sh/api/cask/macjournal.json",
-    "https://formulae.brew.sh/api/cask/macpacker.json",
-    "https://formulae.brew.sh/api/cask/macsyzones.json",
-    "https://formulae.brew.sh/api/cask/mactracker.json",
-    "https://formulae.brew.sh/api/cask/melodics.json",
-    "https://formulae.brew.sh/api/cask/memory.json",
-    "https://formulae.brew.sh/api/cask/merlin-project.json",
-    "https://formulae.brew.sh/api/cask/minisim.json",
-    "https://formulae.brew.sh/api/cask/minstaller.json",
-    "https://formulae.brew.sh/api/cask/mission-control-plus.json",
-    "https://formulae.brew.sh/api/cask/murus.json",
-    "https://formulae.brew.sh/api/cask/mx-power-gadget.json",
-    "https://formulae.brew.sh/api/cask/namechanger.json",
-    "https://formulae.brew.sh/api/cask/native-access.json",
-    "https://formulae.brew.sh/api/cask/netron.json",
-    "https://formulae.brew.sh/api/cask/nocturnal.json",
-    "https://formulae.brew.sh/api/cask/notchnook.json",
-    "https://formulae.brew.sh/api/cask/ok-json.json",
-    "https://formulae.brew.sh/api/cask/onlyoffice.json",
-    "https://formulae.brew.sh/api/cask/openrct2.json",
-    "https://formulae.brew.sh/api/cask/phoenix.json",
-    "https://formulae.brew.sh/api/cask/photostickies.json",
-    "https://formulae.brew.sh/api/cask/pibar.json",
-    "https://formulae.brew.sh/api/cask/piezo.json",
-    "https://formulae.brew.sh/api/cask/pingplotter.json",
-    "https://formulae.brew.sh/api/cask/plex-htpc.json",
-    "https://formulae.brew.sh/api/cask/plex-media-server.json",
-    "https://formulae.brew.sh/api/cask/positron.json",
-    "https://formulae.brew.sh/api/cask/powerphotos.json",
-    "https://formulae.brew.sh/api/cask/pritunl.json",
-    "https://formulae.brew.sh/api/cask/private-internet-access.json",
-    "https://formulae.brew.sh/api/cask/prizmo.json",
-    "https://formulae.brew.sh/api/cask/qlmarkdown.json",
-    "https://formulae.brew.sh/api/cask/rapidapi.json",
-    "https://formulae.brew.sh/api/cask/rapidweaver.json",
-    "https://formulae.brew.sh/api/cask/rawtherapee.json",
-    "https://formulae.brew.sh/api/cask/reminders-menubar.json",
-    "https://formulae.brew.sh/api/cask/remote-buddy.json",
-    "https://formulae.brew.sh/api/cask/retrobatch.json",
-    "https://formulae.brew.sh/api/cask/rewritebar.json",
-    "https://formulae.brew.sh/api/cask/screen-studio.json",
-    "https://formulae.brew.sh/api/cask/screenflick.json",
-    "https://formulae.brew.sh/api/cask/secretive.json",
-    "https://formulae.brew.sh/api/cask/selfcontrol.json",
-    "https://formulae.brew.sh/api/cask/sentinel.json",
-    "https://formulae.brew.sh/api/cask/setapp.json",
-    "https://formulae.brew.sh/api/cask/shifty.json",
-    "https://formulae.brew.sh/api/cask/sidenotes.json",
-    "https://formulae.brew.sh/api/cask/simple-comic.json",
-    "https://formulae.brew.sh/api/cask/simpledemviewer.json",
-    "https://formulae.brew.sh/api/cask/sirimote.json",
-    "https://formulae.brew.sh/api/cask/slidepad.json",
-    "https://formulae.brew.sh/api/cask/sloth.json",
-    "https://formulae.brew.sh/api/cask/smoothscroll.json",
-    "https://formulae.brew.sh/api/cask/smultron.json",
-    "https://formulae.brew.sh/api/cask/soulver.json",
-    "https://formulae.brew.sh/api/cask/sparkle.json",
-    "https://formulae.brew.sh/api/cask/squash.json",
-    "https://formulae.brew.sh/api/cask/standard-notes.json",
-    "https://formulae.brew.sh/api/cask/stellarium.json",
-    "https://formulae.brew.sh/api/cask/stillcolor.json",
-    "https://formulae.brew.sh/api/cask/subethaedit.json",
-    "https://formulae.brew.sh/api/cask/sunsama.json",
-    "https://formulae.brew.sh/api/cask/surge.json",
-    "https://formulae.brew.sh/api/cask/swift-quit.json",
-    "https://formulae.brew.sh/api/cask/swiftbar.json",
-    "https://formulae.brew.sh/api/cask/switch.json",
-    "https://formulae.brew.sh/api/cask/syncmate.json",
-    "https://formulae.brew.sh/api/cask/syntax-highlight.json",
-    "https://formulae.brew.sh/api/cask/systhist.json",
-    "https://formulae.brew.sh/api/cask/tabula.json",
-    "https://formulae.brew.sh/api/cask/taccy.json",
-    "https://formulae.brew.sh/api/cask/texshop.json",
-    "https://formulae.brew.sh/api/cask/thumbsup.json",
-    "https://formulae.brew.sh/api/cask/timer.json",
-    "https://formulae.brew.sh/api/cask/timescribe.json",
-    "https://formulae.brew.sh/api/cask/tomatobar.json",
-    "https://formulae.brew.sh/api/cask/trex.json",
-    "https://formulae.brew.sh/api/cask/tuple.json",
-    "https://formulae.brew.sh/api/cask/unicodechecker.json",
-    "https://formulae.brew.sh/api/cask/vellum.json",
-    "https://formulae.brew.sh/api/cask/versions.json",
-    "https://formulae.brew.sh/api/cask/vnote.json",
-    "https://formulae.brew.sh/api/cask/vpn-tracker-365.json",
-    "https://formulae.brew.sh/api/cask/vysor.json",
-    "https://formulae.brew.sh/api/cask/wavebox.json",
-    "https://formulae.brew.sh/api/cask/whatroute.json",
-    "https://formulae.brew.sh/api/cask/whisky.json",
-    "https://formulae.brew.sh/api/cask/wins.json",
-    "https://formulae.brew.sh/api/cask/wordservice.json",
-    "https://formulae.brew.sh/api/cask/xattred.json",
-    "https://formulae.brew.sh/api/cask/xmenu.json",
-    "https://formulae.brew.sh/api/cask/yippy.json",
-    "https://formulae.brew.sh/api/cask/zight.json",
-    "https://formulae.brew.sh/api/cask/notion-mail.json",
-    # codex-app is the OpenAI Codex desktop app. The plain "codex" cask is the CLI
-    # tarball, which is not deployable via Intune (Issues #167, #174)
-    "https://formulae.brew.sh/api/cask/codex-app.json",
-    "https://formulae.brew.sh/api/cask/clickshare.json",
-    "https://formulae.brew.sh/api/cask/pppc-utility.json",
-    "https://formulae.brew.sh/api/cask/battery.json",
-    "https://formulae.brew.sh/api/cask/music-decoy.json",
-    "https://formulae.brew.sh/api/cask/thebrowsercompany-dia.json",
-    "https://formulae.brew.sh/api/cask/affinity.json",
-    "https://formulae.brew.sh/api/cask/meta.json",
-    "https://formulae.brew.sh/api/cask/sipgate.json",
-    "https://formulae.brew.sh/api/cask/support.json",
-    "https://formulae.brew.sh/api/cask/thaw.json",
-    "https://formulae.brew.sh/api/cask/codex.json",
-    "https://formulae.brew.sh/api/cask/copilot-cli.json",
-    "https://formulae.brew.sh/api/cask/ddpm.json",
-    "https://formulae.brew.sh/api/cask/monotype.json",
-]
+app_urls = catalog.urls("app_urls")
 
 # DMG
-homebrew_cask_urls = [
-    "https://formulae.brew.sh/api/cask/mysqlworkbench.json",
-    "https://formulae.brew.sh/api/cask/recut.json",
-    "https://formulae.brew.sh/api/cask/firefox@esr.json",
-    "https://formulae.brew.sh/api/cask/firefox@developer-edition.json",
-    "https://formulae.brew.sh/api/cask/lunatask.json",
-    "https://formulae.brew.sh/api/cask/threema.json",
-    "https://formulae.brew.sh/api/cask/advanced-renamer.json",
-    "https://formulae.brew.sh/api/cask/phoenix-slides.json",
-    "https://formulae.brew.sh/api/cask/maestral.json",
-    "https://formulae.brew.sh/api/cask/mindjet-mindmanager.json",
-    "https://formulae.brew.sh/api/cask/retcon.json",
-    "https://formulae.brew.sh/api/cask/sketchup.json",
-    "https://formulae.brew.sh/api/cask/gephi.json",
-    "https://formulae.brew.sh/api/cask/magicquit.json",
-    "https://formulae.brew.sh/api/cask/xca.json",
-    "https://formulae.brew.sh/api/cask/fathom.json",
-    "https://formulae.brew.sh/api/cask/vimcal.json",
-    "https://formulae.brew.sh/api/cask/studio-3t.json",
-    "https://formulae.brew.sh/api/cask/proton-pass.json",
-    "https://formulae.brew.sh/api/cask/bome-network.json",
-    "https://formulae.brew.sh/api/cask/antinote.json",
-    "https://formulae.brew.sh/api/cask/reqable.json",
-    "https://formulae.brew.sh/api/cask/steermouse.json",
-    "https://formulae.brew.sh/api/cask/pixelsnap.json",
-    "https://formulae.brew.sh/api/cask/processspy.json",
-    "https://formulae.brew.sh/api/cask/highlight-ai.json",
-    "https://formulae.brew.sh/api/cask/updf.json",
-    "https://formulae.brew.sh/api/cask/binary-ninja-free.json",
-    "https://formulae.brew.sh/api/cask/rive.json",
-    "https://formulae.brew.sh/api/cask/paletro.json",
-    "https://formulae.brew.sh/api/cask/dangerzone.json",
-    "https://formulae.brew.sh/api/cask/bitwig-studio.json",
-    "https://formulae.brew.sh/api/cask/aircall.json",
-    "https://formulae.brew.sh/api/cask/nosql-workbench.json",
-    "https://formulae.brew.sh/api/cask/rocket-typist.json",
-    "https://formulae.brew.sh/api/cask/clop.json",
-    "https://formulae.brew.sh/api/cask/hyperkey.json",
-    "https://formulae.brew.sh/api/cask/wondershare-filmora.json",
-    "https://formulae.brew.sh/api/cask/xnapper.json",
-    "https://formulae.brew.sh/api/cask/syncovery.json",
-    "https://formulae.brew.sh/api/cask/markedit.json",
-    "https://formulae.brew.sh/api/cask/dockside.json",
-    "https://formulae.brew.sh/api/cask/wave.json",
-    "https://formulae.brew.sh/api/cask/ente-auth.json",
-    "https://formulae.brew.sh/api/cask/ente.json",
-    "https://formulae.brew.sh/api/cask/istherenet.json",
-    "https://formulae.brew.sh/api/cask/name-mangler.json",
-    "https://formulae.brew.sh/api/cask/witch.json",
-    "https://formulae.brew.sh/api/cask/readest.json",
-    "https://formulae.brew.sh/api/cask/middle.json",
-    "https://formulae.brew.sh/api/cask/transnomino.json",
-    "https://formulae.brew.sh/api/cask/noun-project.json",
-    "https://formulae.brew.sh/api/cask/piphero.json",
-    "https://formulae.brew.sh/api/cask/tofu.json",
-    "https://formulae.brew.sh/api/cask/wondershare-edrawmax.json",
-    "https://formulae.brew.sh/api/cask/tabtab.json",
-    "https://formulae.brew.sh/api/cask/sabnzbd.json",
-    "https://formulae.brew.sh/api/cask/archaeology.json",
-    "https://formulae.brew.sh/api/cask/jamie.json",
-    "https://formulae.brew.sh/api/cask/a-better-finder-rename.json",
-    "https://formulae.brew.sh/api/cask/acronis-true-image.json",
-    "https://formulae.brew.sh/api/cask/airbuddy.json",
-    "https://formulae.brew.sh/api/cask/airparrot.json",
-    "https://formulae.brew.sh/api/cask/mural.json",
-    "https://formulae.brew.sh/api/cask/mixxx.json",
-    "https://formulae.brew.sh/api/cask/mobirise.json",
-    "https://formulae.brew.sh/api/cask/thunderbird.json",
-    "https://formulae.brew.sh/api/cask/nitro-pdf-pro.json",
-    "https://formulae.brew.sh/api/cask/nordpass.json",
-    "https://formulae.brew.sh/api/cask/novabench.json",
-    "https://formulae.brew.sh/api/cask/omnifocus.json",
-    "https://formulae.brew.sh/api/cask/omnioutliner.json",
-    "https://formulae.brew.sh/api/cask/pdf-pals.json",
-    "https://formulae.brew.sh/api/cask/orka-desktop.json",
-    "https://formulae.brew.sh/api/cask/packages.json",
-    "https://formulae.brew.sh/api/cask/popchar.json",
-    "https://formulae.brew.sh/api/cask/postico.json",
-    "https://formulae.brew.sh/api/cask/portx.json",
-    "https://formulae.brew.sh/api/cask/pulsar.json",
-    "https://formulae.brew.sh/api/cask/qspace-pro.json",
-    "https://formulae.brew.sh/api/cask/raindropio.json",
-    "https://formulae.brew.sh/api/cask/reflector.json",
-    "https://formulae.brew.sh/api/cask/rectangle-pro.json",
-    "https://formulae.brew.sh/api/cask/rocket-chat.json",
-    "https://formulae.brew.sh/api/cask/rocket.json",
-    "https://formulae.brew.sh/api/cask/rsyncui.json",
-    "https://formulae.brew.sh/api/cask/pika.json",
-    "https://formulae.brew.sh/api/cask/requestly.json",
-    "https://formulae.brew.sh/api/cask/adguard.json",
-    "https://formulae.brew.sh/api/cask/orcaslicer.json",
-    "https://formulae.brew.sh/api/cask/lookaway.json",
-    "https://formulae.brew.sh/api/cask/kap.json",
-    "https://formulae.brew.sh/api/cask/bambu-studio.json",
-    "https://formulae.brew.sh/api/cask/upscayl.json",
-    "https://formulae.brew.sh/api/cask/apifox.json",
-    "https://formulae.brew.sh/api/cask/nvidia-geforce-now.json",
-    "https://formulae.brew.sh/api/cask/rectangle.json",
-    "https://formulae.brew.sh/api/cask/dosbox.json",
-    "https://formulae.brew.sh/api/cask/qview.json",
-    "https://formulae.brew.sh/api/cask/rider.json",
-    "https://formulae.brew.sh/api/cask/stretchly.json",
-    "https://formulae.brew.sh/api/cask/proton-mail.json",
-    "https://formulae.brew.sh/api/cask/proton-drive.json",
-    "https://formulae.brew.sh/api/cask/cryptomator.json",
-    "https://formulae.brew.sh/api/cask/veracrypt.json",
-    "https://formulae.brew.sh/api/cask/dockdoor.json",
-    "https://formulae.brew.sh/api/cask/yaak.json",
-    "https://formulae.brew.sh/api/cask/messenger.json",
-    "https://formulae.brew.sh/api/cask/meetingbar.json",
-    "https://formulae.brew.sh/api/cask/zap.json",
-    "https://formulae.brew.sh/api/cask/qq.json",
-    "https://formulae.brew.sh/api/cask/mouseless.json",
-    "https://formulae.brew.sh/api/cask/arduino-ide.json",
-    "https://formulae.brew.sh/api/cask/visualvm.json",
-    "https://formulae.brew.sh/api/cask/grandperspective.json",
-    "https://formulae.brew.sh/api/cask/moonlight.json",
-    "https://formulae.brew.sh/api/cask/freetube.json",
-    "https://formulae.brew.sh/api/cask/chatwise.json",
-    "https://formulae.brew.sh/api/cask/motrix.json",
-    "https://formulae.brew.sh/api/cask/phpstorm.json",
-    "https://formulae.brew.sh/api/cask/marta.json",
-    "https://formulae.brew.sh/api/cask/mockoon.json",
-    "https://formulae.brew.sh/api/cask/proxyman.json",
-    "https://formulae.brew.sh/api/cask/typora.json",
-    "https://formulae.brew.sh/api/cask/meld.json",
-    "https://formulae.brew.sh/api/cask/freelens.json",
-    "https://formulae.brew.sh/api/cask/teamviewer-host.json",
-    "https://formulae.brew.sh/api/cask/teamviewer-quicksupport.json",
-    "https://formulae.brew.sh/api/cask/skim.json",
-    "https://formulae.brew.sh/api/cask/lens.json",
-    "https://formulae.brew.sh/api/cask/coteditor.json",
-    "https://formulae.brew.sh/api/cask/trae.json",
-    "https://formulae.brew.sh/api/cask/tunnelblick.json",
-    "https://formulae.brew.sh/api/cask/wechat.json",
-    "https://formulae.brew.sh/api/cask/redis-insight.json",
-    "https://formulae.brew.sh/api/cask/mos.json",
-    "https://formulae.brew.sh/api/cask/localsend.json",
-    "https://formulae.brew.sh/api/cask/qbittorrent.json",
-    "https://formulae.brew.sh/api/cask/monitorcontrol.json",
-    "https://formulae.brew.sh/api/cask/lulu.json",
-    "https://formulae.brew.sh/api/cask/headlamp.json",
-    "https://formulae.brew.sh/api/cask/librewolf.json",
-    "https://formulae.brew.sh/api/cask/dbeaver-community.json",
-    "https://formulae.brew.sh/api/cask/rustdesk.json",
-    "https://formulae.brew.sh/api/cask/easydict.json",
-    "https://formulae.brew.sh/api/cask/unnaturalscrollwheels.json",
-    "https://formulae.brew.sh/api/cask/downie.json",
-    "https://formulae.brew.sh/api/cask/hazel.json",
-    "https://formulae.brew.sh/api/cask/cleanshot.json",
-    "https://formulae.brew.sh/api/cask/pastebot.json",
-    "https://formulae.brew.sh/api/cask/zoom.json",
-    "https://formulae.brew.sh/api/cask/firefox.json",
-    "https://formulae.brew.sh/api/cask/slack.json",
-    "https://formulae.brew.sh/api/cask/microsoft-teams.json",
-    "https://formulae.brew.sh/api/cask/spotify.json",
-    "https://formulae.brew.sh/api/cask/intune-company-portal.json",
-    "https://formulae.brew.sh/api/cask/windows-app.json",
-    "https://formulae.brew.sh/api/cask/parallels.json",
-    "https://formulae.brew.sh/api/cask/keepassxc.json",
-    "https://formulae.brew.sh/api/cask/synology-drive.json",
-    "https://formulae.brew.sh/api/cask/grammarly-desktop.json",
-    "https://formulae.brew.sh/api/cask/todoist-app.json",
-    "https://formulae.brew.sh/api/cask/xmind.json",
-    # Homebrew renamed the "docker" cask to "docker-desktop"; the old endpoint 404s,
-    # which silently froze Docker Desktop version updates (Issue #125)
-    "https://formulae.brew.sh/api/cask/docker-desktop.json",
-    "https://formulae.brew.sh/api/cask/vlc.json",
-    "https://formulae.brew.sh/api/cask/bitwarden.json",
-    "https://formulae.brew.sh/api/cask/miro.json",
-    "https://formulae.brew.sh/api/cask/snagit.json",
-    "https://formulae.brew.sh/api/cask/canva.json",
-    "https://formulae.brew.sh/api/cask/blender.json",
-    "https://formulae.brew.sh/api/cask/webex.json",
-    "https://formulae.brew.sh/api/cask/mongodb-compass.json",
-    "https://formulae.brew.sh/api/cask/suspicious-package.json",
-    "https://formulae.brew.sh/api/cask/notion.json",
-    "https://formulae.brew.sh/api/cask/anydesk.json",
-    "https://formulae.brew.sh/api/cask/android-studio.json",
-    "https://formulae.brew.sh/api/cask/brave-browser.json",
-    "https://formulae.brew.sh/api/cask/evernote.json",
-    "https://formulae.brew.sh/api/cask/dropbox.json",
-    "https://formulae.brew.sh/api/cask/krisp.json",
-    "https://formulae.brew.sh/api/cask/obsidian.json",
-    "https://formulae.brew.sh/api/cask/rstudio.json",
-    "https://formulae.brew.sh/api/cask/utm.json",
-    "https://formulae.brew.sh/api/cask/vnc-viewer.json",
-    "https://formulae.brew.sh/api/cask/betterdisplay.json",
-    "https://formulae.brew.sh/api/cask/orbstack.json",
-    "https://formulae.brew.sh/api/cask/capcut.json",
-    "https://formulae.brew.sh/api/cask/bbedit.json",
-    "https://formulae.brew.sh/api/cask/termius.json",
-    "https://formulae.brew.sh/api/cask/corretto@21.json",
-    "https://formulae.brew.sh/api/cask/anki.json",
-    "https://formulae.brew.sh/api/cask/netbeans.json",
-    "https://formulae.brew.sh/api/cask/audacity.json",
-    "https://formulae.brew.sh/api/cask/chatgpt.json",
-    "https://formulae.brew.sh/api/cask/citrix-workspace.json",
-    "https://formulae.brew.sh/api/cask/datagrip.json",
-    "https://formulae.brew.sh/api/cask/discord.json",
-    "https://formulae.brew.sh/api/cask/duckduckgo.json",
-    "https://formulae.brew.sh/api/cask/elgato-wave-link.json",
-    "https://formulae.brew.sh/api/cask/elgato-camera-hub.json",
-    "https://formulae.brew.sh/api/cask/elgato-stream-deck.json",
-    "https://formulae.brew.sh/api/cask/drawio.json",
-    "https://formulae.brew.sh/api/cask/foxit-pdf-editor.json",
-    "https://formulae.brew.sh/api/cask/gimp.json",
-    "https://formulae.brew.sh/api/cask/geany.json",
-    "https://formulae.brew.sh/api/cask/goland.json",
-    "https://formulae.brew.sh/api/cask/mediainfo.json",
-    "https://formulae.brew.sh/api/cask/hopper-disassembler.json",
-    "https://formulae.brew.sh/api/cask/santa.json",
-    "https://formulae.brew.sh/api/cask/intellij-idea-ce.json",
-    "https://formulae.brew.sh/api/cask/keeper-password-manager.json",
-    "https://formulae.brew.sh/api/cask/libreoffice.json",
-    "https://formulae.brew.sh/api/cask/podman-desktop.json",
-    "https://formulae.brew.sh/api/cask/pycharm-ce.json",
-    "https://formulae.brew.sh/api/cask/splashtop-business.json",
-    "https://formulae.brew.sh/api/cask/webstorm.json",
-    "https://formulae.brew.sh/api/cask/yubico-yubikey-manager.json",
-    "https://formulae.brew.sh/api/cask/imazing.json",
-    "https://formulae.brew.sh/api/cask/imazing-profile-editor.json",
-    "https://formulae.brew.sh/api/cask/ghostty.json",
-    "https://formulae.brew.sh/api/cask/git-credential-manager.json",
-    "https://formulae.brew.sh/api/cask/macfuse.json",
-    "https://formulae.brew.sh/api/cask/raycast.json",
-    "https://formulae.brew.sh/api/cask/zulu.json",
-    "https://formulae.brew.sh/api/cask/stats.json",
-    "https://formulae.brew.sh/api/cask/temurin.json",
-    "https://formulae.brew.sh/api/cask/bruno.json",
-    "https://formulae.brew.sh/api/cask/zed.json",
-    "https://formulae.brew.sh/api/cask/virtualbox.json",
-    "https://formulae.brew.sh/api/cask/kitty.json",
-    "https://formulae.brew.sh/api/cask/db-browser-for-sqlite.json",
-    "https://formulae.brew.sh/api/cask/alacritty.json",
-    "https://formulae.brew.sh/api/cask/pgadmin4.json",
-    "https://formulae.brew.sh/api/cask/iina.json",
-    "https://formulae.brew.sh/api/cask/karabiner-elements.json",
-    "https://formulae.brew.sh/api/cask/mactex.json",
-    "https://formulae.brew.sh/api/cask/microsoft-edge.json",
-    "https://formulae.brew.sh/api/cask/calibre.json",
-    "https://formulae.brew.sh/api/cask/obs.json",
-    "https://formulae.brew.sh/api/cask/keka.json",
-    "https://formulae.brew.sh/api/cask/balenaetcher.json",
-    "https://formulae.brew.sh/api/cask/rancher.json",
-    "https://formulae.brew.sh/api/cask/vscodium.json",
-    "https://formulae.brew.sh/api/cask/mounty.json",
-    "https://formulae.brew.sh/api/cask/microsoft-office.json",
-    "https://formulae.brew.sh/api/cask/transmission.json",
-    "https://formulae.brew.sh/api/cask/shottr.json",
-    "https://formulae.brew.sh/api/cask/clipy.json",
-    "https://formulae.brew.sh/api/cask/freecad.json",
-    "https://formulae.brew.sh/api/cask/insomnia.json",
-    "https://formulae.brew.sh/api/cask/flameshot.json",
-    "https://formulae.brew.sh/api/cask/onedrive.json",
-    "https://formulae.brew.sh/api/cask/lm-studio.json",
-    "https://formulae.brew.sh/api/cask/privileges.json",
-    "https://formulae.brew.sh/api/cask/zen.json",
-    "https://formulae.brew.sh/api/cask/sync.json",
-    "https://formulae.brew.sh/api/cask/opera.json",
-    "https://formulae.brew.sh/api/cask/protonvpn.json",
-    "https://formulae.brew.sh/api/cask/little-snitch.json",
-    "https://formulae.brew.sh/api/cask/micro-snitch.json",
-    "https://formulae.brew.sh/api/cask/jetbrains-toolbox.json",
-    "https://formulae.brew.sh/api/cask/clion.json",
-    "https://formulae.brew.sh/api/cask/krita.json",
-    "https://formulae.brew.sh/api/cask/onyx.json",
-    "https://formulae.brew.sh/api/cask/hiddenbar.json",
-    "https://formulae.brew.sh/api/cask/steam.json",
-    "https://formulae.brew.sh/api/cask/gifox.json",
-    "https://formulae.brew.sh/api/cask/inkscape.json",
-    "https://formulae.brew.sh/api/cask/boltai.json",
-    "https://formulae.brew.sh/api/cask/boxcryptor.json",
-    "https://formulae.brew.sh/api/cask/breaktimer.json",
-    "https://formulae.brew.sh/api/cask/anydo.json",
-    "https://formulae.brew.sh/api/cask/apidog.json",
-    "https://formulae.brew.sh/api/cask/apparency.json",
-    "https://formulae.brew.sh/api/cask/badgeify.json",
-    "https://formulae.brew.sh/api/cask/airtable.json",
-    "https://formulae.brew.sh/api/cask/airy.json",
-    "https://formulae.brew.sh/api/cask/amadine.json",
-    "https://formulae.brew.sh/api/cask/amazon-chime.json",
-    "https://formulae.brew.sh/api/cask/google-ads-editor.json",
-    "https://formulae.brew.sh/api/cask/hazeover.json",
-    "https://formulae.brew.sh/api/cask/jellyfin.json",
-    "https://formulae.brew.sh/api/cask/gitfinder.json",
-    "https://formulae.brew.sh/api/cask/codeedit.json",
-    "https://formulae.brew.sh/api/cask/crystalfetch.json",
-    "https://formulae.brew.sh/api/cask/dataflare.json",
-    "https://formulae.brew.sh/api/cask/dataspell.json",
-    "https://formulae.brew.sh/api/cask/dbgate.json",
-    "https://formulae.brew.sh/api/cask/devutils.json",
-    "https://formulae.brew.sh/api/cask/doughnut.json",
-    "https://formulae.brew.sh/api/cask/drawbot.json",
-    "https://formulae.brew.sh/api/cask/dropdmg.json",
-    "https://formulae.brew.sh/api/cask/elephas.json",
-    "https://formulae.brew.sh/api/cask/epic-games.json",
-    "https://formulae.brew.sh/api/cask/calmly-writer.json",
-    "https://formulae.brew.sh/api/cask/camtasia.json",
-    "https://formulae.brew.sh/api/cask/klokki.json",
-    "https://formulae.brew.sh/api/cask/langgraph-studio.json",
-    "https://formulae.brew.sh/api/cask/joplin.json",
-    "https://formulae.brew.sh/api/cask/remote-desktop-manager.json",
-    "https://formulae.brew.sh/api/cask/rotato.json",
-    "https://formulae.brew.sh/api/cask/tenable-nessus-agent.json",
-    "https://formulae.brew.sh/api/cask/8x8-work.json",
-    "https://formulae.brew.sh/api/cask/fork.json",
-    "https://formulae.brew.sh/api/cask/box-tools.json",
-    "https://formulae.brew.sh/api/cask/musescore.json",
-    "https://formulae.brew.sh/api/cask/intellij-idea.json",
-    "https://formulae.brew.sh/api/cask/handbrake-app.json",
-    "https://formulae.brew.sh/api/cask/minecraft.json",
-    "https://formulae.brew.sh/api/cask/deepl.json",
-    "https://formulae.brew.sh/api/cask/warp.json",
-    # New DMG apps (batch 1 - 57 apps)
-    "https://formulae.brew.sh/api/cask/aldente.json",
-    "https://formulae.brew.sh/api/cask/another-redis-desktop-manager.json",
-    "https://formulae.brew.sh/api/cask/appflowy.json",
-    "https://formulae.brew.sh/api/cask/audirvana.json",
-    "https://formulae.brew.sh/api/cask/avidemux.json",
-    "https://formulae.brew.sh/api/cask/backblaze.json",
-    "https://formulae.brew.sh/api/cask/beekeeper-studio.json",
-    "https://formulae.brew.sh/api/cask/charles.json",
-    "https://formulae.brew.sh/api/cask/cheatsheet.json",
-    "https://formulae.brew.sh/api/cask/contexts.json",
-    "https://formulae.brew.sh/api/cask/craft.json",
-    "https://formulae.brew.sh/api/cask/curio.json",
-    "https://formulae.brew.sh/api/cask/disk-drill.json",
-    "https://formulae.brew.sh/api/cask/elmedia-player.json",
-    "https://formulae.brew.sh/api/cask/expandrive.json",
-    "https://formulae.brew.sh/api/cask/filen.json",
-    "https://formulae.brew.sh/api/cask/floorp.json",
-    "https://formulae.brew.sh/api/cask/guilded.json",
-    "https://formulae.brew.sh/api/cask/hoppscotch.json",
-    "https://formulae.brew.sh/api/cask/http-toolkit.json",
-    "https://formulae.brew.sh/api/cask/hype.json",
-    "https://formulae.brew.sh/api/cask/jitsi-meet.json",
-    "https://formulae.brew.sh/api/cask/kodi.json",
-    "https://formulae.brew.sh/api/cask/lapce.json",
-    "https://formulae.brew.sh/api/cask/lark.json",
-    "https://formulae.brew.sh/api/cask/launchbar.json",
-    "https://formulae.brew.sh/api/cask/logseq.json",
-    "https://formulae.brew.sh/api/cask/losslesscut.json",
-    "https://formulae.brew.sh/api/cask/lunacy.json",
-    "https://formulae.brew.sh/api/cask/makemkv.json",
-    "https://formulae.brew.sh/api/cask/milanote.json",
-    "https://formulae.brew.sh/api/cask/mimestream.json",
-    "https://formulae.brew.sh/api/cask/movist-pro.json",
-    "https://formulae.brew.sh/api/cask/mullvad-browser.json",
-    "https://formulae.brew.sh/api/cask/one-switch.json",
-    "https://formulae.brew.sh/api/cask/path-finder.json",
-    "https://formulae.brew.sh/api/cask/permute.json",
-    "https://formulae.brew.sh/api/cask/plexamp.json",
-    "https://formulae.brew.sh/api/cask/resilio-sync.json",
-    "https://formulae.brew.sh/api/cask/responsively.json",
-    "https://formulae.brew.sh/api/cask/screenflow.json",
-    "https://formulae.brew.sh/api/cask/sensei.json",
-    "https://formulae.brew.sh/api/cask/sigmaos.json",
-    "https://formulae.brew.sh/api/cask/simplenote.json",
-    "https://formulae.brew.sh/api/cask/skype.json",
-    "https://formulae.brew.sh/api/cask/stremio.json",
-    "https://formulae.brew.sh/api/cask/superduper.json",
-    "https://formulae.brew.sh/api/cask/surfshark.json",
-    "https://formulae.brew.sh/api/cask/tableplus.json",
-    "https://formulae.brew.sh/api/cask/topnotch.json",
-    "https://formulae.brew.sh/api/cask/tor-browser.json",
-    "https://formulae.brew.sh/api/cask/tresorit.json",
-    "https://formulae.brew.sh/api/cask/typinator.json",
-    "https://formulae.brew.sh/api/cask/viscosity.json",
-    "https://formulae.brew.sh/api/cask/vox.json",
-    "https://formulae.brew.sh/api/cask/zettlr.json",
-    "https://formulae.brew.sh/api/cask/zulip.json",
-    # New DMG apps (batch 2 - 65 apps)
-    "https://formulae.brew.sh/api/cask/amazon-music.json",
-    "https://formulae.brew.sh/api/cask/atext.json",
-    "https://formulae.brew.sh/api/cask/birdfont.json",
-    "https://formulae.brew.sh/api/cask/biscuit.json",
-    "https://formulae.brew.sh/api/cask/bluefish.json",
-    "https://formulae.brew.sh/api/cask/bunch.json",
-    "https://formulae.brew.sh/api/cask/butler.json",
-    "https://formulae.brew.sh/api/cask/capacities.json",
-    "https://formulae.brew.sh/api/cask/clickup.json",
-    "https://formulae.brew.sh/api/cask/commander-one.json",
-    "https://formulae.brew.sh/api/cask/cool-retro-term.json",
-    "https://formulae.brew.sh/api/cask/copyq.json",
-    "https://formulae.brew.sh/api/cask/deezer.json",
-    "https://formulae.brew.sh/api/cask/disk-inventory-x.json",
-    "https://formulae.brew.sh/api/cask/ditto.json",
-    "https://formulae.brew.sh/api/cask/double-commander.json",
-    "https://formulae.brew.sh/api/cask/eclipse-ide.json",
-    "https://formulae.brew.sh/api/cask/eclipse-java.json",
-    "https://formulae.brew.sh/api/cask/extraterm.json",
-    "https://formulae.brew.sh/api/cask/ferdium.json",
-    "https://formulae.brew.sh/api/cask/fig.json",
-    "https://formulae.brew.sh/api/cask/firecamp.json",
-    "https://formulae.brew.sh/api/cask/fleet.json",
-    "https://formulae.brew.sh/api/cask/fontbase.json",
-    "https://formulae.brew.sh/api/cask/fontlab.json",
-    "https://formulae.brew.sh/api/cask/franz.json",
-    "https://formulae.brew.sh/api/cask/ghost-browser.json",
-    "https://formulae.brew.sh/api/cask/go2shell.json",
-    "https://formulae.brew.sh/api/cask/linearmouse.json",
-    "https://formulae.brew.sh/api/cask/marginnote.json",
-    "https://formulae.brew.sh/api/cask/mem.json",
-    "https://formulae.brew.sh/api/cask/missive.json",
-    "https://formulae.brew.sh/api/cask/mucommander.json",
-    "https://formulae.brew.sh/api/cask/notion-enhanced.json",
-    "https://formulae.brew.sh/api/cask/ocenaudio.json",
-    "https://formulae.brew.sh/api/cask/omnidisksweeper.json",
-    "https://formulae.brew.sh/api/cask/opera-gx.json",
-    "https://formulae.brew.sh/api/cask/polymail.json",
-    "https://formulae.brew.sh/api/cask/postbox.json",
-    "https://formulae.brew.sh/api/cask/protopie.json",
-    "https://formulae.brew.sh/api/cask/pycharm.json",
-    "https://formulae.brew.sh/api/cask/qobuz.json",
-    "https://formulae.brew.sh/api/cask/quicksilver.json",
-    "https://formulae.brew.sh/api/cask/reaper.json",
-    "https://formulae.brew.sh/api/cask/roam-research.json",
-    "https://formulae.brew.sh/api/cask/roon.json",
-    "https://formulae.brew.sh/api/cask/rubymine.json",
-    "https://formulae.brew.sh/api/cask/shift.json",
-    "https://formulae.brew.sh/api/cask/soapui.json",
-    "https://formulae.brew.sh/api/cask/sonos.json",
-    "https://formulae.brew.sh/api/cask/stoplight-studio.json",
-    "https://formulae.brew.sh/api/cask/streamlabs.json",
-    "https://formulae.brew.sh/api/cask/superkey.json",
-    "https://formulae.brew.sh/api/cask/textexpander.json",
-    "https://formulae.brew.sh/api/cask/transcribe.json",
-    "https://formulae.brew.sh/api/cask/typeface.json",
-    "https://formulae.brew.sh/api/cask/ungoogled-chromium.json",
-    "https://formulae.brew.sh/api/cask/waterfox.json",
-    "https://formulae.brew.sh/api/cask/wirecast.json",
-    # New DMG apps (batch 3 - 53 apps)
-    "https://formulae.brew.sh/api/cask/ableton-live-lite.json",
-    "https://formulae.brew.sh/api/cask/ableton-live-suite.json",
-    "https://formulae.brew.sh/api/cask/actual.json",
-    "https://formulae.brew.sh/api/cask/adium.json",
-    "https://formulae.brew.sh/api/cask/airdroid.json",
-    "https://formulae.brew.sh/api/cask/android-file-transfer.json",
-    "https://formulae.brew.sh/api/cask/android-ndk.json",
-    "https://formulae.brew.sh/api/cask/applite.json",
-    "https://formulae.brew.sh/api/cask/balsamiq-wireframes.json",
-    "https://formulae.brew.sh/api/cask/bibdesk.json",
-    "https://formulae.brew.sh/api/cask/bilibili.json",
-    "https://formulae.brew.sh/api/cask/bluebubbles.json",
-    "https://formulae.brew.sh/api/cask/bluej.json",
-    "https://formulae.brew.sh/api/cask/boost-note.json",
-    "https://formulae.brew.sh/api/cask/bria.json",
-    "https://formulae.brew.sh/api/cask/cerebro.json",
-    "https://formulae.brew.sh/api/cask/chronosync.json",
-    "https://formulae.brew.sh/api/cask/cleanmymac-zh.json",
-    "https://formulae.brew.sh/api/cask/clipgrab.json",
-    "https://formulae.brew.sh/api/cask/cloudcompare.json",
-    "https://formulae.brew.sh/api/cask/cloudmounter.json",
-    "https://formulae.brew.sh/api/cask/colorwell.json",
-    "https://formulae.brew.sh/api/cask/companion.json",
-    "https://formulae.brew.sh/api/cask/coolterm.json",
-    "https://formulae.brew.sh/api/cask/crypter.json",
-    "https://formulae.brew.sh/api/cask/cursr.json",
-    "https://formulae.brew.sh/api/cask/datagraph.json",
-    "https://formulae.brew.sh/api/cask/deckset.json",
-    "https://formulae.brew.sh/api/cask/deepgit.json",
-    "https://formulae.brew.sh/api/cask/defold.json",
-    "https://formulae.brew.sh/api/cask/dingtalk.json",
-    "https://formulae.brew.sh/api/cask/displaperture.json",
-    "https://formulae.brew.sh/api/cask/djview.json",
-    "https://formulae.brew.sh/api/cask/dorico.json",
-    "https://formulae.brew.sh/api/cask/douyin.json",
-    "https://formulae.brew.sh/api/cask/duet.json",
-    "https://formulae.brew.sh/api/cask/dust3d.json",
-    "https://formulae.brew.sh/api/cask/dynalist.json",
-    "https://formulae.brew.sh/api/cask/eclipse-cpp.json",
-    "https://formulae.brew.sh/api/cask/eclipse-dsl.json",
-    "https://formulae.brew.sh/api/cask/eclipse-installer.json",
-    "https://formulae.brew.sh/api/cask/eclipse-jee.json",
-    "https://formulae.brew.sh/api/cask/eclipse-modeling.json",
-    "https://formulae.brew.sh/api/cask/eclipse-php.json",
-    "https://formulae.brew.sh/api/cask/eclipse-rcp.json",
-    "https://formulae.brew.sh/api/cask/electric-sheep.json",
-    "https://formulae.brew.sh/api/cask/electron-cash.json",
-    "https://formulae.brew.sh/api/cask/equinox.json",
-    "https://formulae.brew.sh/api/cask/eudic.json",
-    "https://formulae.brew.sh/api/cask/far2l.json",
-    "https://formulae.brew.sh/api/cask/010-editor.json",
-    "https://formulae.brew.sh/api/cask/4k-slideshow-maker.json",
-    "https://formulae.brew.sh/api/cask/4k-stogram.json",
-    "https://formulae.brew.sh/api/cask/4k-video-downloader.json",
-    "https://formulae.brew.sh/api/cask/4k-video-to-mp3.json",
-    "https://formulae.brew.sh/api/cask/4k-youtube-to-mp3.json",
-    "https://formulae.brew.sh/api/cask/abbyy-finereader-pdf.json",
-    "https://formulae.brew.sh/api/cask/activitywatch.json",
-    "https://formulae.brew.sh/api/cask/adlock.json",
-    "https://formulae.brew.sh/api/cask/adobe-digital-editions.json",
-    "https://formulae.brew.sh/api/cask/adobe-dng-converter.json",
-    "https://formulae.brew.sh/api/cask/airserver.json",
-    "https://formulae.brew.sh/api/cask/airtame.json",
-    "https://formulae.brew.sh/api/cask/akiflow.json",
-    "https://formulae.brew.sh/api/cask/anytype.json",
-    "https://formulae.brew.sh/api/cask/app-cleaner.json",
-    "https://formulae.brew.sh/api/cask/archi.json",
-    "https://formulae.brew.sh/api/cask/avast-secure-browser.json",
-    "https://formulae.brew.sh/api/cask/axure-rp.json",
-    "https://formulae.brew.sh/api/cask/beaver-notes.json",
-    "https://formulae.brew.sh/api/cask/betaflight-configurator.json",
-    "https://formulae.brew.sh/api/cask/binance.json",
-    "https://formulae.brew.sh/api/cask/bitbox.json",
-    "https://formulae.brew.sh/api/cask/bitrix24.json",
-    "https://formulae.brew.sh/api/cask/bluewallet.json",
-    "https://formulae.brew.sh/api/cask/boom-3d.json",
-    "https://formulae.brew.sh/api/cask/buttercup.json",
-    "https://formulae.brew.sh/api/cask/buzz.json",
-    "https://formulae.brew.sh/api/cask/calhash.json",
-    "https://formulae.brew.sh/api/cask/calibrite-profiler.json",
-    "https://formulae.brew.sh/api/cask/captain.json",
-    "https://formulae.brew.sh/api/cask/capto.json",
-    "https://formulae.brew.sh/api/cask/ccleaner.json",
-    "https://formulae.brew.sh/api/cask/chalk.json",
-    "https://formulae.brew.sh/api/cask/charmstone.json",
-    "https://formulae.brew.sh/api/cask/chatwork.json",
-    "https://formulae.brew.sh/api/cask/cheetah3d.json",
-    "https://formulae.brew.sh/api/cask/cisco-proximity.json",
-    "https://formulae.brew.sh/api/cask/cleanclip.json",
-    "https://formulae.brew.sh/api/cask/clipbook.json",
-    "https://formulae.brew.sh/api/cask/colour-contrast-analyser.json",
-    "https://formulae.brew.sh/api/cask/connect-fonts.json",
-    "https://formulae.brew.sh/api/cask/connectmenow.json",
-    "https://formulae.brew.sh/api/cask/cursorsense.json",
-    "https://formulae.brew.sh/api/cask/darkmodebuddy.json",
-    "https://formulae.brew.sh/api/cask/darktable.json",
-    "https://formulae.brew.sh/api/cask/default-folder-x.json",
-    "https://formulae.brew.sh/api/cask/descript.json",
-    "https://formulae.brew.sh/api/cask/desktime.json",
-    "https://formulae.brew.sh/api/cask/devknife.json",
-    "https://formulae.brew.sh/api/cask/diffmerge.json",
-    "https://formulae.brew.sh/api/cask/diffusionbee.json",
-    "https://formulae.brew.sh/api/cask/digiexam.json",
-    "https://formulae.brew.sh/api/cask/dockfix.json",
-    "https://formulae.brew.sh/api/cask/eaglefiler.json",
-    "https://formulae.brew.sh/api/cask/electronmail.json",
-    "https://formulae.brew.sh/api/cask/electrum.json",
-    "https://formulae.brew.sh/api/cask/exifcleaner.json",
-    "https://formulae.brew.sh/api/cask/exifrenamer.json",
-    "https://formulae.brew.sh/api/cask/fellow.json",
-    "https://formulae.brew.sh/api/cask/filemaker-pro.json",
-    "https://formulae.brew.sh/api/cask/fing.json",
-    "https://formulae.brew.sh/api/cask/flexoptix.json",
-    "https://formulae.brew.sh/api/cask/folx.json",
-    "https://formulae.brew.sh/api/cask/free-download-manager.json",
-    "https://formulae.brew.sh/api/cask/funter.json",
-    "https://formulae.brew.sh/api/cask/garmin-express.json",
-    "https://formulae.brew.sh/api/cask/gdevelop.json",
-    "https://formulae.brew.sh/api/cask/github-copilot-for-xcode.json",
-    "https://formulae.brew.sh/api/cask/goodsync.json",
-    "https://formulae.brew.sh/api/cask/google-earth-pro.json",
-    "https://formulae.brew.sh/api/cask/google-web-designer.json",
-    "https://formulae.brew.sh/api/cask/granola.json",
-    "https://formulae.brew.sh/api/cask/hex-fiend.json",
-    "https://formulae.brew.sh/api/cask/hides.json",
-    "https://formulae.brew.sh/api/cask/hma-vpn.json",
-    "https://formulae.brew.sh/api/cask/icon-composer.json",
-    "https://formulae.brew.sh/api/cask/idagio.json",
-    "https://formulae.brew.sh/api/cask/iexplorer.json",
-    "https://formulae.brew.sh/api/cask/imazing-converter.json",
-    "https://formulae.brew.sh/api/cask/imhex.json",
-    "https://formulae.brew.sh/api/cask/input-source-pro.json",
-    "https://formulae.brew.sh/api/cask/integrity.json",
-    "https://formulae.brew.sh/api/cask/intellidock.json",
-    "https://formulae.brew.sh/api/cask/invesalius.json",
-    "https://formulae.brew.sh/api/cask/jami.json",
-    "https://formulae.brew.sh/api/cask/jamovi.json",
-    "https://formulae.brew.sh/api/cask/jasp.json",
-    "https://formulae.brew.sh/api/cask/jiggler.json",
-    "https://formulae.brew.sh/api/cask/kdenlive.json",
-    "https://formulae.brew.sh/api/cask/keeweb.json",
-    "https://formulae.brew.sh/api/cask/keyboard-cowboy.json",
-    "https://formulae.brew.sh/api/cask/keystore-explorer.json",
-    "https://formulae.brew.sh/api/cask/kicad.json",
-    "https://formulae.brew.sh/api/cask/kobo.json",
-    "https://formulae.brew.sh/api/cask/launchos.json",
-    "https://formulae.brew.sh/api/cask/librecad.json",
-    "https://formulae.brew.sh/api/cask/lightburn.json",
-    "https://formulae.brew.sh/api/cask/limitless.json",
-    "https://formulae.brew.sh/api/cask/lo-rain.json",
-    "https://formulae.brew.sh/api/cask/local.json",
-    "https://formulae.brew.sh/api/cask/loom.json",
-    "https://formulae.brew.sh/api/cask/loupedeck.json",
-    "https://formulae.brew.sh/api/cask/lunar.json",
-    "https://formulae.brew.sh/api/cask/lyx.json",
-    "https://formulae.brew.sh/api/cask/maccleaner-pro.json",
-    "https://formulae.brew.sh/api/cask/macpilot.json",
-    "https://formulae.brew.sh/api/cask/masscode.json",
-    "https://formulae.brew.sh/api/cask/megasync.json",
-    "https://formulae.brew.sh/api/cask/mellel.json",
-    "https://formulae.brew.sh/api/cask/memory-cleaner.json",
-    "https://formulae.brew.sh/api/cask/mendeley-reference-manager.json",
-    "https://formulae.brew.sh/api/cask/menubarx.json",
-    "https://formulae.brew.sh/api/cask/mindmac.json",
-    "https://formulae.brew.sh/api/cask/modern-csv.json",
-    "https://formulae.brew.sh/api/cask/moom.json",
-    "https://formulae.brew.sh/api/cask/mqttx.json",
-    "https://formulae.brew.sh/api/cask/multi.json",
-    "https://formulae.brew.sh/api/cask/multitouch.json",
-    "https://formulae.brew.sh/api/cask/museeks.json",
-    "https://formulae.brew.sh/api/cask/nagstamon.json",
-    "https://formulae.brew.sh/api/cask/neo-network-utility.json",
-    "https://formulae.brew.sh/api/cask/netspot.json",
-    "https://formulae.brew.sh/api/cask/nextcloud-talk.json",
-    "https://formulae.brew.sh/api/cask/nightfall.json",
-    "https://formulae.brew.sh/api/cask/notesnook.json",
-    "https://formulae.brew.sh/api/cask/numi.json",
-    "https://formulae.brew.sh/api/cask/oka-unarchiver.json",
-    "https://formulae.brew.sh/api/cask/omnigraffle.json",
-    "https://formulae.brew.sh/api/cask/omniplan.json",
-    "https://formulae.brew.sh/api/cask/onionshare.json",
-    "https://formulae.brew.sh/api/cask/only-switch.json",
-    "https://formulae.brew.sh/api/cask/opal-composer.json",
-    "https://formulae.brew.sh/api/cask/openaudible.json",
-    "https://formulae.brew.sh/api/cask/openboard.json",
-    "https://formulae.brew.sh/api/cask/openlens.json",
-    "https://formulae.brew.sh/api/cask/openrefine.json",
-    "https://formulae.brew.sh/api/cask/openshot-video-editor.json",
-    "https://formulae.brew.sh/api/cask/optimus-player.json",
-    "https://formulae.brew.sh/api/cask/pacifist.json",
-    "https://formulae.brew.sh/api/cask/pale-moon.json",
-    "https://formulae.brew.sh/api/cask/pdfsam-basic.json",
-    "https://formulae.brew.sh/api/cask/pencil.json",
-    "https://formulae.brew.sh/api/cask/picview.json",
-    "https://formulae.brew.sh/api/cask/pitch.json",
-    "https://formulae.brew.sh/api/cask/popsql.json",
-    "https://formulae.brew.sh/api/cask/preform.json",
-    "https://formulae.brew.sh/api/cask/prism.json",
-    "https://formulae.brew.sh/api/cask/processing.json",
-    "https://formulae.brew.sh/api/cask/proton-mail-bridge.json",
-    "https://formulae.brew.sh/api/cask/qgis.json",
-    "https://formulae.brew.sh/api/cask/raspberry-pi-imager.json",
-    "https://formulae.brew.sh/api/cask/recents.json",
-    "https://formulae.brew.sh/api/cask/redis-pro.json",
-    "https://formulae.brew.sh/api/cask/retroarch.json",
-    "https://formulae.brew.sh/api/cask/rewind.json",
-    "https://formulae.brew.sh/api/cask/riverside-studio.json",
-    "https://formulae.brew.sh/api/cask/rize.json",
-    "https://formulae.brew.sh/api/cask/roboform.json",
-    "https://formulae.brew.sh/api/cask/royal-tsx.json",
-    "https://formulae.brew.sh/api/cask/runjs.json",
-    "https://formulae.brew.sh/api/cask/rustrover.json",
-    "https://formulae.brew.sh/api/cask/safe-exam-browser.json",
-    "https://formulae.brew.sh/api/cask/sanesidebuttons.json",
-    "https://formulae.brew.sh/api/cask/sc-menu.json",
-    "https://formulae.brew.sh/api/cask/scratch.json",
-    "https://formulae.brew.sh/api/cask/screaming-frog-seo-spider.json",
-    "https://formulae.brew.sh/api/cask/scribus.json",
-    "https://formulae.brew.sh/api/cask/session.json",
-    "https://formulae.brew.sh/api/cask/sf-symbols.json",
-    "https://formulae.brew.sh/api/cask/shapr3d.json",
-    "https://formulae.brew.sh/api/cask/shotcut.json",
-    "https://formulae.brew.sh/api/cask/shureplus-motiv.json",
-    "https://formulae.brew.sh/api/cask/silhouette-studio.json",
-    "https://formulae.brew.sh/api/cask/slab.json",
-    "https://formulae.brew.sh/api/cask/smartsheet.json",
-    "https://formulae.brew.sh/api/cask/smartsvn.json",
-    "https://formulae.brew.sh/api/cask/sococo.json",
-    "https://formulae.brew.sh/api/cask/sonic-visualiser.json",
-    "https://formulae.brew.sh/api/cask/sonobus.json",
-    "https://formulae.brew.sh/api/cask/sound-control.json",
-    "https://formulae.brew.sh/api/cask/soundanchor.json",
-    "https://formulae.brew.sh/api/cask/spamsieve.json",
-    "https://formulae.brew.sh/api/cask/spitfire-audio.json",
-    "https://formulae.brew.sh/api/cask/sqlectron.json",
-    "https://formulae.brew.sh/api/cask/ssh-config-editor.json",
-    "https://formulae.brew.sh/api/cask/staruml.json",
-    "https://formulae.brew.sh/api/cask/supercollider.json",
-    "https://formulae.brew.sh/api/cask/swifty.json",
-    "https://formulae.brew.sh/api/cask/swish.json",
-    "https://formulae.brew.sh/api/cask/taskade.json",
-    "https://formulae.brew.sh/api/cask/techsmith-capture.json",
-    "https://formulae.brew.sh/api/cask/ticktick.json",
-    "https://formulae.brew.sh/api/cask/tiles.json",
-    "https://formulae.brew.sh/api/cask/timing.json",
-    "https://formulae.brew.sh/api/cask/tradingview.json",
-    "https://formulae.brew.sh/api/cask/transfer.json",
-    "https://formulae.brew.sh/api/cask/trezor-suite.json",
-    "https://formulae.brew.sh/api/cask/tribler.json",
-    "https://formulae.brew.sh/api/cask/tuta-mail.json",
-    "https://formulae.brew.sh/api/cask/ukelele.json",
-    "https://formulae.brew.sh/api/cask/ultimaker-cura.json",
-    "https://formulae.brew.sh/api/cask/unity-hub.json",
-    "https://formulae.brew.sh/api/cask/vanilla.json",
-    "https://formulae.brew.sh/api/cask/via.json",
-    "https://formulae.brew.sh/api/cask/virtualbuddy.json",
-    "https://formulae.brew.sh/api/cask/visual-paradigm.json",
-    "https://formulae.brew.sh/api/cask/vuescan.json",
-    "https://formulae.brew.sh/api/cask/vyprvpn.json",
-    "https://formulae.brew.sh/api/cask/wealthfolio.json",
-    "https://formulae.brew.sh/api/cask/webcatalog.json",
-    "https://formulae.brew.sh/api/cask/weektodo.json",
-    "https://formulae.brew.sh/api/cask/whispering.json",
-    "https://formulae.brew.sh/api/cask/xld.json",
-    "https://formulae.brew.sh/api/cask/xmplify.json",
-    "https://formulae.brew.sh/api/cask/xnconvert.json",
-    "https://formulae.brew.sh/api/cask/xnviewmp.json",
-    "https://formulae.brew.sh/api/cask/yacreader.json",
-    "https://formulae.brew.sh/api/cask/yed.json",
-    "https://formulae.brew.sh/api/cask/yubico-authenticator.json",
-    "https://formulae.brew.sh/api/cask/zappy.json",
-    "https://formulae.brew.sh/api/cask/zotero.json",
-    "https://formulae.brew.sh/api/cask/zwift.json",
-    "https://formulae.brew.sh/api/cask/egnyte.json",
-    "https://formulae.brew.sh/api/cask/claude-code.json",
-    "https://formulae.brew.sh/api/cask/chatgpt-atlas.json",
-    "https://formulae.brew.sh/api/cask/kiro.json",
-    "https://formulae.brew.sh/api/cask/cmux.json",
-    "https://formulae.brew.sh/api/cask/winzip.json",
-    "https://formulae.brew.sh/api/cask/finetune.json",
-    "https://formulae.brew.sh/api/cask/heynote.json",
-    "https://formulae.brew.sh/api/cask/morgen.json",
-    "https://formulae.brew.sh/api/cask/cardpresso.json",
-    "https://formulae.brew.sh/api/cask/lastpass.json",
-    "https://formulae.brew.sh/api/cask/instantview.json",
-    "https://formulae.brew.sh/api/cask/macshot.json",
-    "https://formulae.brew.sh/api/cask/xtool-studio.json",
-    "https://formulae.brew.sh/api/cask/brainfm.json",
-    "https://formulae.brew.sh/api/cask/macdown-3000.json",
-    "https://formulae.brew.sh/api/cask/viber.json",
-    "https://formulae.brew.sh/api/cask/adobe-creative-cloud.json",
-    "https://formulae.brew.sh/api/cask/fluidvoice.json",
-    "https://formulae.brew.sh/api/cask/supremo.json",
-    "https://formulae.brew.sh/api/cask/linphone.json",
-    "https://formulae.brew.sh/api/cask/winbox.json",
-    "https://formulae.brew.sh/api/cask/multiviewer.json",
-    "https://formulae.brew.sh/api/cask/chatgpt-classic.json",
-    "https://formulae.brew.sh/api/cask/macusb.json",
-    "https://formulae.brew.sh/api/cask/vorssaint.json",
-    "https://formulae.brew.sh/api/cask/cmtrace-open.json",
-    "https://formulae.brew.sh/api/cask/prusaslicer.json",
-]
+homebrew_cask_urls = catalog.urls("homebrew_cask_urls")
 
 # PKG in DMG URLs
-pkg_in_dmg_urls = [
-    "https://formulae.brew.sh/api/cask/jabra-direct.json",
-    "https://formulae.brew.sh/api/cask/tableau.json",
-    "https://formulae.brew.sh/api/cask/autodesk-fusion.json",
-    "https://formulae.brew.sh/api/cask/nomachine.json",
-    "https://formulae.brew.sh/api/cask/adobe-acrobat-reader.json",
-    "https://formulae.brew.sh/api/cask/adobe-acrobat-pro.json",
-    "https://formulae.brew.sh/api/cask/openvpn-connect.json",
-    "https://formulae.brew.sh/api/cask/chrome-remote-desktop-host.json",
-    "https://formulae.brew.sh/api/cask/crashplan.json",
-    "https://formulae.brew.sh/api/cask/appgate-sdp-client.json",
-    "https://formulae.brew.sh/api/cask/splashtop-streamer.json",
-    # New PKG-in-DMG apps (batch 1 - 1 app)
-    "https://formulae.brew.sh/api/cask/gpg-suite.json",
-    "https://formulae.brew.sh/api/cask/wacom-tablet.json",
-    "https://formulae.brew.sh/api/cask/zenmap.json",
-    # Note: tuxera-ntfs removed - has directory-based PKG inside .mpkg that needs special handling
-    # Google Drive and Omnissa Horizon ship DMGs containing a PKG installer, which
-    # Intune cannot deploy as a DMG app (Issues #142, #135)
-    "https://formulae.brew.sh/api/cask/google-drive.json",
-    "https://formulae.brew.sh/api/cask/omnissa-horizon-client.json",
-    "https://formulae.brew.sh/api/cask/vagrant.json",
-    "https://formulae.brew.sh/api/cask/simplysign.json",
-    "https://formulae.brew.sh/api/cask/tableau-prep.json",
-    "https://formulae.brew.sh/api/cask/wireshark-app.json",
-]
+pkg_in_dmg_urls = catalog.urls("pkg_in_dmg_urls")
 
 # PKG in PKG URLs (some are ZIP files containing PKG that contains inner PKGs)
-pkg_in_pkg_urls = [
-    "https://formulae.brew.sh/api/cask/insta360-studio.json",
-    "https://formulae.brew.sh/api/cask/blurscreen.json",
-    "https://formulae.brew.sh/api/cask/topaz-gigapixel-ai.json",
-    "https://formulae.brew.sh/api/cask/parallels-client.json",
-    "https://formulae.brew.sh/api/cask/okta-advanced-server-access.json",
-    "https://formulae.brew.sh/api/cask/wire.json",
-    "https://formulae.brew.sh/api/cask/twingate.json",
-    "https://formulae.brew.sh/api/cask/aws-vpn-client.json",
-    "https://formulae.brew.sh/api/cask/malwarebytes.json",
-    "https://formulae.brew.sh/api/cask/nordlayer.json",
-    "https://formulae.brew.sh/api/cask/nordlocker.json",
-    "https://formulae.brew.sh/api/cask/nudge.json",
-    "https://formulae.brew.sh/api/cask/orka.json",
-    "https://formulae.brew.sh/api/cask/sony-ps-remote-play.json",
-    "https://formulae.brew.sh/api/cask/philips-hue-sync.json",
-    "https://formulae.brew.sh/api/cask/nordvpn.json",
-    "https://formulae.brew.sh/api/cask/gyazo.json",
-    "https://formulae.brew.sh/api/cask/tailscale-app.json",
-]
+pkg_in_pkg_urls = catalog.urls("pkg_in_pkg_urls")
 
 # PKG
-pkg_urls = [
-    "https://formulae.brew.sh/api/cask/mist.json",
-    "https://formulae.brew.sh/api/cask/gdisk.json",
-    "https://formulae.brew.sh/api/cask/parsec.json",
-    "https://formulae.brew.sh/api/cask/thonny.json",
-    "https://formulae.brew.sh/api/cask/quarto.json",
-    "https://formulae.brew.sh/api/cask/squirrel-app.json",
-    "https://formulae.brew.sh/api/cask/displaylink.json",
-    "https://formulae.brew.sh/api/cask/background-music.json",
-    "https://formulae.brew.sh/api/cask/nextcloud.json",
-    "https://formulae.brew.sh/api/cask/cloudflare-warp.json",
-    "https://formulae.brew.sh/api/cask/cisco-jabber.json",
-    "https://formulae.brew.sh/api/cask/microsoft-auto-update.json",
-    "https://formulae.brew.sh/api/cask/box-drive.json",
-    "https://formulae.brew.sh/api/cask/session-manager-plugin.json",
-    "https://formulae.brew.sh/api/cask/microsoft-office-businesspro.json",
-    # New PKG apps (batch 1 - 4 apps)
-    "https://formulae.brew.sh/api/cask/arq.json",
-    "https://formulae.brew.sh/api/cask/mega.json",
-    "https://formulae.brew.sh/api/cask/mullvad-vpn.json",
-    "https://formulae.brew.sh/api/cask/multipass.json",
-    # New PKG apps (batch 2 - 1 app)
-    "https://formulae.brew.sh/api/cask/whatsize.json",
-    # New PKG apps (batch 3 - 12 apps)
-    "https://formulae.brew.sh/api/cask/aptible.json",
-    "https://formulae.brew.sh/api/cask/bankid.json",
-    "https://formulae.brew.sh/api/cask/basictex.json",
-    "https://formulae.brew.sh/api/cask/blackhole-16ch.json",
-    "https://formulae.brew.sh/api/cask/blackhole-2ch.json",
-    "https://formulae.brew.sh/api/cask/blackhole-64ch.json",
-    "https://formulae.brew.sh/api/cask/clamxav.json",
-    "https://formulae.brew.sh/api/cask/displaycal.json",
-    "https://formulae.brew.sh/api/cask/duo-connect.json",
-    "https://formulae.brew.sh/api/cask/emclient.json",
-    "https://formulae.brew.sh/api/cask/enclave.json",
-    "https://formulae.brew.sh/api/cask/enpass.json",
-    "https://formulae.brew.sh/api/cask/bricklink-studio.json",
-    "https://formulae.brew.sh/api/cask/digikam.json",
-    "https://formulae.brew.sh/api/cask/dymo-connect.json",
-    "https://formulae.brew.sh/api/cask/expressvpn.json",
-    "https://formulae.brew.sh/api/cask/fuse-t.json",
-    "https://formulae.brew.sh/api/cask/gog-galaxy.json",
-    "https://formulae.brew.sh/api/cask/ibm-aspera-connect.json",
-    "https://formulae.brew.sh/api/cask/low-profile.json",
-    "https://formulae.brew.sh/api/cask/ltspice.json",
-    "https://formulae.brew.sh/api/cask/microsoft-excel.json",
-    "https://formulae.brew.sh/api/cask/microsoft-onenote.json",
-    "https://formulae.brew.sh/api/cask/microsoft-openjdk.json",
-    "https://formulae.brew.sh/api/cask/microsoft-outlook.json",
-    "https://formulae.brew.sh/api/cask/microsoft-powerpoint.json",
-    "https://formulae.brew.sh/api/cask/microsoft-word.json",
-    "https://formulae.brew.sh/api/cask/naps2.json",
-    "https://formulae.brew.sh/api/cask/okta-verify.json",
-    "https://formulae.brew.sh/api/cask/opencloud.json",
-    "https://formulae.brew.sh/api/cask/opentoonz.json",
-    "https://formulae.brew.sh/api/cask/osquery.json",
-    "https://formulae.brew.sh/api/cask/outset.json",
-    "https://formulae.brew.sh/api/cask/owncloud.json",
-    "https://formulae.brew.sh/api/cask/purevpn.json",
-    "https://formulae.brew.sh/api/cask/radio-silence.json",
-    "https://formulae.brew.sh/api/cask/ringcentral.json",
-    "https://formulae.brew.sh/api/cask/rocketman-choices-packager.json",
-    "https://formulae.brew.sh/api/cask/salesforce-cli.json",
-    "https://formulae.brew.sh/api/cask/securesafe.json",
-    "https://formulae.brew.sh/api/cask/send-to-kindle.json",
-    "https://formulae.brew.sh/api/cask/shutter-encoder.json",
-    "https://formulae.brew.sh/api/cask/spyder.json",
-    "https://formulae.brew.sh/api/cask/supportcompanion.json",
-    "https://formulae.brew.sh/api/cask/swiftdialog.json",
-    "https://formulae.brew.sh/api/cask/tableau-public.json",
-    "https://formulae.brew.sh/api/cask/tableau-reader.json",
-    "https://formulae.brew.sh/api/cask/teamviewer.json",
-    "https://formulae.brew.sh/api/cask/topaz-photo-ai.json",
-    "https://formulae.brew.sh/api/cask/topaz-video-ai.json",
-    "https://formulae.brew.sh/api/cask/weasis.json",
-    "https://formulae.brew.sh/api/cask/xquartz.json",
-    "https://formulae.brew.sh/api/cask/insta360-link-controller.json",
-    "https://formulae.brew.sh/api/cask/toshiba-color-mfp.json",
-    "https://formulae.brew.sh/api/cask/perimeter81.json",
-    "https://formulae.brew.sh/api/cask/unifi-identity-endpoint.json",
-    "https://formulae.brew.sh/api/cask/wifiman.json",
-    "https://formulae.brew.sh/api/cask/r-app.json",
-    "https://formulae.brew.sh/api/cask/microsoft-365-copilot.json",
-    "https://formulae.brew.sh/api/cask/vnc-server.json",
-    "https://formulae.brew.sh/api/cask/mamp.json",
-    "https://formulae.brew.sh/api/cask/dotnet-sdk.json",
-]
+pkg_urls = catalog.urls("pkg_urls")
 
 # Custom scraper scripts to run
 custom_scrapers = [
@@ -1372,48 +103,233 @@ custom_scrapers = [
     # Wazuh is not in Homebrew; version is tracked from GitHub releases (Issue #97)
     ".github/scripts/scrapers/wazuh_agent.sh"
 ]
+# Scrapers are independent shell scripts that mostly wait on vendor pages, so
+# they run side by side with process_catalog().
+SCRAPER_WORKERS = int(os.environ.get("COLLECTOR_SCRAPER_WORKERS", "4"))
+# A scraper still running after this many seconds is killed with its children
+# and counts as failed; its previous JSON stays as it was.
+SCRAPER_TIMEOUT = float(os.environ.get("COLLECTOR_SCRAPER_TIMEOUT", "300"))
 
 # 30s connect, 120s between reads: a hung vendor server must not stall the nightly run
 DOWNLOAD_TIMEOUT = (30, 120)
 # Runaway guard only; no catalog artifact comes close to this size
 MAX_DOWNLOAD_BYTES = 10 * 1024 * 1024 * 1024
+# 1 MiB reads keep the per-chunk Python overhead negligible next to hashing and
+# still hold only one chunk in memory per download
+DOWNLOAD_CHUNK_BYTES = 1024 * 1024
 # No DMG, PKG (xar), ZIP or tarball can start with these bytes
 HTML_PREFIXES = (b"<!doctype", b"<html")
-# Different CDNs block different clients, so a single agent leaves apps
-# permanently unhashable: existential.audio answers 406 to the default
-# python-requests agent, douyin.com 444, frdic.com 429, mobirise/syncovery/
-# amarsagoo 403, and hopperapp.com serves only a browser agent. Try them in
-# order and give up only when every attempt fails.
-#
-# Keep this list in sync with ATTEMPTS in check_download_urls.py, the sibling
-# script that probes these same URLs; the agent strings are deliberately
-# identical so both scripts look the same to a vendor allowlist. This is
-# duplicated rather than imported because collect_app_info.py is loaded by
-# path (tests use importlib) and .github/scripts is not always on sys.path.
-DOWNLOAD_USER_AGENTS = (
-    "IntuneBrew-URL-Health-Check/1.0",
-    "curl/8.4.0",
-    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
-    "(KHTML, like Gecko) Chrome/126.0 Safari/537.36",
+
+
+# Artifact downloads are bandwidth-bound rather than latency-bound like cask
+# JSON, so far fewer workers than CASK_WORKERS already saturate a runner's link.
+HASH_WORKERS = int(os.environ.get("COLLECTOR_HASH_WORKERS", "4"))
+# Shared budget in bytes per second across every download of the run, 0 for
+# no cap. Lets the nightly run stay under a runner's or vendor's limits.
+HASH_BANDWIDTH_LIMIT = int(os.environ.get("COLLECTOR_HASH_BANDWIDTH", "0"))
+# Artifacts larger than this many bytes are hashed in their own lane, so a
+# handful of multi-gigabyte IDEs cannot occupy every worker while small apps
+# wait behind them. 0 disables the lane.
+HASH_SLOW_LANE_BYTES = int(os.environ.get("COLLECTOR_HASH_SLOW_LANE_BYTES", str(1024 ** 3)))
+# Workers dedicated to the slow lane; they help with small artifacts when idle.
+HASH_SLOW_LANE_WORKERS = int(os.environ.get("COLLECTOR_HASH_SLOW_LANE_WORKERS", "1"))
+# Concurrent size probes. A probe is one HEAD, so these are latency-bound.
+HASH_PROBE_WORKERS = 8
+# Concurrent size probes of trusted artifacts, 0 for none. A trusted digest is
+# never downloaded, so its size only feeds the bytes-avoided report; these
+# probes run beside the queue and never hold up a job.
+TRUSTED_SIZE_PROBE_WORKERS = int(os.environ.get("COLLECTOR_TRUSTED_SIZE_PROBES", "2"))
+
+
+class BandwidthLimiter:
+    """Paces concurrent downloads against one shared bytes-per-second budget."""
+
+    def __init__(self, bytes_per_second):
+        self.bytes_per_second = bytes_per_second
+        self._lock = threading.Lock()
+        self._available_at = time.monotonic()
+
+    def consume(self, byte_count):
+        """Block until byte_count more bytes fit in the budget."""
+        if self.bytes_per_second <= 0:
+            return
+        with self._lock:
+            now = time.monotonic()
+            self._available_at = max(now, self._available_at) + byte_count / self.bytes_per_second
+            delay = self._available_at - now
+        if delay > 0:
+            time.sleep(delay)
+
+
+download_limiter = BandwidthLimiter(HASH_BANDWIDTH_LIMIT)
+
+# Keep-alive connections kept per host: one for every thread that can talk to
+# a host at once. Those are the regular and slow lane workers, the size probes,
+# the trusted size probes and the main thread resolving an artifact inline. A
+# smaller pool drops connections as they come back ("Connection pool is full").
+DOWNLOAD_POOL_SIZE = (
+    max(HASH_WORKERS, 1)
+    + max(HASH_SLOW_LANE_WORKERS, 0)
+    + HASH_PROBE_WORKERS
+    + max(TRUSTED_SIZE_PROBE_WORKERS, 0)
+    + 1
 )
+# Host pools one session keeps open: its own host plus the CDNs it redirects
+# to (github.com hands every release off to objects.githubusercontent.com).
+DOWNLOAD_POOL_HOSTS = 4
+
+
+class DownloadClient:
+    """Keep-alive sessions for artifact downloads, one per host.
+
+    The download counterpart of build_cask_session: every agent in the
+    DOWNLOAD_USER_AGENTS cascade and every app on the same CDN (github.com
+    releases, dl.google.com, download.mozilla.org) reuses an open connection
+    instead of paying a fresh TCP and TLS handshake. No retries, for the same
+    reason as the cask session.
+    """
+
+    def __init__(self, pool_size=DOWNLOAD_POOL_SIZE):
+        self.pool_size = pool_size
+        self._sessions = {}
+        self._lock = threading.Lock()
+        # host -> [requests, connections opened], counted per response: the
+        # adapters keep only DOWNLOAD_POOL_HOSTS pools and drop the counts of
+        # any pool they evict.
+        self._reuse = {}
+        # pool -> its connection count when a response last came through it
+        self._pool_connections = weakref.WeakKeyDictionary()
+
+    def session_for(self, host):
+        with self._lock:
+            session = self._sessions.get(host)
+            if session is None:
+                session = requests.Session()
+                adapter = requests.adapters.HTTPAdapter(
+                    pool_connections=DOWNLOAD_POOL_HOSTS,
+                    pool_maxsize=self.pool_size,
+                    max_retries=0,
+                )
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                session.hooks["response"].append(self._count_response)
+                self._sessions[host] = session
+            return session
+
+    def request(self, method, url, **kwargs):
+        host = urlparse(url).hostname or ""
+        run_report.count("download_requests")
+        return self.session_for(host).request(method, url, **kwargs)
+
+    def get(self, url, **kwargs):
+        return self.request("GET", url, **kwargs)
+
+    def head(self, url, **kwargs):
+        return self.request("HEAD", url, **kwargs)
+
+    def _count_response(self, response, **kwargs):
+        """Session hook: one request, plus whatever connections its pool opened
+        since the last response through it. Redirect hops count on their own."""
+        host = urlparse(response.url).hostname or ""
+        pool = getattr(response.raw, "_pool", None)
+        with self._lock:
+            counts = self._reuse.setdefault(host, [0, 0])
+            counts[0] += 1
+            if pool is not None:
+                counts[1] += pool.num_connections - self._pool_connections.get(pool, 0)
+                self._pool_connections[pool] = pool.num_connections
+
+    def close(self):
+        """Close every session with its keep-alive connections. Counts are kept,
+        and a later request opens a new session."""
+        with self._lock:
+            sessions = list(self._sessions.values())
+            self._sessions = {}
+        for session in sessions:
+            session.close()
+
+    def reuse_stats(self):
+        """host -> (requests, connections opened) over the whole run."""
+        with self._lock:
+            return {host: tuple(counts) for host, counts in self._reuse.items()}
+
+    def report(self, limit=10):
+        """Print connection reuse for the busiest hosts."""
+        stats = self.reuse_stats()
+        if not stats:
+            return
+        total_requests = sum(request_count for request_count, _ in stats.values())
+        total_connections = sum(connection_count for _, connection_count in stats.values())
+        print(
+            f"\nDownload connections: {total_requests} requests over {total_connections} "
+            f"connections to {len(stats)} hosts"
+        )
+        busiest = sorted(stats.items(), key=lambda item: (-item[1][0], item[0]))
+        for host, (request_count, connection_count) in busiest[:limit]:
+            print(
+                f"   {host}: {request_count} requests, {connection_count} connections, "
+                f"{max(request_count - connection_count, 0)} reused"
+            )
+
+
+download_client = DownloadClient()
+
+# Shared with check_download_urls.py, so a host either script learned is tried
+# with its working agent by both.
+agent_table = AgentTable()
 
 
 class _OversizedDownload(Exception):
     """Raised when a body passes MAX_DOWNLOAD_BYTES, to stop the agent cascade."""
 
 
-def _stream_to_temp_file(url, user_agent, temp_file):
-    """Download url into temp_file with one agent. Returns the byte count, or None.
+# Wall-clock budget in seconds for one run, 0 for none. DOWNLOAD_TIMEOUT bounds
+# each read, not a download, so a CDN trickling bytes could otherwise hold the
+# run for hours under the size cap.
+RUN_DEADLINE_SECONDS = float(os.environ.get("COLLECTOR_DEADLINE_SECONDS", "0"))
+
+
+class DeadlineExceeded(Exception):
+    """Raised for a digest the run no longer has time for. The app keeps its
+    previous state and the artifact is deferred to the next run."""
+
+    def __init__(self, url):
+        super().__init__(f"Run deadline reached before hashing {url}")
+        self.url = url
 
-    None means this attempt is unusable (HTTP error, HTML page, empty body) and
-    the caller should fall through to the next agent, exactly as check_url does
-    in check_download_urls.py. Raises _OversizedDownload when the size cap trips,
-    because another agent would only re-download the same oversized file.
-    """
-    temp_file.seek(0)
-    temp_file.truncate()
 
-    response = requests.get(
+class RunDeadline:
+    """The point after which main() starts no download and aborts running ones."""
+
+    def __init__(self):
+        self.expires = None
+
+    def start(self, seconds):
+        self.expires = time.monotonic() + seconds if seconds > 0 else None
+
+    def expired(self):
+        return self.expires is not None and time.monotonic() >= self.expires
+
+    def check(self, url):
+        if self.expired():
+            raise DeadlineExceeded(url)
+
+
+run_deadline = RunDeadline()
+
+
+def _stream_to_digest(url, user_agent):
+    """Download url with one agent, hashing each chunk as it arrives. Returns the
+    hex digest, or None.
+
+    Nothing touches disk, so a multi-GB installer costs one pass over the network
+    and no free space. None means this attempt is unusable (HTTP error, HTML page,
+    empty body) and the caller should fall through to the next agent, exactly as
+    check_url does in check_download_urls.py. Raises _OversizedDownload when the
+    size cap trips, because another agent would only re-download the same
+    oversized file.
+    """
+    response = download_client.get(
         url,
         stream=True,
         timeout=DOWNLOAD_TIMEOUT,
@@ -1424,9 +340,10 @@ def _stream_to_temp_file(url, user_agent, temp_file):
     try:
         response.raise_for_status()
 
-        bytes_written = 0
+        sha256_hash = hashlib.sha256()
+        bytes_read = 0
         first_chunk = True
-        for chunk in response.iter_content(chunk_size=8192):
+        for chunk in response.iter_content(chunk_size=DOWNLOAD_CHUNK_BYTES):
             if not chunk:
                 continue
 
@@ -1437,21 +354,22 @@ def _stream_to_temp_file(url, user_agent, temp_file):
                     print(f"Refusing to hash HTML page served as a binary: {url}")
                     return None
 
-            bytes_written += len(chunk)
-            if bytes_written > MAX_DOWNLOAD_BYTES:
+            bytes_read += len(chunk)
+            if bytes_read > MAX_DOWNLOAD_BYTES:
                 raise _OversizedDownload(
                     f"Download exceeded size cap of {MAX_DOWNLOAD_BYTES} bytes, aborting: {url}"
                 )
 
-            temp_file.write(chunk)
-
-        temp_file.flush()
+            sha256_hash.update(chunk)
+            download_limiter.consume(len(chunk))
+            run_deadline.check(url)
 
-        if bytes_written == 0:
+        count_hash_stat("bytes_downloaded", bytes_read)
+        if bytes_read == 0:
             print(f"Empty response body, refusing to hash: {url}")
             return None
 
-        return bytes_written
+        return sha256_hash.hexdigest()
     finally:
         response.close()
 
@@ -1459,37 +377,532 @@ def _stream_to_temp_file(url, user_agent, temp_file):
 def calculate_file_hash(url):
     """Download a file and calculate its SHA256 hash."""
     print(f"📥 Downloading file from {url} to calculate hash...")
+    with run_report.phase("download"):
+        return _download_file_hash(url)
 
-    # Create a temporary file
-    with tempfile.NamedTemporaryFile(delete=False) as temp_file:
+
+def _download_file_hash(url):
+    for user_agent in agent_table.order(url, DOWNLOAD_USER_AGENTS):
+        run_deadline.check(url)
         try:
-            for user_agent in DOWNLOAD_USER_AGENTS:
-                try:
-                    if _stream_to_temp_file(url, user_agent, temp_file) is None:
-                        continue
-                except _OversizedDownload as e:
-                    print(str(e))
-                    return None
-                except Exception as e:
-                    print(f"❌ Error calculating hash: {str(e)}")
-                    continue
+            file_hash = _stream_to_digest(url, user_agent)
+        except DeadlineExceeded:
+            raise
+        except _OversizedDownload as e:
+            print(str(e))
+            return None
+        except Exception as e:
+            print(f"❌ Error calculating hash: {str(e)}")
+            continue
+
+        if file_hash is not None:
+            agent_table.record(url, user_agent, DOWNLOAD_USER_AGENTS[0])
+            return file_hash
+
+    print(f"❌ No user agent could download a hashable file: {url}")
+    return None
+
+
+# "trust" reuses the sha256 Homebrew publishes for a cask's url instead of
+# downloading the artifact; "download" hashes every artifact locally as before.
+HASH_MODE = os.environ.get("COLLECTOR_HASH_MODE", "trust")
+# Share of trusted digests that are still downloaded and compared. One mismatch
+# revokes trust for the rest of the run, so a drifting cask cannot go unnoticed.
+HASH_AUDIT_RATE = float(os.environ.get("COLLECTOR_HASH_AUDIT_RATE", "0.05"))
+# Draws the audit sample. Its own instance, so tests can seed it.
+audit_random = random.Random()
+SHA256_PATTERN = re.compile(r"^[0-9a-f]{64}$")
+
+# artifact url -> sha256 Homebrew published for exactly that url. Filled by
+# get_homebrew_app_info and read by resolve_file_hash.
+published_hashes = {}
+
+# artifact url -> digest, or None when no agent could hash it. Filled by
+# hash_pool and read by resolve_file_hash.
+hash_cache = {}
+
+# Counters for the trust-but-verify summary printed at the end of main().
+# main() resets them from HASH_STATS_INITIAL so every run reports only itself.
+HASH_STATS_INITIAL = {
+    "trusted": 0,
+    "downloaded": 0,
+    "audited": 0,
+    "audit_failures": 0,
+    "bytes_avoided": 0,
+    "bytes_downloaded": 0,
+    "journal_replayed": 0,
+    "ledger_hits": 0,
+    "trust_revoked": False,
+}
+hash_stats = dict(HASH_STATS_INITIAL)
+# Hash workers update the counters concurrently.
+hash_stats_lock = threading.Lock()
+# artifact url -> size in bytes, for every size probe_size learned this run.
+artifact_sizes = {}
+# Artifacts whose digest was Homebrew's published one this run, without an audit.
+trusted_urls = set()
+
+
+def count_hash_stat(key, amount=1):
+    with hash_stats_lock:
+        hash_stats[key] += amount
+
+
+class SingleFlight:
+    """Run-scoped: the first caller for a key runs the call, every concurrent or
+    later caller for that key gets its result.
+
+    Variants, renamed casks and scraper outputs share vendor urls, and each used
+    to download and hash the same bytes on its own.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls = {}
+        self.shared = 0
+
+    def reset(self):
+        with self._lock:
+            self._calls = {}
+            self.shared = 0
+
+    def do(self, key, call):
+        with self._lock:
+            flight = self._calls.get(key)
+            owner = flight is None
+            if owner:
+                flight = self._calls[key] = Future()
+            else:
+                self.shared += 1
+        if not owner:
+            return flight.result()
+        try:
+            result = call()
+        except BaseException as error:
+            flight.set_exception(error)
+            raise
+        flight.set_result(result)
+        return result
+
+
+download_flights = SingleFlight()
+# The size probe, the content ledger and the trust stats all HEAD the same
+# artifact; one request answers all three.
+probe_flights = SingleFlight()
+
 
-                # Calculate SHA256 hash
-                sha256_hash = hashlib.sha256()
-                with open(temp_file.name, 'rb') as f:
-                    for chunk in iter(lambda: f.read(4096), b''):
-                        sha256_hash.update(chunk)
+def shared_file_hash(url):
+    """calculate_file_hash, downloading each url at most once per run."""
 
-                return sha256_hash.hexdigest()
+    def download():
+        run_deadline.check(url)
+        count_hash_stat("downloaded")
+        return calculate_file_hash(url)
 
-            print(f"❌ No user agent could download a hashable file: {url}")
+    return download_flights.do(url, download)
+
+
+def probe_headers(url):
+    """Response headers of a HEAD request for url, or None when it fails."""
+    return probe_flights.do(url, lambda: _head_headers(url))
+
+
+def _head_headers(url):
+    try:
+        response = download_client.head(
+            url,
+            allow_redirects=True,
+            timeout=DOWNLOAD_TIMEOUT,
+            headers={"User-Agent": agent_table.order(url, DOWNLOAD_USER_AGENTS)[0]},
+        )
+        response.close()
+    except requests.RequestException:
+        return None
+    if response.status_code >= 400:
+        return None
+    return response.headers
+
+
+def probe_content_length(url):
+    """Content-Length of url from a HEAD request, or None when the server hides it."""
+    headers = probe_headers(url)
+    try:
+        return int(headers.get("Content-Length", "")) if headers is not None else None
+    except ValueError:
+        return None
+
+
+def probe_size(url):
+    """Size of url in bytes, or None when it cannot be learned cheaply.
+
+    Asks HEAD first and falls back to a one-byte Range request, whose
+    Content-Range carries the total even when a CDN drops Content-Length.
+    A learned size is kept in artifact_sizes.
+    """
+    size = _probe_size(url)
+    if size is not None:
+        with hash_stats_lock:
+            artifact_sizes[url] = size
+    return size
+
+
+def _probe_size(url):
+    size = probe_content_length(url)
+    if size is not None:
+        return size
+    try:
+        response = download_client.get(
+            url,
+            stream=True,
+            allow_redirects=True,
+            timeout=DOWNLOAD_TIMEOUT,
+            headers={
+                "User-Agent": agent_table.order(url, DOWNLOAD_USER_AGENTS)[0],
+                "Range": "bytes=0-0",
+            },
+        )
+        response.close()
+    except requests.RequestException:
+        return None
+    if response.status_code != 206:
+        return None
+    total = response.headers.get("Content-Range", "").rpartition("/")[2]
+    return int(total) if total.isdigit() else None
+
+
+CONTENT_LEDGER_FILE = "content-ledger.json"
+# Every artifact url of the catalog plus room for the ones it moved away from.
+CONTENT_LEDGER_MAX_ENTRIES = 5000
+
+
+def content_validators(headers):
+    """ETag, Last-Modified and Content-Length of a response, or None when it
+    carries neither ETag nor Last-Modified: a length alone identifies nothing."""
+    if headers is None:
+        return None
+    validators = {
+        "etag": headers.get("ETag"),
+        "last_modified": headers.get("Last-Modified"),
+        "length": headers.get("Content-Length"),
+    }
+    validators = {key: value for key, value in validators.items() if isinstance(value, str)}
+    if not validators.get("etag") and not validators.get("last_modified"):
+        return None
+    return validators
+
+
+class ContentLedger:
+    """artifact url -> digest, valid while the server reports the same validators.
+
+    The hash-reuse checks in main() only trust the sha stored in the app's own
+    file, so a renamed app, a move between lists or a scraper rewriting its file
+    downloads again. The ledger remembers every digest this collector computed
+    under the ETag, Last-Modified and Content-Length of the response, and one
+    HEAD request showing the same validators is enough to reuse it, whichever
+    app asks. Least recently used entries beyond max_entries are dropped on save.
+    Disabled (every lookup misses, nothing is saved) until load() is called.
+    """
+
+    def __init__(self, max_entries=CONTENT_LEDGER_MAX_ENTRIES):
+        self.path = None
+        self.max_entries = max_entries
+        self.entries = {}
+        self._lock = threading.Lock()
+
+    def load(self, path):
+        """Enable the ledger at path. A missing or corrupt file starts it empty, and
+        an entry without validators, a well-formed sha or a numeric use time is
+        dropped: a bad digest here would be published as the app's hash."""
+        self.path = path
+        self.entries = {}
+        try:
+            with open(path, "r") as f:
+                entries = json.load(f).get("entries", {})
+            entries = entries.items()
+        except (OSError, ValueError, AttributeError):
+            return
+        for url, entry in entries:
+            if (
+                isinstance(entry, dict)
+                and isinstance(entry.get("validators"), dict)
+                and isinstance(entry.get("sha"), str)
+                and SHA256_PATTERN.match(entry["sha"])
+                and isinstance(entry.get("used", 0), (int, float))
+            ):
+                self.entries[url] = entry
+
+    def lookup(self, url, validators):
+        """The digest stored for url under exactly these validators, or None."""
+        if self.path is None or validators is None:
             return None
+        with self._lock:
+            entry = self.entries.get(url)
+            if entry is None or entry.get("validators") != validators:
+                return None
+            entry["used"] = time.time()
+            return entry["sha"]
+
+    def store(self, url, validators, sha):
+        if self.path is None or validators is None or not sha:
+            return
+        with self._lock:
+            self.entries[url] = {"validators": validators, "sha": sha, "used": time.time()}
+
+    def save(self):
+        """Write the least recently used entries beyond max_entries out, then persist."""
+        if self.path is None:
+            return
+        with self._lock:
+            if len(self.entries) > self.max_entries:
+                by_age = sorted(self.entries, key=lambda url: self.entries[url].get("used", 0))
+                for url in by_age[: len(self.entries) - self.max_entries]:
+                    del self.entries[url]
+            payload = {"version": 1, "entries": self.entries}
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump(payload, f)
+            os.replace(temp_path, self.path)
+        except OSError as error:
+            # A lost ledger only costs the next run some downloads.
+            print(f"Warning: could not save the content ledger to {self.path}: {error}")
+
+
+content_ledger = ContentLedger()
+
+
+def download_file_hash(url):
+    """calculate_file_hash, skipped when a HEAD shows content the ledger has hashed."""
+    # Past the deadline even the HEAD could hold a worker for DOWNLOAD_TIMEOUT.
+    run_deadline.check(url)
+    validators = content_validators(probe_headers(url)) if content_ledger.path else None
+    sha = content_ledger.lookup(url, validators)
+    if sha is not None:
+        count_hash_stat("ledger_hits")
+        if validators.get("length", "").isdigit():
+            count_hash_stat("bytes_avoided", int(validators["length"]))
+        print(f"ℹ️ Reusing the digest of unchanged content at {url}")
+        return sha
+    sha = shared_file_hash(url)
+    content_ledger.store(url, validators, sha)
+    return sha
+
+
+def trusted_published_hash(url):
+    """Homebrew's digest for exactly url when this run trusts it, else None."""
+    if HASH_MODE != "trust" or hash_stats["trust_revoked"]:
+        return None
+    return published_hashes.get(url)
+
+
+def resolve_file_hash(url):
+    """SHA256 of the artifact at url, reusing Homebrew's published digest when trusted.
+
+    Falls back to calculate_file_hash whenever the cask offers no digest for this
+    exact url (:no_check, or a url rewritten in get_homebrew_app_info), when
+    HASH_MODE is "download", or after an audit caught a mismatch this run.
+    A digest already produced by hash_pool is returned as is.
+    """
+    if url in hash_cache:
+        return hash_cache[url]
+
+    published = trusted_published_hash(url)
+    if not published:
+        return download_file_hash(url)
+
+    if audit_random.random() < HASH_AUDIT_RATE:
+        count_hash_stat("audited")
+        print(f"🔎 Auditing Homebrew's published hash for {url}")
+        try:
+            file_hash = shared_file_hash(url)
+        except DeadlineExceeded:
+            file_hash = None
+        if file_hash is None:
+            # The download failing says nothing about the digest, so keep it.
+            print(f"⚠️ Audit download failed, keeping the published hash for {url}")
+            return published
+        if file_hash != published:
+            count_hash_stat("audit_failures")
+            with hash_stats_lock:
+                hash_stats["trust_revoked"] = True
+            print(
+                f"❌ Audit mismatch for {url}: Homebrew published {published}, "
+                f"the artifact hashes to {file_hash}. Downloading every artifact "
+                "for the rest of this run."
+            )
+        return file_hash
+
+    count_hash_stat("trusted")
+    with hash_stats_lock:
+        trusted_urls.add(url)
+    print(f"ℹ️ Using Homebrew's published hash for {url}")
+    return published
+
+
+RUN_REPORT_FILE = "run-report.json"
+
+
+class RunReport:
+    """Wall time per phase and run counters, written as JSON and as a step summary.
+
+    Phases overlap: the list passes consume casks while the prefetch is still running,
+    and "download" adds up the time of every worker, so it can exceed the run.
+    The report sits in COLLECTOR_CACHE_DIR, so each run is compared with the last.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.phases = {}
+        self.counters = {}
+        self.started = None
+        self.started_at = None
+
+    def start(self):
+        with self._lock:
+            self.phases = {}
+            self.counters = {}
+        self.started = time.monotonic()
+        self.started_at = datetime.now().isoformat(timespec="seconds")
+
+    def add_time(self, name, seconds):
+        with self._lock:
+            phase = self.phases.setdefault(name, {"seconds": 0.0, "calls": 0})
+            phase["seconds"] += seconds
+            phase["calls"] += 1
+
+    @contextlib.contextmanager
+    def phase(self, name):
+        started = time.monotonic()
+        try:
+            yield
         finally:
-            # Clean up the temporary file
-            try:
-                os.unlink(temp_file.name)
-            except Exception as e:
-                print(f"Warning: Could not delete temporary file: {str(e)}")
+            self.add_time(name, time.monotonic() - started)
+
+    def timed(self, name, iterable):
+        """iterable, with the time until it is exhausted recorded as phase name."""
+        with self.phase(name):
+            yield from iterable
+
+    def count(self, key, amount=1):
+        with self._lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+
+    def payload(self):
+        with self._lock:
+            return {
+                "version": 1,
+                "started": self.started_at,
+                "seconds": round(time.monotonic() - self.started, 3),
+                "phases": {
+                    name: {"seconds": round(phase["seconds"], 3), "calls": phase["calls"]}
+                    for name, phase in self.phases.items()
+                },
+                "counters": dict(sorted(self.counters.items())),
+            }
+
+    def write(self, path):
+        """Save this run's report to path. Returns the payload and the previous run's, if any."""
+        payload = self.payload()
+        try:
+            with open(path, "r") as f:
+                previous = json.load(f)
+        except (OSError, ValueError):
+            previous = None
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            temp_path = f"{path}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump(payload, f, indent=2)
+            os.replace(temp_path, path)
+        except OSError as error:
+            print(f"Warning: could not save the run report to {path}: {error}")
+        return payload, previous
+
+
+def run_report_markdown(payload, previous=None):
+    """Markdown tables of a run report, next to the previous run's values."""
+    previous = previous if isinstance(previous, dict) else {}
+    previous_phases = previous.get("phases", {})
+    previous_counters = previous.get("counters", {})
+
+    def earlier(value):
+        return "" if value is None else f"{value:g}"
+
+    lines = [
+        "### Collector run report",
+        "",
+        f"Total: {payload['seconds']:.1f}s (previous run: {earlier(previous.get('seconds')) or 'n/a'}s)",
+        "",
+        "| Phase | Seconds | Calls | Previous seconds |",
+        "| --- | ---: | ---: | ---: |",
+    ]
+    for name, phase in payload["phases"].items():
+        before = previous_phases.get(name, {}).get("seconds")
+        lines.append(f"| {name} | {phase['seconds']:.1f} | {phase['calls']} | {earlier(before)} |")
+    lines += ["", "| Counter | This run | Previous run |", "| --- | ---: | ---: |"]
+    for name, value in payload["counters"].items():
+        lines.append(f"| {name} | {value} | {earlier(previous_counters.get(name))} |")
+    return "\n".join(lines) + "\n"
+
+
+def publish_run_report():
+    """Fold the per-subsystem stats into run_report, save it and add it to the
+    GitHub step summary when running in Actions."""
+    for key in ("bytes_downloaded", "downloaded", "trusted", "journal_replayed", "ledger_hits"):
+        run_report.count(key, hash_stats[key])
+    run_report.count("bytes_avoided_trusted", trusted_bytes_avoided()[0])
+    run_report.count("bytes_avoided_ledger", hash_stats["bytes_avoided"])
+    run_report.count("duplicates_avoided", download_flights.shared + hash_pool.duplicates)
+    run_report.count("cask_cache_hits", cask_http_cache.stats["hits"])
+    run_report.count("cask_not_modified", cask_http_cache.stats["not_modified"])
+    run_report.count("files_read", app_catalog.stats["read"])
+    run_report.count("files_written", app_catalog.stats["written"])
+    run_report.count("files_unchanged", app_catalog.stats["unchanged"])
+
+    path = os.path.join(COLLECTOR_CACHE_DIR, RUN_REPORT_FILE)
+    payload, previous = run_report.write(path)
+    print(f"\n📊 Run report written to {path}")
+    summary_path = os.environ.get("GITHUB_STEP_SUMMARY")
+    if summary_path:
+        try:
+            with open(summary_path, "a") as f:
+                f.write(run_report_markdown(payload, previous))
+        except OSError as error:
+            print(f"Warning: could not write the step summary: {error}")
+
+
+run_report = RunReport()
+
+
+def trusted_bytes_avoided():
+    """(bytes, artifacts of unknown size) for the digests taken on trust."""
+    with hash_stats_lock:
+        sizes = [artifact_sizes.get(url) for url in trusted_urls]
+    known = [size for size in sizes if size is not None]
+    return sum(known), len(sizes) - len(known)
+
+
+def report_hash_stats():
+    """Print how many artifacts were trusted, downloaded and audited this run."""
+    avoided_mib = hash_stats["bytes_avoided"] / (1024 * 1024)
+    trusted_bytes, unknown_sizes = trusted_bytes_avoided()
+    print("\n📊 Artifact hashing summary")
+    print(f"   Mode                 : {HASH_MODE}")
+    print(f"   Published hashes used: {hash_stats['trusted']}")
+    print(f"   Artifacts downloaded : {hash_stats['downloaded']}")
+    print(f"   Replayed from journal: {hash_stats['journal_replayed']}")
+    print(f"   Reused via HEAD      : {hash_stats['ledger_hits']}")
+    print(f"   Duplicates avoided   : {download_flights.shared + hash_pool.duplicates}")
+    print(f"   Audits run           : {hash_stats['audited']}")
+    print(f"   Audit mismatches     : {hash_stats['audit_failures']}")
+    print(f"   Avoided by trust     : {trusted_bytes / (1024 * 1024):.1f} MiB", end="")
+    if unknown_sizes:
+        print(f" (+{unknown_sizes} artifacts of unknown size)")
+    else:
+        print("")
+    print(f"   Avoided via HEAD     : {avoided_mib:.1f} MiB")
+    print(f"   Downloaded           : {hash_stats['bytes_downloaded'] / (1024 * 1024):.1f} MiB")
 
 def find_bundle_id(json_string):
     regex_patterns = {
@@ -1523,8 +936,8 @@ def get_cask_token(json_url):
     return filename[:-5] if filename.endswith(".json") else filename
 
 
-def find_app_file(apps_folder, display_name=None, cask_token=None):
-    """Resolve an app JSON by stored cask provenance, display name, or cask token."""
+def app_file_candidates(display_name=None, cask_token=None):
+    """File stems an app may live under, most specific first."""
     candidates = []
     if display_name:
         candidates.append(sanitize_filename(display_name))
@@ -1535,8 +948,180 @@ def find_app_file(apps_folder, display_name=None, cask_token=None):
                 sanitize_filename(cask_token),
             ]
         )
+    return list(dict.fromkeys(candidates))
+
+
+class CatalogIndex:
+    """Every Apps/*.json read once per run, looked up by path, file stem or cask token.
+
+    Resolving a cask by its stored homebrew_cask used to json.load the whole
+    folder per lookup, so a night with many deprecations read the catalog once
+    per unavailable cask. main() loads the index once and every write goes
+    through write_app_json, which keeps it current. A file that exists but does
+    not parse is indexed with None as its data.
+
+    The index also keeps each file's text as it is on disk, so a write whose
+    serialized bytes match can be skipped without touching the file again.
+    """
 
-    for candidate_name in dict.fromkeys(candidates):
+    def __init__(self):
+        self.apps_folder = None
+        self.by_path = {}
+        self.by_cask = {}
+        self.text = {}
+        self.stats = {"read": 0, "written": 0, "unchanged": 0}
+
+    def load(self, apps_folder):
+        self.apps_folder = apps_folder
+        self.by_path = {}
+        self.by_cask = {}
+        self.text = {}
+        self.stats = {"read": 0, "written": 0, "unchanged": 0}
+        for filename in sorted(os.listdir(apps_folder)):
+            if filename.endswith(".json"):
+                self.refresh(os.path.join(apps_folder, filename))
+
+    def covers(self, apps_folder):
+        """True when lookups in apps_folder can be answered from the index."""
+        return self.apps_folder is not None and self.apps_folder == apps_folder
+
+    def refresh(self, path):
+        """Re-read one file written behind the index's back, e.g. by a scraper."""
+        try:
+            with open(path, "r") as f:
+                text = f.read()
+            self.stats["read"] += 1
+        except FileNotFoundError:
+            self.update(path, None, exists=False)
+            return
+        except OSError:
+            text = None
+        try:
+            data = json.loads(text) if text is not None else None
+        except ValueError:
+            data = None
+        self.update(path, data, text=text)
+
+    def update(self, path, data, text=None, exists=True):
+        previous = self.by_path.get(path)
+        if isinstance(previous, dict) and previous.get("homebrew_cask"):
+            paths = self.by_cask.get(previous["homebrew_cask"], [])
+            if path in paths:
+                paths.remove(path)
+        if not exists:
+            self.by_path.pop(path, None)
+            self.text.pop(path, None)
+            return
+        self.by_path[path] = data
+        self.text[path] = text
+        if isinstance(data, dict) and data.get("homebrew_cask"):
+            paths = self.by_cask.setdefault(data["homebrew_cask"], [])
+            paths.append(path)
+            paths.sort()
+
+    def contains(self, path):
+        return path in self.by_path
+
+    def get(self, path):
+        """Parsed data for path, or None when it is missing or unreadable."""
+        return self.by_path.get(path)
+
+    def find(self, display_name=None, cask_token=None):
+        for candidate_name in app_file_candidates(display_name, cask_token):
+            candidate = os.path.join(self.apps_folder, f"{candidate_name}.json")
+            if candidate in self.by_path:
+                return candidate
+        if cask_token and self.by_cask.get(cask_token):
+            return self.by_cask[cask_token][0]
+        return None
+
+    def entries(self):
+        """(path, data) for every readable file, in filename order."""
+        return [(path, data) for path, data in sorted(self.by_path.items()) if data is not None]
+
+    def summary(self):
+        return (
+            f"App JSON: {self.stats['written']} files written, "
+            f"{self.stats['unchanged']} left untouched because nothing changed"
+        )
+
+
+# Loaded by main(). Helpers fall back to reading the disk for any other folder.
+app_catalog = CatalogIndex()
+
+
+def read_app_json(file_path, strict=False):
+    """Parsed app JSON for file_path, or None when it is missing.
+
+    An unreadable file also yields None unless strict is set, in which case it
+    raises ValueError the way json.load did for the processing loops.
+    """
+    if app_catalog.covers(os.path.dirname(file_path)):
+        data = app_catalog.get(file_path)
+        if data is None and strict and app_catalog.contains(file_path):
+            raise ValueError(f"{file_path} is not valid JSON")
+        return copy.deepcopy(data) if data is not None else None
+    try:
+        with open(file_path, "r") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+    except (OSError, ValueError):
+        if strict:
+            raise
+        return None
+
+
+def serialize_app_json(data, previous_text=None):
+    """The exact text write_app_json puts on disk.
+
+    The collector writes json.dump(indent=2) output with no trailing newline,
+    while the tools that add apps end the file with one. Whichever convention
+    the file already has is kept, so a rewrite never shows up as a newline diff.
+    """
+    text = json.dumps(data, indent=2)
+    if previous_text is not None and previous_text.endswith("\n"):
+        text += "\n"
+    return text
+
+
+def write_app_json(file_path, data):
+    """Write one app JSON atomically, skipping the write when nothing changed.
+
+    Returns True when the file was written. app_catalog is kept in step with the disk.
+    """
+    indexed = app_catalog.covers(os.path.dirname(file_path))
+    if indexed:
+        previous_text = app_catalog.text.get(file_path)
+    else:
+        try:
+            with open(file_path, "r") as f:
+                previous_text = f.read()
+        except OSError:
+            previous_text = None
+
+    text = serialize_app_json(data, previous_text)
+    if text == previous_text:
+        if indexed:
+            app_catalog.stats["unchanged"] += 1
+        return False
+
+    temp_path = f"{file_path}.tmp"
+    with open(temp_path, "w") as f:
+        f.write(text)
+    os.replace(temp_path, file_path)
+    if indexed:
+        app_catalog.update(file_path, copy.deepcopy(data), text=text)
+        app_catalog.stats["written"] += 1
+    return True
+
+
+def find_app_file(apps_folder, display_name=None, cask_token=None):
+    """Resolve an app JSON by stored cask provenance, display name, or cask token."""
+    if app_catalog.covers(apps_folder):
+        return app_catalog.find(display_name, cask_token)
+
+    for candidate_name in app_file_candidates(display_name, cask_token):
         candidate = os.path.join(apps_folder, f"{candidate_name}.json")
         if os.path.exists(candidate):
             return candidate
@@ -1565,15 +1150,22 @@ filename_collisions = []
 
 def claim_app_file(file_path, cask_token):
     """Return True when cask_token may write file_path, else record the collision."""
-    if not cask_token or not os.path.exists(file_path):
+    if not cask_token:
         return True
 
-    try:
-        with open(file_path, "r") as f:
-            existing_data = json.load(f)
-    except (OSError, ValueError):
-        # An unreadable file carries no ownership claim, so writing it is the
-        # same repair as writing a missing one.
+    if app_catalog.covers(os.path.dirname(file_path)):
+        existing_data = app_catalog.get(file_path)
+    elif os.path.exists(file_path):
+        try:
+            with open(file_path, "r") as f:
+                existing_data = json.load(f)
+        except (OSError, ValueError):
+            existing_data = None
+    else:
+        existing_data = None
+    # A missing or unreadable file carries no ownership claim, so writing it
+    # is the same repair as writing a missing one.
+    if existing_data is None:
         return True
 
     existing_cask = existing_data.get("homebrew_cask") or ""
@@ -1623,15 +1215,13 @@ def mark_app_deprecated(apps_folder, display_name, reason, cask_token=None):
         return False
     if not claim_app_file(file_path, cask_token):
         return False
-    with open(file_path, "r") as f:
-        app_data = json.load(f)
+    app_data = read_app_json(file_path, strict=True)
     already_deprecated = app_data.get("deprecated") and app_data.get("deprecation_reason") == reason
     if cask_token:
         app_data["homebrew_cask"] = cask_token
     app_data["deprecated"] = True
     app_data["deprecation_reason"] = reason
-    with open(file_path, "w") as f:
-        json.dump(app_data, f, indent=2)
+    write_app_json(file_path, app_data)
     if already_deprecated:
         print(f"{identifier} is already flagged as deprecated")
     else:
@@ -1642,9 +1232,16 @@ def mark_app_deprecated(apps_folder, display_name, reason, cask_token=None):
 # Cask JSON is a few kilobytes: 10s to connect, 30s to read is generous, and a
 # stalled endpoint must not hold a worker for the whole run.
 CASK_TIMEOUT = (10, 30)
-# The connection pool must be at least as large as the worker count, otherwise
-# threads queue on the pool instead of on the network.
+# Fetches in flight when a run starts. The window then follows formulae.brew.sh:
+# one more slot per window of fast answers, half as many after an error or a
+# slow answer (AIMD), always between CASK_MIN_IN_FLIGHT and CASK_MAX_IN_FLIGHT.
 CASK_WORKERS = 16
+CASK_MIN_IN_FLIGHT = 2
+CASK_MAX_IN_FLIGHT = 64
+# An answer slower than this is treated like an error: the API is congested.
+CASK_SLOW_SECONDS = 2.0
+# Upper bounds in seconds of the latency histogram printed after the prefetch.
+CASK_LATENCY_BUCKETS = (0.1, 0.25, 0.5, 1.0, 2.0, 5.0)
 
 
 class TimeoutSession(requests.Session):
@@ -1652,6 +1249,7 @@ class TimeoutSession(requests.Session):
 
     def request(self, method, url, **kwargs):
         kwargs.setdefault("timeout", CASK_TIMEOUT)
+        run_report.count("cask_requests")
         return super().request(method, url, **kwargs)
 
 
@@ -1659,9 +1257,11 @@ def build_cask_session():
     """Connection-reusing session for the Homebrew API. No retries: the nightly run
     reruns anyway, and a retrying adapter multiplies the stall of a dead endpoint."""
     session = TimeoutSession()
+    # The pool must hold the largest window the prefetch can open, otherwise
+    # fetches queue on the pool instead of on the network.
     adapter = requests.adapters.HTTPAdapter(
-        pool_connections=CASK_WORKERS,
-        pool_maxsize=CASK_WORKERS,
+        pool_connections=CASK_MAX_IN_FLIGHT,
+        pool_maxsize=CASK_MAX_IN_FLIGHT,
         max_retries=0,
     )
     session.mount("https://", adapter)
@@ -1671,51 +1271,502 @@ def build_cask_session():
 
 cask_session = build_cask_session()
 
+# State that outlives a run (the workflow restores and saves this directory with
+# actions/cache). Relative to the working directory, like the Apps folder.
+COLLECTOR_CACHE_DIR = os.environ.get("COLLECTOR_CACHE_DIR", ".collector-cache")
+CASK_HTTP_CACHE_FILE = "cask-http-cache.json"
+# Next to CASK_HTTP_CACHE_FILE: one file per cached body, named after its url.
+CASK_HTTP_BODIES_DIR = "cask-bodies"
+# The catalog references about 1,300 casks; the slack keeps renamed and removed
+# ones around for a while without letting the file grow forever.
+CASK_HTTP_CACHE_MAX_ENTRIES = 3000
+
+
+class CaskHttpCache:
+    """ETag/Last-Modified validators of cask JSON, persisted by url, with the
+    bodies they validate on disk.
+
+    fetch_cask_data sends the stored validators, and a 304 answer reuses the
+    stored body, so an unchanged cask costs a round trip instead of a download.
+    Only the validators are held in memory; a body is written to
+    CASK_HTTP_BODIES_DIR when it arrives and read back only for its 304, so the
+    cache adds nothing like the catalog's size to a run's peak memory.
+    Disabled (every lookup misses, nothing is saved) until load() is called.
+    """
+
+    def __init__(self, max_entries=CASK_HTTP_CACHE_MAX_ENTRIES):
+        self.path = None
+        self.bodies_dir = None
+        self.max_entries = max_entries
+        self.entries = {}
+        self.stats = {"hits": 0, "misses": 0, "not_modified": 0}
+        self._lock = threading.Lock()
+
+    def load(self, path):
+        """Enable the cache at path. A missing or corrupt file starts it empty, and
+        an entry without a validator or a numeric use time is dropped."""
+        self.path = path
+        self.bodies_dir = os.path.join(os.path.dirname(path), CASK_HTTP_BODIES_DIR)
+        self.entries = {}
+        self.stats = {"hits": 0, "misses": 0, "not_modified": 0}
+        try:
+            with open(path, "r") as f:
+                entries = json.load(f).get("entries", {})
+            entries = entries.items()
+        except (OSError, ValueError, AttributeError):
+            return
+        for url, entry in entries:
+            if (
+                isinstance(entry, dict)
+                and any(isinstance(entry.get(key), str) for key in ("etag", "last_modified"))
+                and isinstance(entry.get("used", 0), (int, float))
+            ):
+                # Files from before the bodies moved to disk carry them inline.
+                entry.pop("body", None)
+                self.entries[url] = entry
+
+    def body_path(self, url):
+        return os.path.join(self.bodies_dir, hashlib.sha256(url.encode("utf-8")).hexdigest() + ".json")
+
+    def request_headers(self, url):
+        """Conditional headers for url, counting the lookup as a hit or a miss."""
+        if self.path is None:
+            return {}
+        with self._lock:
+            entry = self.entries.get(url)
+            self.stats["hits" if entry else "misses"] += 1
+        headers = {}
+        if entry and entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def not_modified(self, url):
+        """The stored body for a 304 answer, or None when nothing usable is stored."""
+        with self._lock:
+            if url not in self.entries:
+                return None
+        try:
+            with open(self.body_path(url), "r") as f:
+                body = json.load(f)
+        except (OSError, ValueError):
+            # The validators are worthless without their body.
+            self.discard(url)
+            return None
+        with self._lock:
+            self.stats["not_modified"] += 1
+            entry = self.entries.get(url)
+            if entry is not None:
+                entry["used"] = time.time()
+        return body
+
+    def store(self, url, response, body):
+        """Remember body under the validators of response, if it sent any."""
+        if self.path is None:
+            return
+        validators = {
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+        }
+        # Without a validator the body could never be revalidated.
+        validators = {key: value for key, value in validators.items() if isinstance(value, str)}
+        if not validators:
+            self.discard(url)
+            return
+        body_path = self.body_path(url)
+        try:
+            os.makedirs(self.bodies_dir, exist_ok=True)
+            temp_path = f"{body_path}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump(body, f)
+            os.replace(temp_path, body_path)
+        except OSError as error:
+            print(f"Warning: could not cache the cask body of {url}: {error}")
+            self.discard(url)
+            return
+        with self._lock:
+            self.entries[url] = dict(validators, used=time.time())
+
+    def discard(self, url):
+        with self._lock:
+            self.entries.pop(url, None)
+        if self.bodies_dir is not None:
+            with contextlib.suppress(OSError):
+                os.remove(self.body_path(url))
+
+    def save(self):
+        """Write the least recently used entries beyond max_entries out, then persist."""
+        if self.path is None:
+            return
+        with self._lock:
+            evicted = []
+            if len(self.entries) > self.max_entries:
+                by_age = sorted(self.entries, key=lambda url: self.entries[url].get("used", 0))
+                evicted = by_age[: len(self.entries) - self.max_entries]
+            payload = {"version": 2, "entries": self.entries}
+        for url in evicted:
+            self.discard(url)
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with self._lock:
+                with open(temp_path, "w") as f:
+                    json.dump(payload, f)
+            os.replace(temp_path, self.path)
+        except OSError as error:
+            # A lost cache only costs the next run its 304s.
+            print(f"Warning: could not save the cask cache to {self.path}: {error}")
+
+    def summary(self):
+        return (
+            f"Cask cache: {self.stats['hits']} hits ({self.stats['not_modified']} answered 304), "
+            f"{self.stats['misses']} misses, {len(self.entries)} entries stored"
+        )
+
+
+cask_http_cache = CaskHttpCache()
+
 # url -> parsed cask JSON, or the exception raised while fetching it. Filled by
 # prefetch_cask_data and read by get_homebrew_app_info.
 cask_cache = {}
 
+# "index" resolves every cask from the single CASK_INDEX_URL document and falls
+# back to per-cask fetches only for tokens the index lacks; "per-cask" fetches
+# each cask url on its own. check_cask_tokens.py reads the same index.
+CASK_SOURCE = os.environ.get("COLLECTOR_CASK_SOURCE", "per-cask")
+CASK_INDEX_URL = "https://formulae.brew.sh/api/cask.json"
+# The index is tens of megabytes, far beyond what CASK_TIMEOUT allows for.
+CASK_INDEX_TIMEOUT = (10, 120)
+
 
 def fetch_cask_data(json_url):
     """Fetch one cask JSON. Raises CaskUnavailableError when Homebrew no longer serves it."""
-    response = cask_session.get(json_url)
+    response = cask_session.get(json_url, headers=cask_http_cache.request_headers(json_url))
+    if response.status_code == 304:
+        cached = cask_http_cache.not_modified(json_url)
+        if cached is not None:
+            return cached
+        # The stored body is gone, so ask again without validators.
+        response.close()
+        response = cask_session.get(json_url)
     try:
         response.raise_for_status()
     except requests.HTTPError as error:
         if response.status_code == 404:
+            cask_http_cache.discard(json_url)
             raise CaskUnavailableError(
                 "cask removed from Homebrew",
                 cask_token=get_cask_token(json_url),
             ) from error
         raise
-    return response.json()
+    data = response.json()
+    cask_http_cache.store(json_url, response, data)
+    return data
+
+
+def fetch_cask_index(tokens):
+    """Fetch the Homebrew cask index as token -> document for tokens only. Returns
+    None on failure.
+
+    The whole index is parsed at once, but only the catalog's documents outlive
+    this call; the rest of Homebrew is released before any app is processed.
+    """
+    try:
+        response = cask_session.get(CASK_INDEX_URL, timeout=CASK_INDEX_TIMEOUT)
+        response.raise_for_status()
+        return {cask.get("token"): cask for cask in response.json() if cask.get("token") in tokens}
+    except Exception as error:
+        print(f"Could not fetch the Homebrew cask index, fetching casks individually: {error}")
+        return None
+
+
+def resolve_from_cask_index(json_urls):
+    """Fill cask_cache from the index. Returns the urls it could not resolve."""
+    index = fetch_cask_index({get_cask_token(url) for url in json_urls if "/api/cask/" in url})
+    if index is None:
+        return list(json_urls)
+
+    # Formula urls share the token namespace loosely, so only cask urls qualify.
+    unresolved = []
+    for url in json_urls:
+        document = index.get(get_cask_token(url)) if "/api/cask/" in url else None
+        if document is None:
+            unresolved.append(url)
+        else:
+            cask_cache[url] = document
 
+    print(
+        f"Resolved {len(json_urls) - len(unresolved)} cask documents from the index, "
+        f"{len(unresolved)} need an individual fetch"
+    )
+    return unresolved
 
-def prefetch_cask_data(json_urls):
-    """Fetch every cask JSON once, in parallel.
+
+class AdaptiveWindow:
+    """AIMD limit on concurrent cask fetches.
+
+    Every limit-many fast answers open one more slot; an error or an answer
+    slower than CASK_SLOW_SECONDS halves the window. Only fetches started since
+    the last cut can cut again, so one burst of failures from a single window
+    halves it once instead of collapsing it to the floor.
+    """
+
+    def __init__(self, initial=CASK_WORKERS, minimum=CASK_MIN_IN_FLIGHT, maximum=CASK_MAX_IN_FLIGHT):
+        self.minimum = minimum
+        self.maximum = maximum
+        self.limit = min(max(initial, minimum), maximum)
+        self.peak = self.limit
+        self.epoch = 0
+        self.cuts = 0
+        self._successes = 0
+
+    def on_success(self, seconds, started_epoch):
+        if seconds > CASK_SLOW_SECONDS:
+            self.on_congestion(started_epoch)
+            return
+        self._successes += 1
+        if self._successes >= self.limit:
+            self._successes = 0
+            self.limit = min(self.limit + 1, self.maximum)
+            self.peak = max(self.peak, self.limit)
+
+    def on_congestion(self, started_epoch):
+        if started_epoch != self.epoch:
+            return
+        self.epoch += 1
+        self.cuts += 1
+        self._successes = 0
+        self.limit = max(self.limit // 2, self.minimum)
+
+
+class LatencyHistogram:
+    """Counts of fetch latencies per CASK_LATENCY_BUCKETS bucket."""
+
+    def __init__(self, bounds=CASK_LATENCY_BUCKETS):
+        self.bounds = bounds
+        self.counts = [0] * (len(bounds) + 1)
+        self.total_seconds = 0.0
+
+    def add(self, seconds):
+        self.total_seconds += seconds
+        for index, bound in enumerate(self.bounds):
+            if seconds <= bound:
+                self.counts[index] += 1
+                return
+        self.counts[-1] += 1
+
+    def lines(self):
+        total = sum(self.counts)
+        labels = [f"<= {bound:g}s" for bound in self.bounds] + [f"> {self.bounds[-1]:g}s"]
+        widest = max(self.counts) or 1
+        lines = []
+        for label, count in zip(labels, self.counts):
+            bar = "#" * round(30 * count / widest)
+            lines.append(f"   {label:>8} {count:5d} {bar}")
+        if total:
+            lines.append(f"   mean {self.total_seconds / total:.3f}s over {total} fetches")
+        return lines
+
+
+def _timed_fetch(url):
+    """fetch_cask_data for the executor: (document or exception, seconds)."""
+    started = time.monotonic()
+    try:
+        result = fetch_cask_data(url)
+    except Exception as error:
+        result = error
+    return result, time.monotonic() - started
+
+
+async def _fetch_casks_adaptively(urls, window, histogram, on_result=None):
+    """Keep window.limit fetches in flight until every url has a result.
+
+    on_result(url, result) is called as each fetch lands, in completion order.
+
+    requests has no asyncio transport, so each fetch runs on cask_session in a
+    worker thread; the event loop only schedules them and steers the window.
+    """
+    loop = asyncio.get_running_loop()
+    results = {}
+    pending_urls = iter(urls)
+    in_flight = {}
+    exhausted = False
+    with ThreadPoolExecutor(max_workers=window.maximum) as executor:
+        while True:
+            while not exhausted and len(in_flight) < window.limit:
+                url = next(pending_urls, None)
+                if url is None:
+                    exhausted = True
+                    break
+                future = loop.run_in_executor(executor, _timed_fetch, url)
+                in_flight[future] = (url, window.epoch)
+            if not in_flight:
+                return results
+
+            done, _ = await asyncio.wait(in_flight, return_when=asyncio.FIRST_COMPLETED)
+            for future in done:
+                url, started_epoch = in_flight.pop(future)
+                result, seconds = future.result()
+                histogram.add(seconds)
+                # A removed cask is an answer, not a sign of an overloaded API.
+                if isinstance(result, Exception) and not isinstance(result, CaskUnavailableError):
+                    window.on_congestion(started_epoch)
+                else:
+                    window.on_success(seconds, started_epoch)
+                results[url] = result
+                if on_result is not None:
+                    on_result(url, result)
+                if len(results) % 100 == 0:
+                    print(
+                        f"Prefetched {len(results)}/{len(urls)} cask documents "
+                        f"({window.limit} in flight)"
+                    )
+
+
+def prefetch_cask_data(json_urls, on_result=None):
+    """Fetch every cask JSON once, concurrently.
 
     Network only: nothing here touches the Apps folder, so the write ordering the
-    catalog depends on stays with the sequential loops in main(). A failure is stored
+    catalog depends on stays with the sequential process_catalog(). A failure is stored
     and re-raised when its URL is consumed, which keeps the per-app error flow
-    (notably 404 -> CaskUnavailableError -> mark_app_deprecated) unchanged.
+    (notably 404 -> CaskUnavailableError -> mark_app_deprecated) unchanged. With
+    CASK_SOURCE "index" one request supplies every document the index has, and
+    only the rest (removed casks, formulae) are fetched one by one, through an
+    AdaptiveWindow that follows how fast formulae.brew.sh is answering.
+
+    on_result(url) is called once per url as soon as its cask_cache entry is in
+    place, which is what lets CaskStream hand documents over while the rest of
+    the prefetch is still running.
     """
     unique_urls = list(dict.fromkeys(json_urls))
     cask_cache.clear()
-    print(f"\nPrefetching {len(unique_urls)} cask documents with {CASK_WORKERS} workers...")
+    published_hashes.clear()
+
+    fetch_urls = unique_urls
+    if CASK_SOURCE == "index":
+        print(f"\nResolving {len(unique_urls)} cask documents from {CASK_INDEX_URL}...")
+        fetch_urls = resolve_from_cask_index(unique_urls)
+        if on_result is not None:
+            for url in unique_urls:
+                if url in cask_cache:
+                    on_result(url)
+
+    def store(url, result):
+        cask_cache[url] = result
+        if on_result is not None:
+            on_result(url)
+
+    window = AdaptiveWindow()
+    histogram = LatencyHistogram()
+    print(
+        f"\nPrefetching {len(fetch_urls)} cask documents, {window.limit} in flight "
+        f"(adaptive, {window.minimum}-{window.maximum})..."
+    )
+    if fetch_urls:
+        asyncio.run(_fetch_casks_adaptively(fetch_urls, window, histogram, store))
+
+    print(f"Prefetched {len(cask_cache)}/{len(unique_urls)} cask documents")
+    if fetch_urls:
+        print(
+            f"Fetch window ended at {window.limit} in flight, peaked at {window.peak}, "
+            f"cut {window.cuts} times. Latency:"
+        )
+        for line in histogram.lines():
+            print(line)
+    if cask_http_cache.path is not None:
+        print(cask_http_cache.summary())
+        cask_http_cache.save()
+    return cask_cache
+
+
+class CaskStream:
+    """Cask documents handed to process_catalog() as they arrive.
 
-    with ThreadPoolExecutor(max_workers=CASK_WORKERS) as executor:
-        futures = {executor.submit(fetch_cask_data, url): url for url in unique_urls}
-        for completed, future in enumerate(as_completed(futures), start=1):
-            url = futures[future]
+    prefetch_cask_data runs in a background thread and marks each url ready as
+    its document (or stored error) lands in cask_cache. consume() yields urls in
+    catalog order and waits only for the next one, so the list passes are
+    the reorder buffer: the first app is written as soon as its document is in,
+    while writes and supported_apps keep their order whichever fetch finishes
+    first. A document is dropped from cask_cache once the last list pass that reads
+    it has moved on, so a run no longer holds every parsed cask until the end.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._ready = set()
+        self._readers = {}
+        self._done = True
+        self._thread = None
+        self._on_document = None
+
+    def start(self, json_urls, on_document=None):
+        """Start fetching json_urls. on_document(url) runs in the fetch thread for
+        every document before consume() hands it out."""
+        with self._condition:
+            self._ready = set()
+            self._done = False
+            self._readers = {}
+            for url in json_urls:
+                self._readers[url] = self._readers.get(url, 0) + 1
+        self._on_document = on_document
+        self._thread = threading.Thread(target=self._produce, args=(list(json_urls),), daemon=True)
+        self._thread.start()
+
+    def _produce(self, json_urls):
+        try:
+            with run_report.phase("cask_prefetch"):
+                prefetch_cask_data(json_urls, on_result=self._arrived)
+        except Exception as error:
+            # Urls that never arrived are fetched inline by get_homebrew_app_info.
+            print(f"❌ Cask prefetch stopped early: {error}")
+        finally:
+            with self._condition:
+                self._done = True
+                self._condition.notify_all()
+
+    def _arrived(self, url):
+        if self._on_document is not None:
             try:
-                cask_cache[url] = future.result()
+                self._on_document(url)
             except Exception as error:
-                cask_cache[url] = error
-            if completed % 100 == 0:
-                print(f"Prefetched {completed}/{len(unique_urls)} cask documents")
+                print(f"❌ Error preparing {url}: {error}")
+        with self._condition:
+            self._ready.add(url)
+            self._condition.notify_all()
+
+    def wait(self, url):
+        """Block until url's document is in cask_cache or the prefetch has ended."""
+        with self._condition:
+            self._condition.wait_for(lambda: self._done or url in self._ready)
+
+    def release(self, url):
+        """One reader of url is done; the last one drops the document."""
+        with self._condition:
+            remaining = self._readers.get(url, 0) - 1
+            if remaining > 0:
+                self._readers[url] = remaining
+                return
+            self._readers.pop(url, None)
+        cask_cache.pop(url, None)
+
+    def consume(self, urls):
+        """Yield urls in order as their documents arrive, releasing each once the
+        loop body is done with it, whether it finished, continued or raised."""
+        for url in urls:
+            self.wait(url)
+            try:
+                yield url
+            finally:
+                self.release(url)
+
+    def join(self):
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
 
-    print(f"Prefetched {len(cask_cache)}/{len(unique_urls)} cask documents")
-    return cask_cache
+
+cask_stream = CaskStream()
 
 
 def get_homebrew_app_info(json_url, needs_packaging=False, is_pkg_in_dmg=False, is_pkg_in_pkg=False, is_pkg=False):
@@ -1760,6 +1811,12 @@ def get_homebrew_app_info(json_url, needs_packaging=False, is_pkg_in_dmg=False,
         # Warp's Homebrew URL returns HTML, use direct DMG URL instead
         url = f"https://releases.warp.dev/stable/v{version}/Warp.dmg"
 
+    # A :no_check cask carries no digest, and a rewritten url (Warp above) points
+    # at a file Homebrew never hashed, so only an exact match may skip the download.
+    published_sha = str(data.get("sha256") or "").lower()
+    if url == data["url"] and SHA256_PATTERN.match(published_sha):
+        published_hashes[url] = published_sha
+
     vendor_url = url
 
     app_info = {
@@ -1788,11 +1845,848 @@ def get_homebrew_app_info(json_url, needs_packaging=False, is_pkg_in_dmg=False,
 
     return app_info
 
+# Lists whose apps are repackaged by the build, which then replaces url with the
+# Azure package. vendor_url is the only record of the artifact they came from.
+REPACKAGED_LISTS = ("app_urls", "pkg_in_pkg_urls", "pkg_in_dmg_urls")
+
+
+class ListPolicy:
+    """How process_app() treats the apps of one catalog list.
+
+    flags     get_homebrew_app_info keyword arguments, which set the type
+    label     names the app in progress and error lines, None for plain casks
+    hash      "hash" when the artifact needs a digest unless the stored one still
+              matches version and url, "app" when only a version change needs
+              one, None when the build hashes the repackaged file instead
+    merge     "update" refreshes the stored JSON in place, "preserve" starts
+              from the fresh cask data and carries the stored keys over
+    """
+
+    def __init__(self, name, flags, label=None, hash=None, merge="preserve"):
+        self.name = name
+        self.flags = flags
+        self.label = label
+        self.hash = hash
+        self.merge = merge
+        # Direct PKG apps must never fall back to a .dmg filename (Issue #107).
+        self.default_ext = ".pkg" if flags.get("is_pkg") else ".dmg"
+
+    @property
+    def urls(self):
+        return globals()[self.name]
+
+
+# Every processing list in main() order. Apps are written in this order, which
+# decides who claims a contested file and the order of the README tables.
+LIST_POLICIES = (
+    ListPolicy("app_urls", {"needs_packaging": True}, label="special app", hash="app", merge="update"),
+    ListPolicy("homebrew_cask_urls", {}, hash="hash"),
+    ListPolicy("pkg_in_pkg_urls", {"is_pkg_in_pkg": True}, label="PKG in PKG app"),
+    ListPolicy("pkg_urls", {"is_pkg": True}, label="direct PKG app", hash="hash"),
+    ListPolicy("pkg_in_dmg_urls", {"is_pkg_in_dmg": True}, label="PKG in DMG app"),
+)
+
+
+def list_policy(list_name):
+    return next(policy for policy in LIST_POLICIES if policy.name == list_name)
+
+
+def catalog_lists():
+    """Every processing list in main() order, with its get_homebrew_app_info flags."""
+    return [(policy.name, policy.urls, policy.flags) for policy in LIST_POLICIES]
+
+
+def app_is_unchanged(list_name, app_info, existing_data):
+    """True when processing app_info from list_name would leave existing_data as is."""
+    if existing_data.get("deprecated") or "deprecation_reason" in existing_data:
+        return False
+    if existing_data.get("homebrew_cask") != app_info["homebrew_cask"]:
+        return False
+    if existing_data.get("name") != app_info["name"]:
+        return False
+    if existing_data.get("type") != app_info.get("type"):
+        return False
+    if existing_data.get("version") != app_info["version"]:
+        return False
+    # Every write records the version it replaced, so a file only settles once
+    # previous_version has caught up with version.
+    if existing_data.get("previous_version") != app_info["version"]:
+        return False
+    # process_app() preserves stored values, but a key the file lacks is added.
+    if any(key not in existing_data for key in app_info):
+        return False
+
+    if list_name in REPACKAGED_LISTS:
+        return existing_data.get("vendor_url") == app_info["url"]
+
+    if app_info["name"].lower().replace(" ", "_") not in preserve_filename_apps:
+        if existing_data.get("fileName") != app_info["fileName"]:
+            return False
+    return (
+        "sha" in existing_data
+        and existing_data.get("url") == app_info["url"]
+        and existing_data.get("vendor_url") == app_info["url"]
+    )
+
+
+def find_unchanged_app(apps_folder, list_name, url):
+    """Stored app data when the cask behind url did not move, else None.
+
+    A cheap check of the cask metadata against the stored JSON: such an app
+    needs no hash, merge or write this run. Unavailable casks and anything that
+    cannot be read return None, so deprecation transitions and errors still go
+    through process_app().
+    """
+    try:
+        app_info = get_homebrew_app_info(url, **list_policy(list_name).flags)
+        file_path = os.path.join(apps_folder, f"{sanitize_filename(app_info['name'])}.json")
+    except Exception:
+        return None
+    existing_data = read_app_json(file_path)
+    if existing_data is None or not app_is_unchanged(list_name, app_info, existing_data):
+        return None
+    return existing_data
+
+
+def keep_unchanged_app(existing_data, supported_apps, apps_info):
+    """Record an app skipped by the pre-pass exactly as process_app() would have. Returns
+    False when the app was not skipped and must be processed."""
+    if existing_data is None:
+        return False
+    supported_apps.append(existing_data["name"])
+    apps_info.append(existing_data)
+    return True
+
+
+def defer_app(error, file_path, app_info, supported_apps, apps_info):
+    """Leave an app whose digest ran out of time exactly as the last run wrote it,
+    and defer its artifact to the next run. A new app waits to be listed until then."""
+    deferred_work.add(error.url, app_info["name"], app_info.get("homebrew_cask"), app_info.get("version"))
+    print(f"⏰ Deferring {app_info['name']} to the next run: {error}")
+    previous = read_app_json(file_path)
+    if previous is None:
+        supported_apps.remove(app_info["name"])
+    else:
+        apps_info.append(previous)
+
+
+def update_repackaged_app(app_info, existing_data):
+    """The stored JSON of an "update" list app, refreshed from app_info."""
+    display_name = app_info["name"]
+    print(f"Found existing file for {display_name}")
+    # Store the new version and check if it changed
+    new_version = app_info["version"]
+    version_changed = existing_data.get("version") != new_version
+
+    # Capture the previous version before overwriting it, otherwise
+    # previous_version always equals version (noted in Issue #116)
+    existing_data["previous_version"] = existing_data.get("version", "")
+
+    # The cask is healthy again, so drop any stale deprecation flag
+    existing_data.pop("deprecated", None)
+    existing_data.pop("deprecation_reason", None)
+
+    # Always update version and url
+    existing_data["version"] = new_version
+    existing_data["url"] = app_info["url"]
+    existing_data["homebrew_cask"] = app_info["homebrew_cask"]
+
+    # For repackaged apps (type "app", "pkg_in_dmg", or "pkg_in_pkg"), the
+    # existing fileName is kept; for the others it follows the URL
+    if not ("type" in existing_data and existing_data["type"] in ["app", "pkg_in_dmg", "pkg_in_pkg"]):
+        existing_data["fileName"] = get_filename_from_url(app_info["url"], app_name=display_name, version=new_version)
+
+    # Ownership: the list an app is processed from owns its type and
+    # vendor_url, otherwise a stale value survives every run forever.
+    # These assignments must stay below the fileName block, which
+    # branches on the previous type and would change fileName handling
+    # if it saw the refreshed value.
+    existing_data["type"] = app_info["type"]
+    existing_data["vendor_url"] = app_info["vendor_url"]
+
+    # Calculate new hash if version changed
+    if version_changed:
+        print(f"🔍 Version changed, calculating new SHA256 hash for {display_name}...")
+        file_hash = hash_pool.result(app_info["url"], app_info["homebrew_cask"], app_info["version"])
+        if file_hash:
+            existing_data["sha"] = file_hash
+            print(f"✅ New SHA256 hash calculated: {file_hash}")
+        else:
+            print(f"⚠️ Could not calculate SHA256 hash for {display_name}")
+    return existing_data
+
+
+def merge_app_info(policy, app_info, existing_data):
+    """app_info with the stored keys of a "preserve" list app carried over."""
+    display_name = app_info["name"]
+    new_version = app_info["version"]
+    new_url = app_info["url"]
+    new_sha = app_info.get("sha")
+    previous_version = existing_data.get("version")
+
+    # Preserve all existing data except version, url, previous_version and, for
+    # lists that hash their artifact, sha. type, homebrew_cask and vendor_url
+    # are owned by the list being processed, so the fresh values win over
+    # whatever is on disk; plain casks are vendor-served DMGs whose fresh
+    # app_info carries no type key at all, so a stale repackaging type is dropped.
+    owned = ["version", "url", "previous_version", "deprecated", "deprecation_reason",
+             "type", "homebrew_cask", "vendor_url"]
+    if policy.hash:
+        owned.append("sha")
+    for key in existing_data:
+        if key not in owned:
+            app_info[key] = existing_data[key]
+
+    app_info["version"] = new_version
+    app_info["url"] = new_url
+    if new_sha:
+        app_info["sha"] = new_sha
+
+    if display_name.lower().replace(" ", "_") in preserve_filename_apps:
+        # For apps in the exclusion list, preserve the existing fileName
+        print(f"⚠️ Preserving custom fileName for {display_name}")
+    else:
+        # For all other apps, update fileName to match the URL
+        app_info["fileName"] = get_filename_from_url(
+            new_url, app_name=display_name, version=new_version, default_ext=policy.default_ext
+        )
+    app_info["previous_version"] = previous_version
+    return app_info
+
+
+def process_app(policy, url, apps_folder, supported_apps, apps_info):
+    """Collect one cask of a policy's list and write its Apps/*.json."""
+    verbose = policy.merge == "update"
+    try:
+        if policy.label:
+            print(f"\nProcessing {policy.label} URL: {url}")
+        app_info = get_homebrew_app_info(url, **policy.flags)
+        display_name = app_info['name']
+        if verbose:
+            print(f"Got app info for: {display_name}")
+        supported_apps.append(display_name)
+        file_name = f"{sanitize_filename(display_name)}.json"
+        file_path = os.path.join(apps_folder, file_name)
+        if verbose:
+            print(f"🔍 Sanitized filename: {file_name}")
+            print(f"📝 Attempting to write to: {os.path.abspath(file_path)}")
+
+        if not claim_app_file(file_path, app_info.get("homebrew_cask")):
+            return
+
+        existing_data = read_app_json(file_path, strict=True)
+        if policy.hash == "hash":
+            # Reuse the stored hash only while both the version and the
+            # download URL are unchanged. Casks using version,build syntax
+            # strip the build number, so a build-only bump leaves the version
+            # equal while the URL (and the file behind it) changes.
+            if (existing_data is not None and "sha" in existing_data and
+                existing_data.get("version") == app_info["version"] and
+                existing_data.get("url") == app_info["url"]):
+                app_info["sha"] = existing_data["sha"]
+                print(f"ℹ️ Using existing hash for {display_name}")
+            else:
+                print(f"🔍 Calculating SHA256 hash for {display_name}...")
+                file_hash = hash_pool.result(app_info["url"], app_info["homebrew_cask"], app_info["version"])
+                if file_hash:
+                    app_info["sha"] = file_hash
+                    print(f"✅ SHA256 hash calculated: {file_hash}")
+                else:
+                    print(f"⚠️ Could not calculate SHA256 hash for {display_name}")
+
+        if existing_data is not None:
+            if policy.merge == "update":
+                app_info = update_repackaged_app(app_info, existing_data)
+            else:
+                app_info = merge_app_info(policy, app_info, existing_data)
+
+        write_app_json(file_path, app_info)
+        if verbose:
+            print(f"Successfully wrote {file_path} with type '{app_info['type']}' flag")
+
+        apps_info.append(app_info)
+        print(f"Saved app information for {display_name} to {file_path}")
+    except DeadlineExceeded as e:
+        defer_app(e, file_path, app_info, supported_apps, apps_info)
+    except CaskUnavailableError as e:
+        mark_app_deprecated(apps_folder, e.display_name, e.reason, e.cask_token)
+    except Exception as e:
+        print(f"Error processing {policy.label + ' ' if policy.label else ''}{url}: {str(e)}")
+        if verbose:
+            print(f"Full error details: ", e)
+
+
+def process_catalog(apps_folder, supported_apps, apps_info, unchanged_app):
+    """Run every catalog list through process_app() in LIST_POLICIES order.
+
+    The cask fetches and the digests behind all lists already run concurrently
+    in cask_stream and hash_pool; this pass only applies each policy to the
+    results in catalog order, so writes, claims and the README stay ordered.
+    unchanged_app(list_name, url) returns the stored data of an app to skip.
+    """
+    for policy in LIST_POLICIES:
+        for url in run_report.timed(f"loop:{policy.name}", cask_stream.consume(policy.urls)):
+            if keep_unchanged_app(unchanged_app(policy.name, url), supported_apps, apps_info):
+                continue
+            process_app(policy, url, apps_folder, supported_apps, apps_info)
+
+
+def scraper_json_path(apps_folder, scraper):
+    return os.path.join(apps_folder, os.path.basename(scraper).replace('.sh', '.json'))
+
+
+def scraper_artifact(json_file):
+    """The direct DMG or PKG download of a scraper's JSON that has no digest yet, or None."""
+    try:
+        with open(json_file, 'r') as f:
+            app_data = json.load(f)
+    except (OSError, ValueError):
+        return None
+    url = app_data.get('url') if isinstance(app_data, dict) else None
+    if url and 'sha' not in app_data and (url.endswith('.dmg') or url.endswith('.pkg')):
+        return url
+    return None
+
+
+def run_scraper(scraper, apps_folder):
+    """Run one scraper with SCRAPER_TIMEOUT and queue its artifact on hash_pool.
+
+    Returns (error or None, captured output, seconds). The script gets its own
+    process group, so a timeout also kills the curl it is waiting on instead of
+    leaving it to hold the output pipe open.
+    """
+    started = time.monotonic()
+    try:
+        process = subprocess.Popen(
+            [scraper],
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
+            text=True,
+            start_new_session=True,
+        )
+    except OSError as e:
+        return str(e), "", time.monotonic() - started
+    try:
+        output, _ = process.communicate(timeout=SCRAPER_TIMEOUT)
+        error = f"exited with status {process.returncode}" if process.returncode else None
+    except subprocess.TimeoutExpired:
+        os.killpg(process.pid, signal.SIGKILL)
+        output, _ = process.communicate()
+        error = f"timed out after {SCRAPER_TIMEOUT:g}s"
+    if error is None:
+        artifact_url = scraper_artifact(scraper_json_path(apps_folder, scraper))
+        if artifact_url:
+            hash_pool.submit(artifact_url)
+    seconds = time.monotonic() - started
+    run_report.add_time("scrapers", seconds)
+    return error, output, seconds
+
+
+def start_scrapers(apps_folder):
+    """Start every custom scraper in a pool of SCRAPER_WORKERS. Returns the
+    executor and one future per scraper, in list order."""
+    executor = ThreadPoolExecutor(max_workers=max(SCRAPER_WORKERS, 1))
+    return executor, [executor.submit(run_scraper, scraper, apps_folder) for scraper in custom_scrapers]
+
+
+def finish_scrapers(executor, runs, apps_folder, supported_apps):
+    """Collect the scrapers in list order: print each one's output as a block,
+    then add its app and the digest its direct download still needs."""
+    for scraper, run in zip(custom_scrapers, runs):
+        error, output, seconds = run.result()
+        status = f"failed, {error}" if error else "ok"
+        print(f"\n🧩 Scraper {scraper} ({status}, {seconds:.1f}s)")
+        for line in output.splitlines():
+            print(f"   {line}")
+
+        json_file = scraper_json_path(apps_folder, scraper)
+        app_catalog.refresh(json_file)
+        if not os.path.exists(json_file):
+            continue
+        try:
+            with open(json_file, 'r') as f:
+                app_data = json.load(f)
+            if not error:
+                supported_apps.append(app_data['name'])
+        except Exception as e:
+            print(f"Error reading scraper output {json_file}: {str(e)}")
+            continue
+
+        # Direct downloads (DMG/PKG) without a hash were queued when the scraper
+        # finished, so their digest comes from the same deduplicated pool as the casks.
+        artifact_url = scraper_artifact(json_file)
+        if artifact_url is None:
+            continue
+        print(f"🔍 Calculating SHA256 hash for {app_data['name']}...")
+        try:
+            file_hash = hash_pool.result(artifact_url)
+        except DeadlineExceeded as e:
+            deferred_work.add(e.url, app_data['name'])
+            print(f"⏰ Deferring {app_data['name']} to the next run: {e}")
+            continue
+        if file_hash:
+            app_data['sha'] = file_hash
+            write_app_json(json_file, app_data)
+            print(f"✅ SHA256 hash added for {app_data['name']}: {file_hash}")
+        else:
+            print(f"⚠️ Could not calculate SHA256 hash for {app_data['name']}")
+    executor.shutdown(wait=True)
+
+
+def hash_policies():
+    """cask url -> [ListPolicy] for every list whose apps may need a digest.
+
+    PKG-in-DMG and PKG-in-PKG apps are left out: the build hashes them after
+    repackaging.
+    """
+    policies = {}
+    for policy in LIST_POLICIES:
+        if policy.hash is None:
+            continue
+        for url in policy.urls:
+            policies.setdefault(url, []).append(policy)
+    return policies
+
+
+def pending_hash_url(url, policy, apps_folder):
+    """The artifact url process_app() will need a digest for, or None.
+
+    Mirrors its hash decision for policy without writing anything. A file owned
+    by another cask is skipped, since process_app() refuses to write it anyway.
+    """
+    try:
+        app_info = get_homebrew_app_info(url, **policy.flags)
+    except Exception:
+        # The processing loop reports this failure for the app.
+        return None
+
+    file_path = os.path.join(apps_folder, f"{sanitize_filename(app_info['name'])}.json")
+    existing_data = read_app_json(file_path)
+
+    if existing_data is not None:
+        existing_cask = existing_data.get("homebrew_cask") or ""
+        if existing_cask and existing_cask != app_info["homebrew_cask"]:
+            return None
+
+    if policy.hash == "app":
+        needs_hash = (
+            existing_data is not None
+            and existing_data.get("version") != app_info["version"]
+        )
+    else:
+        needs_hash = not (
+            existing_data is not None
+            and "sha" in existing_data
+            and existing_data.get("version") == app_info["version"]
+            and existing_data.get("url") == app_info["url"]
+        )
+    return app_info["url"] if needs_hash else None
+
+
+def pending_hash_urls(apps_folder):
+    """Every artifact url process_catalog() will need a digest for."""
+    pending = []
+    for url, policies in hash_policies().items():
+        for policy in policies:
+            artifact_url = pending_hash_url(url, policy, apps_folder)
+            if artifact_url:
+                pending.append(artifact_url)
+    return list(dict.fromkeys(pending))
+
+
+def queue_pending_hashes(url, policies, apps_folder):
+    """Hand the artifacts of one freshly arrived cask document to hash_pool."""
+    for policy in policies.get(url, ()):
+        artifact_url = pending_hash_url(url, policy, apps_folder)
+        if artifact_url:
+            app_info = get_homebrew_app_info(url, **policy.flags)
+            hash_pool.submit(artifact_url, app_info["homebrew_cask"], app_info["version"])
+
+
+HASH_JOURNAL_FILE = "hash-journal.jsonl"
+
+
+class HashJournal:
+    """Append-only record of every digest this run produced, in COLLECTOR_CACHE_DIR.
+
+    A cancelled or timed-out run loses its Apps/*.json changes but not its
+    downloads: each (cask, version, url, sha) is appended and flushed the moment
+    it is known, and the next run replays an entry whenever the cask still
+    reports the same version and url. A successful run compacts the file to the
+    entries that matched this run, so it never grows past one line per app.
+    """
+
+    def __init__(self):
+        self.path = None
+        self.entries = {}
+        self.used = set()
+        self._file = None
+        self._lock = threading.Lock()
+
+    def load(self, path):
+        self.close()
+        self.path = path
+        self.entries = {}
+        self.used = set()
+        try:
+            with open(path, "r") as f:
+                lines = f.readlines()
+        except OSError:
+            lines = []
+        for line in lines:
+            try:
+                entry = json.loads(line)
+                key = (entry["cask"], entry["version"], entry["url"])
+                sha = entry["sha"]
+            except (ValueError, KeyError, TypeError):
+                # A run killed mid-write leaves a truncated last line.
+                continue
+            if isinstance(sha, str) and SHA256_PATTERN.match(sha):
+                self.entries[key] = sha
+        try:
+            os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+            self._file = open(path, "a")
+        except OSError as error:
+            print(f"Warning: could not open the hash journal {path}: {error}")
+            self._file = None
+
+    def lookup(self, cask, version, url):
+        """The journaled digest for exactly this cask version and url, or None."""
+        key = (cask, version, url)
+        with self._lock:
+            sha = self.entries.get(key)
+            if sha is not None:
+                self.used.add(key)
+        return sha
+
+    def record(self, cask, version, url, sha):
+        key = (cask, version, url)
+        with self._lock:
+            self.entries[key] = sha
+            self.used.add(key)
+            if self._file is None:
+                return
+            self._file.write(json.dumps({"cask": cask, "version": version, "url": url, "sha": sha}) + "\n")
+            self._file.flush()
+
+    def compact(self):
+        """Rewrite the journal with only the entries that matched this run."""
+        if self.path is None:
+            return
+        with self._lock:
+            kept = [(key, self.entries[key]) for key in sorted(self.used)]
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+        try:
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w") as f:
+                for (cask, version, url), sha in kept:
+                    f.write(json.dumps({"cask": cask, "version": version, "url": url, "sha": sha}) + "\n")
+            os.replace(temp_path, self.path)
+        except OSError as error:
+            print(f"Warning: could not compact the hash journal {self.path}: {error}")
+
+    def close(self):
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._file = None
+
+
+hash_journal = HashJournal()
+
+
+def journaled_file_hash(url, cask=None, version=None):
+    """resolve_file_hash, replayed from and recorded to hash_journal when the cask
+    version is known."""
+    if cask and version:
+        sha = hash_journal.lookup(cask, version, url)
+        if sha is not None:
+            count_hash_stat("journal_replayed")
+            return sha
+    file_hash = resolve_file_hash(url)
+    if file_hash and cask and version:
+        hash_journal.record(cask, version, url, file_hash)
+    return file_hash
+
+
+DEFERRED_WORK_FILE = "deferred-work.json"
+
+
+class DeferredWork:
+    """Artifacts a run left unhashed at its deadline, hashed first by the next run.
+
+    Their apps keep their previous JSON, so the next run sees the same version
+    change and queues them again; this file only moves them to the front.
+    """
+
+    def __init__(self):
+        self.path = None
+        self.previous = set()
+        self.entries = {}
+        self._lock = threading.Lock()
+
+    def load(self, path):
+        self.path = path
+        self.entries = {}
+        try:
+            with open(path, "r") as f:
+                self.previous = {entry["url"] for entry in json.load(f)["artifacts"]}
+        except FileNotFoundError:
+            self.previous = set()
+        except (OSError, ValueError, KeyError, TypeError) as error:
+            print(f"Warning: ignoring unreadable deferred work file {path}: {error}")
+            self.previous = set()
+        if self.previous:
+            print(f"⏳ {len(self.previous)} artifacts deferred by the last run go first")
+
+    def add(self, url, app=None, cask=None, version=None):
+        with self._lock:
+            self.entries[url] = {"url": url, "app": app, "cask": cask, "version": version}
+
+    def save(self):
+        """Replace the file with this run's deferrals, or remove it when there are none."""
+        if self.path is None:
+            return
+        try:
+            if not self.entries:
+                if os.path.exists(self.path):
+                    os.remove(self.path)
+                return
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump({"version": 1, "artifacts": list(self.entries.values())}, f, indent=2)
+            os.replace(temp_path, self.path)
+        except OSError as error:
+            print(f"Warning: could not save deferred work to {self.path}: {error}")
+
+
+deferred_work = DeferredWork()
+
+
+class HashPool:
+    """resolve_file_hash for queued artifacts, in bounded worker lanes.
+
+    main() queues an artifact as soon as its cask document arrives. Its size is
+    probed first, then workers always take the largest queued artifact: the
+    long downloads start early instead of trailing at the end of the run.
+    Artifacts deferred by the last run go before any of them, and artifacts over
+    HASH_SLOW_LANE_BYTES go to a lane of their own so small apps keep moving.
+    process_app() collects a digest with result(), which waits for that url only; an
+    artifact that was never queued, or whose worker failed, is resolved inline
+    there as before. Past run_deadline no probe or download starts, and result()
+    raises DeadlineExceeded for an artifact that still needed one.
+    """
+
+    def __init__(self):
+        self._probes = None
+        self._size_probes = None
+        self._threads = []
+        self._futures = {}
+        self._lanes = {"regular": [], "slow": []}
+        self._lock = threading.Lock()
+        self._ready = threading.Condition(self._lock)
+        self._order = 0
+        self._probing = 0
+        self._closing = False
+        self.busy_seconds = 0.0
+        self.duplicates = 0
+        self.slow_jobs = 0
+        self.started = None
+
+    def start(self, workers=None):
+        # Without a regular worker nothing takes small artifacts and result() waits forever.
+        workers = max(1, HASH_WORKERS if workers is None else workers)
+        hash_cache.clear()
+        with self._lock:
+            self._futures = {}
+            self._lanes = {"regular": [], "slow": []}
+            self._probing = 0
+            self._closing = False
+            self.busy_seconds = 0.0
+            self.duplicates = 0
+            self.slow_jobs = 0
+        self.started = time.monotonic()
+        self.workers = workers
+        self.slow_workers = HASH_SLOW_LANE_WORKERS if HASH_SLOW_LANE_BYTES > 0 else 0
+        self._probes = ThreadPoolExecutor(max_workers=HASH_PROBE_WORKERS)
+        if TRUSTED_SIZE_PROBE_WORKERS > 0:
+            self._size_probes = ThreadPoolExecutor(max_workers=TRUSTED_SIZE_PROBE_WORKERS)
+        lanes = ["regular"] * workers + ["slow"] * self.slow_workers
+        self._threads = [threading.Thread(target=self._work, args=(lane,), daemon=True) for lane in lanes]
+        for thread in self._threads:
+            thread.start()
+        if HASH_BANDWIDTH_LIMIT > 0:
+            print(f"Download bandwidth capped at {HASH_BANDWIDTH_LIMIT / (1024 * 1024):.1f} MiB/s")
+
+    def submit(self, url, cask=None, version=None):
+        with self._lock:
+            if url in self._futures:
+                # Another app already queued this artifact; both read its result.
+                self.duplicates += 1
+                return
+            if self._probes is None:
+                return
+            future = self._futures[url] = Future()
+            self._probing += 1
+        self._probes.submit(self._schedule, url, cask, version, future)
+
+    def backlog(self):
+        """Sized artifacts waiting for a worker."""
+        with self._lock:
+            return sum(len(lane) for lane in self._lanes.values())
+
+    def _size(self, url, cask, version):
+        # Neither a journaled nor a trusted digest is downloaded, bar the odd audit.
+        if cask and version and hash_journal.lookup(cask, version, url) is not None:
+            return 0
+        if trusted_published_hash(url):
+            if self._size_probes is not None:
+                self._size_probes.submit(self._probe_trusted_size, url)
+            return 0
+        # Past the deadline the artifact will not be downloaded, so it is not probed either.
+        run_deadline.check(url)
+        try:
+            return probe_size(url)
+        except Exception:
+            return None
+
+    def _probe_trusted_size(self, url):
+        """Learn a trusted artifact's size for the report, unless time is up."""
+        if run_deadline.expired():
+            return
+        try:
+            probe_size(url)
+        except Exception:
+            pass
+
+    def _schedule(self, url, cask, version, future):
+        try:
+            size = self._size(url, cask, version)
+        except DeadlineExceeded as error:
+            # Deferred straight away; result() raises it to process_app().
+            future.set_exception(error)
+            with self._ready:
+                self._probing -= 1
+                self._ready.notify_all()
+            return
+        slow = self.slow_workers > 0 and size is not None and size > HASH_SLOW_LANE_BYTES
+        with self._ready:
+            self._order += 1
+            # Unknown sizes sort as empty: known-large artifacts go first.
+            heapq.heappush(
+                self._lanes["slow" if slow else "regular"],
+                (url not in deferred_work.previous, -(size or 0), self._order, url, cask, version, future),
+            )
+            if slow:
+                self.slow_jobs += 1
+            self._probing -= 1
+            self._ready.notify_all()
+
+    def _next_job(self, lane):
+        with self._ready:
+            while True:
+                # An idle slow-lane worker helps with small artifacts; never the reverse.
+                for name in (lane, "regular"):
+                    if self._lanes[name]:
+                        return heapq.heappop(self._lanes[name])
+                if self._closing and self._probing == 0:
+                    return None
+                self._ready.wait()
+
+    def _work(self, lane):
+        while True:
+            job = self._next_job(lane)
+            if job is None:
+                return
+            url, cask, version, future = job[-4:]
+            if not future.set_running_or_notify_cancel():
+                continue
+            started = time.monotonic()
+            try:
+                hash_cache[url] = journaled_file_hash(url, cask, version)
+                future.set_result(hash_cache[url])
+            except Exception as error:
+                future.set_exception(error)
+            finally:
+                with self._lock:
+                    self.busy_seconds += time.monotonic() - started
+
+    def result(self, url, cask=None, version=None):
+        """Digest for url, waiting for its worker when it was queued."""
+        with self._lock:
+            future = self._futures.get(url)
+        if future is not None:
+            try:
+                return future.result()
+            except DeadlineExceeded:
+                raise
+            except Exception as error:
+                print(f"❌ Error hashing {url}: {error}")
+        return journaled_file_hash(url, cask, version)
+
+    def close(self):
+        """Wait for outstanding workers and print what the pool did."""
+        if self._probes is None:
+            return
+        self._probes.shutdown(wait=True)
+        self._probes = None
+        with self._ready:
+            self._closing = True
+            self._ready.notify_all()
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+        if self._size_probes is not None:
+            self._size_probes.shutdown(wait=True)
+            self._size_probes = None
+        if not self._futures:
+            return
+        wall_seconds = time.monotonic() - self.started
+        print(
+            f"\nHashed {len(hash_cache)}/{len(self._futures)} queued artifacts with "
+            f"{self.workers} workers in {wall_seconds:.1f}s wall clock "
+            f"({self.busy_seconds:.1f}s of download time)"
+        )
+        if self.slow_jobs:
+            print(
+                f"   {self.slow_jobs} artifacts over {HASH_SLOW_LANE_BYTES / (1024 ** 3):.1f} GiB "
+                f"went through the slow lane"
+            )
+
+
+hash_pool = HashPool()
+
+
 def sanitize_filename(name):
     sanitized = name.replace(' ', '_')
     sanitized = re.sub(r'[^\w_]', '', sanitized)
     return sanitized.lower()
 
+def build_logo_index(logos_path):
+    """Lowercase filename -> filename for everything in Logos/, listed once per run."""
+    logo_index = {}
+    try:
+        filenames = sorted(os.listdir(logos_path))
+    except OSError:
+        return logo_index
+    for filename in filenames:
+        logo_index.setdefault(filename.lower(), filename)
+    return logo_index
+
+
+def resolve_logo(logo_index, display_name):
+    """README path of the logo for display_name, .png before .ico, or None."""
+    logo_name = sanitize_filename(display_name)
+    for ext in ['.png', '.ico']:
+        filename = logo_index.get(f"{logo_name}{ext}")
+        if filename:
+            return f"Logos/{filename}"
+    return None
+
+
 def update_readme_apps(apps_list):
     readme_path = Path(__file__).parent.parent.parent / "README.md"
     logos_path = Path(__file__).parent.parent.parent / "Logos"
@@ -1807,36 +2701,32 @@ def update_readme_apps(apps_list):
     apps_folder = Path(__file__).parent.parent.parent / "Apps"
     apps_info = []
     missing_logos = []
+    logo_index = build_logo_index(logos_path)
     
-    for app_json in apps_folder.glob("*.json"):
-        # Read the JSON file to get the display name
-        with open(app_json, 'r') as f:
-            try:
-                data = json.load(f)
-                display_name = data['name']
-                # Convert display name to filename format
-                logo_name = sanitize_filename(display_name)
-                
-                # Look for matching logo file (trying both .png and .ico)
-                logo_file = None
-                for ext in ['.png', '.ico']:
-                    # Case-insensitive search for logo files
-                    potential_logos = [f for f in os.listdir(logos_path) 
-                                     if f.lower() == f"{logo_name}{ext}".lower()]
-                    if potential_logos:
-                        logo_file = f"Logos/{potential_logos[0]}"
-                        break
-                
-                if not logo_file:
-                    missing_logos.append(display_name)
-
-                apps_info.append({
-                    'name': display_name,
-                    'version': data['version'],
-                    'logo': logo_file
-                })
-            except Exception as e:
-                print(f"Error reading {app_json}: {e}")
+    # The catalog main() just wrote is already parsed; a standalone call reads the folder.
+    if app_catalog.apps_folder is not None:
+        app_files = app_catalog.entries()
+    else:
+        app_files = [(app_json, None) for app_json in sorted(apps_folder.glob("*.json"))]
+
+    for app_json, data in app_files:
+        try:
+            if data is None:
+                with open(app_json, 'r') as f:
+                    data = json.load(f)
+            display_name = data['name']
+            # Case-insensitive lookup, trying both .png and .ico
+            logo_file = resolve_logo(logo_index, display_name)
+            if not logo_file:
+                missing_logos.append(display_name)
+
+            apps_info.append({
+                'name': display_name,
+                'version': data['version'],
+                'logo': logo_file
+            })
+        except Exception as e:
+            print(f"Error reading {app_json}: {e}")
 
     # Print missing logos summary
     if missing_logos:
@@ -1915,14 +2805,18 @@ def update_readme_with_latest_changes(apps_info):
     version_changes = []
     for app in apps_info:
         try:
-            with open(f"Apps/{sanitize_filename(app['name'])}.json", 'r') as f:
-                current_data = json.load(f)
-                if 'previous_version' in current_data and current_data['version'] != current_data['previous_version']:
-                    version_changes.append({
-                        'name': app['name'],
-                        'old_version': current_data['previous_version'],
-                        'new_version': current_data['version']
-                    })
+            app_path = os.path.join("Apps", f"{sanitize_filename(app['name'])}.json")
+            if app_catalog.covers("Apps") and app_catalog.contains(app_path):
+                current_data = app_catalog.get(app_path)
+            else:
+                with open(app_path, 'r') as f:
+                    current_data = json.load(f)
+            if 'previous_version' in current_data and current_data['version'] != current_data['previous_version']:
+                version_changes.append({
+                    'name': app['name'],
+                    'old_version': current_data['previous_version'],
+                    'new_version': current_data['version']
+                })
         except Exception as e:
             print(f"Error checking version history for {app['name']}: {e}")
 
@@ -1966,7 +2860,15 @@ def update_readme_with_latest_changes(apps_info):
     
     print("Could not find the Features section in README.md")
 
-def main():
+def main(argv=()):
+    parser = argparse.ArgumentParser(description="Collect app information from Homebrew.")
+    parser.add_argument(
+        "--full",
+        action="store_true",
+        help="process every app, not only those whose cask version or url changed",
+    )
+    args = parser.parse_args(argv)
+
     apps_folder = "Apps"
     os.makedirs(apps_folder, exist_ok=True)
     print(f"\n📁 Apps folder absolute path: {os.path.abspath(apps_folder)}")
@@ -1975,403 +2877,76 @@ def main():
     
     supported_apps = []
     apps_info = []
-
-    prefetch_cask_data(
-        app_urls + homebrew_cask_urls + pkg_in_pkg_urls + pkg_urls + pkg_in_dmg_urls
+    run_report.start()
+    run_deadline.start(RUN_DEADLINE_SECONDS)
+    hash_stats.update(HASH_STATS_INITIAL)
+    artifact_sizes.clear()
+    trusted_urls.clear()
+    download_flights.reset()
+    probe_flights.reset()
+    app_catalog.load(apps_folder)
+    cask_http_cache.load(os.path.join(COLLECTOR_CACHE_DIR, CASK_HTTP_CACHE_FILE))
+    agent_table.load(os.path.join(COLLECTOR_CACHE_DIR, AGENT_TABLE_FILE))
+    hash_journal.load(os.path.join(COLLECTOR_CACHE_DIR, HASH_JOURNAL_FILE))
+    content_ledger.load(os.path.join(COLLECTOR_CACHE_DIR, CONTENT_LEDGER_FILE))
+    deferred_work.load(os.path.join(COLLECTOR_CACHE_DIR, DEFERRED_WORK_FILE))
+
+    # Apps are processed while their cask documents are still arriving: each
+    # document queues its artifact for hashing, then waits for process_catalog().
+    policies = hash_policies()
+    hash_pool.start()
+    cask_stream.start(
+        [url for policy in LIST_POLICIES for url in policy.urls],
+        on_document=lambda url: queue_pending_hashes(url, policies, apps_folder),
     )
+    scraper_executor, scraper_runs = start_scrapers(apps_folder)
 
-    # Process apps that need special packaging
-    for url in app_urls:
-        try:
-            print(f"\nProcessing special app URL: {url}")
-            app_info = get_homebrew_app_info(url, needs_packaging=True)
-            display_name = app_info['name']
-            print(f"Got app info for: {display_name}")
-            supported_apps.append(display_name)
-            file_name = f"{sanitize_filename(display_name)}.json"
-            print(f"🔍 Sanitized filename: {file_name}")
-            file_path = os.path.join(apps_folder, file_name)
-            print(f"📝 Attempting to write to: {os.path.abspath(file_path)}")
-
-            if not claim_app_file(file_path, app_info.get("homebrew_cask")):
-                continue
-
-            # For existing files, update version, url, and recalculate SHA if version changed
-            if os.path.exists(file_path):
-                print(f"Found existing file for {display_name}")
-                with open(file_path, "r") as f:
-                    existing_data = json.load(f)
-                    # Store the new version and check if it changed
-                    new_version = app_info["version"]
-                    version_changed = existing_data.get("version") != new_version
-
-                    # Capture the previous version before overwriting it, otherwise
-                    # previous_version always equals version (noted in Issue #116)
-                    existing_data["previous_version"] = existing_data.get("version", "")
-
-                    # The cask is healthy again, so drop any stale deprecation flag
-                    existing_data.pop("deprecated", None)
-                    existing_data.pop("deprecation_reason", None)
-
-                    # Always update version and url
-                    existing_data["version"] = new_version
-                    existing_data["url"] = app_info["url"]
-                    existing_data["homebrew_cask"] = app_info["homebrew_cask"]
-                    
-                    # For repackaged apps (type "app", "pkg_in_dmg", or "pkg_in_pkg"),
-                    # preserve the fileName field from the existing JSON file
-                    if "type" in existing_data and existing_data["type"] in ["app", "pkg_in_dmg", "pkg_in_pkg"]:
-                        # Keep existing fileName for repackaged apps
-                        if "fileName" in existing_data:
-                            app_info["fileName"] = existing_data["fileName"]
-                    else:
-                        # For non-repackaged apps, update fileName to match the URL
-                        existing_data["fileName"] = get_filename_from_url(app_info["url"], app_name=display_name, version=new_version)
-
-                    # Ownership: the list an app is processed from owns its type and
-                    # vendor_url, otherwise a stale value survives every run forever.
-                    # These assignments must stay below the fileName block, which
-                    # branches on the previous type and would change fileName handling
-                    # if it saw the refreshed value.
-                    existing_data["type"] = "app"
-                    existing_data["vendor_url"] = app_info["vendor_url"]
-
-                    # Calculate new hash if version changed
-                    if version_changed:
-                        print(f"🔍 Version changed, calculating new SHA256 hash for {display_name}...")
-                        file_hash = calculate_file_hash(app_info["url"])
-                        if file_hash:
-                            existing_data["sha"] = file_hash
-                            print(f"✅ New SHA256 hash calculated: {file_hash}")
-                        else:
-                            print(f"⚠️ Could not calculate SHA256 hash for {display_name}")
-                    
-                    # Update app_info with all existing data
-                    app_info = existing_data
-
-            with open(file_path, "w") as f:
-                json.dump(app_info, f, indent=2)
-                print(f"Successfully wrote {file_path} with type 'app' flag")
-
-            apps_info.append(app_info)
-            print(f"Saved app information for {display_name} to {file_path}")
-        except CaskUnavailableError as e:
-            mark_app_deprecated(apps_folder, e.display_name, e.reason, e.cask_token)
-        except Exception as e:
-            print(f"Error processing special app {url}: {str(e)}")
-            print(f"Full error details: ", e)
-
-    # Process regular Homebrew cask URLs
-    for url in homebrew_cask_urls:
-        try:
-            app_info = get_homebrew_app_info(url)
-            display_name = app_info['name']
-            supported_apps.append(display_name)
-            file_name = f"{sanitize_filename(display_name)}.json"
-            file_path = os.path.join(apps_folder, file_name)
-
-            if not claim_app_file(file_path, app_info.get("homebrew_cask")):
-                continue
-
-            # Check if we need to calculate hash
-            needs_hash = True
-            if os.path.exists(file_path):
-                with open(file_path, "r") as f:
-                    existing_data = json.load(f)
-                    # Reuse the stored hash only while both the version and the
-                    # download URL are unchanged. Casks using version,build
-                    # syntax strip the build number above, so a build-only bump
-                    # leaves the version equal while the URL (and the file
-                    # behind it) changes.
-                    if ("sha" in existing_data and
-                        existing_data.get("version") == app_info["version"] and
-                        existing_data.get("url") == app_info["url"]):
-                        needs_hash = False
-                        app_info["sha"] = existing_data["sha"]
-                        print(f"ℹ️ Using existing hash for {display_name}")
-
-            if needs_hash:
-                print(f"🔍 Calculating SHA256 hash for {display_name}...")
-                file_hash = calculate_file_hash(app_info["url"])
-                if file_hash:
-                    app_info["sha"] = file_hash
-                    print(f"✅ SHA256 hash calculated: {file_hash}")
-                else:
-                    print(f"⚠️ Could not calculate SHA256 hash for {display_name}")
-
-            # For existing files, preserve existing data and update necessary fields
-            if os.path.exists(file_path):
-                with open(file_path, "r") as f:
-                    existing_data = json.load(f)
-                    # Store the new version, url, sha and previous_version
-                    new_version = app_info["version"]
-                    new_url = app_info["url"]
-                    new_sha = app_info.get("sha")
-                    previous_version = existing_data.get("version")
-                    
-                    # Preserve all existing data except version, url, sha, and previous_version.
-                    # type, homebrew_cask and vendor_url are owned by the list being
-                    # processed: these casks are vendor-served DMGs, so the fresh app_info
-                    # carries no type key at all and a stale repackaging type is dropped.
-                    for key in existing_data:
-                        if key not in ["version", "url", "sha", "previous_version", "deprecated", "deprecation_reason",
-                                       "type", "homebrew_cask", "vendor_url"]:
-                            app_info[key] = existing_data[key]
-                    
-                    # Update version, url, sha and previous_version
-                    app_info["version"] = new_version
-                    app_info["url"] = new_url
-                    
-                    # Handle fileName field
-                    if display_name.lower().replace(" ", "_") in preserve_filename_apps:
-                        # For apps in the exclusion list, preserve the existing fileName
-                        print(f"⚠️ Preserving custom fileName for {display_name}")
-                    else:
-                        # For all other apps, update fileName to match the URL
-                        app_info["fileName"] = get_filename_from_url(new_url, app_name=display_name, version=new_version)
-                    if new_sha:
-                        app_info["sha"] = new_sha
-                    app_info["previous_version"] = previous_version
-
-            with open(file_path, "w") as f:
-                json.dump(app_info, f, indent=2)
-
-            apps_info.append(app_info)
-            print(f"Saved app information for {display_name} to {file_path}")
-        except CaskUnavailableError as e:
-            mark_app_deprecated(apps_folder, e.display_name, e.reason, e.cask_token)
-        except Exception as e:
-            print(f"Error processing {url}: {str(e)}")
-
-    # Process pkg_in_pkg apps
-    for url in pkg_in_pkg_urls:
-        try:
-            print(f"\nProcessing PKG in PKG app URL: {url}")
-            app_info = get_homebrew_app_info(url, is_pkg_in_pkg=True)
-            display_name = app_info['name']
-            supported_apps.append(display_name)
-            file_name = f"{sanitize_filename(display_name)}.json"
-            file_path = os.path.join(apps_folder, file_name)
-
-            if not claim_app_file(file_path, app_info.get("homebrew_cask")):
-                continue
-
-            # For existing files, only update version, url and previous_version
-            if os.path.exists(file_path):
-                with open(file_path, "r") as f:
-                    existing_data = json.load(f)
-                    # Store the new version, url and previous_version
-                    new_version = app_info["version"]
-                    new_url = app_info["url"]
-                    previous_version = existing_data.get("version")
-                    
-                    # Preserve all existing data except version, url and previous_version.
-                    # type, homebrew_cask and vendor_url are owned by the list being
-                    # processed, so the fresh "pkg_in_pkg" values win over whatever is on disk.
-                    for key in existing_data:
-                        if key not in ["version", "url", "previous_version", "deprecated", "deprecation_reason",
-                                       "type", "homebrew_cask", "vendor_url"]:
-                            app_info[key] = existing_data[key]
-                    
-                    # Update version, url and previous_version
-                    app_info["version"] = new_version
-                    app_info["url"] = new_url
-                    
-                    # Handle fileName field
-                    if display_name.lower().replace(" ", "_") in preserve_filename_apps:
-                        # For apps in the exclusion list, preserve the existing fileName
-                        print(f"⚠️ Preserving custom fileName for {display_name}")
-                    else:
-                        # For all other apps, update fileName to match the URL
-                        app_info["fileName"] = get_filename_from_url(new_url, app_name=display_name, version=new_version)
-                    # Ensure fileName is preserved
-                    app_info["previous_version"] = previous_version
-
-            with open(file_path, "w") as f:
-                json.dump(app_info, f, indent=2)
-
-            apps_info.append(app_info)
-            print(f"Saved app information for {display_name} to {file_path}")
-        except CaskUnavailableError as e:
-            mark_app_deprecated(apps_folder, e.display_name, e.reason, e.cask_token)
-        except Exception as e:
-            print(f"Error processing PKG in PKG app {url}: {str(e)}")
-
-    # Process direct pkg apps
-    for url in pkg_urls:
-        try:
-            print(f"\nProcessing direct PKG app URL: {url}")
-            app_info = get_homebrew_app_info(url, is_pkg=True)
-            display_name = app_info['name']
-            supported_apps.append(display_name)
-            file_name = f"{sanitize_filename(display_name)}.json"
-            file_path = os.path.join(apps_folder, file_name)
-
-            if not claim_app_file(file_path, app_info.get("homebrew_cask")):
-                continue
+    unchanged_urls = []
 
-            # Check if we need to calculate hash for PKG apps
-            needs_hash = True
-            if os.path.exists(file_path):
-                with open(file_path, "r") as f:
-                    existing_data = json.load(f)
-                    # Reuse the stored hash only while both the version and the
-                    # download URL are unchanged, so build-only bumps behind an
-                    # equal version string still refresh the hash.
-                    if ("sha" in existing_data and
-                        existing_data.get("version") == app_info["version"] and
-                        existing_data.get("url") == app_info["url"]):
-                        needs_hash = False
-                        app_info["sha"] = existing_data["sha"]
-                        print(f"ℹ️ Using existing hash for {display_name}")
-
-            if needs_hash:
-                print(f"🔍 Calculating SHA256 hash for {display_name}...")
-                file_hash = calculate_file_hash(app_info["url"])
-                if file_hash:
-                    app_info["sha"] = file_hash
-                    print(f"✅ SHA256 hash calculated: {file_hash}")
-                else:
-                    print(f"⚠️ Could not calculate SHA256 hash for {display_name}")
-
-            # For existing files, preserve existing data and update necessary fields
-            if os.path.exists(file_path):
-                with open(file_path, "r") as f:
-                    existing_data = json.load(f)
-                    # Store the new version, url, sha and previous_version
-                    new_version = app_info["version"]
-                    new_url = app_info["url"]
-                    new_sha = app_info.get("sha")
-                    previous_version = existing_data.get("version")
-                    
-                    # Preserve all existing data except version, url, sha and previous_version.
-                    # type, homebrew_cask and vendor_url are owned by the list being
-                    # processed, so the fresh "pkg" values win over whatever is on disk.
-                    for key in existing_data:
-                        if key not in ["version", "url", "sha", "previous_version", "deprecated", "deprecation_reason",
-                                       "type", "homebrew_cask", "vendor_url"]:
-                            app_info[key] = existing_data[key]
-                    
-                    # Update version, url, sha and previous_version
-                    app_info["version"] = new_version
-                    app_info["url"] = new_url
-                    if new_sha:
-                        app_info["sha"] = new_sha
-                    
-                    # Handle fileName field
-                    if display_name.lower().replace(" ", "_") in preserve_filename_apps:
-                        # For apps in the exclusion list, preserve the existing fileName
-                        print(f"⚠️ Preserving custom fileName for {display_name}")
-                    else:
-                        # For all other apps, update fileName to match the URL. Direct PKG
-                        # apps default to .pkg so extensionless URLs are not mislabeled as
-                        # DMG, which broke Cloudflare WARP deployments (Issue #107)
-                        app_info["fileName"] = get_filename_from_url(new_url, app_name=display_name, version=new_version, default_ext=".pkg")
-                    app_info["previous_version"] = previous_version
-
-            with open(file_path, "w") as f:
-                json.dump(app_info, f, indent=2)
-
-            apps_info.append(app_info)
-            print(f"Saved app information for {display_name} to {file_path}")
-        except CaskUnavailableError as e:
-            mark_app_deprecated(apps_folder, e.display_name, e.reason, e.cask_token)
-        except Exception as e:
-            print(f"Error processing direct PKG app {url}: {str(e)}")
-
-    # Process pkg_in_dmg apps
-    for url in pkg_in_dmg_urls:
-        try:
-            print(f"\nProcessing PKG in DMG app URL: {url}")
-            app_info = get_homebrew_app_info(url, is_pkg_in_dmg=True)
-            display_name = app_info['name']
-            supported_apps.append(display_name)
-            file_name = f"{sanitize_filename(display_name)}.json"
-            file_path = os.path.join(apps_folder, file_name)
-
-            if not claim_app_file(file_path, app_info.get("homebrew_cask")):
-                continue
-
-            # For existing files, only update version, url and previous_version
-            if os.path.exists(file_path):
-                with open(file_path, "r") as f:
-                    existing_data = json.load(f)
-                    # Store the new version, url and previous_version
-                    new_version = app_info["version"]
-                    new_url = app_info["url"]
-                    previous_version = existing_data.get("version")
-                    
-                    # Preserve all existing data except version, url and previous_version.
-                    # type, homebrew_cask and vendor_url are owned by the list being
-                    # processed, so the fresh "pkg_in_dmg" values win over whatever is on disk.
-                    for key in existing_data:
-                        if key not in ["version", "url", "previous_version", "deprecated", "deprecation_reason",
-                                       "type", "homebrew_cask", "vendor_url"]:
-                            app_info[key] = existing_data[key]
-                    
-                    # Update version, url and previous_version
-                    app_info["version"] = new_version
-                    app_info["url"] = new_url
-                    
-                    # Handle fileName field
-                    if display_name.lower().replace(" ", "_") in preserve_filename_apps:
-                        # For apps in the exclusion list, preserve the existing fileName
-                        print(f"⚠️ Preserving custom fileName for {display_name}")
-                    else:
-                        # For all other apps, update fileName to match the URL
-                        app_info["fileName"] = get_filename_from_url(new_url, app_name=display_name, version=new_version)
-                    app_info["previous_version"] = previous_version
-
-            with open(file_path, "w") as f:
-                json.dump(app_info, f, indent=2)
-
-            apps_info.append(app_info)
-            print(f"Saved app information for {display_name} to {file_path}")
-        except CaskUnavailableError as e:
-            mark_app_deprecated(apps_folder, e.display_name, e.reason, e.cask_token)
-        except Exception as e:
-            print(f"Error processing PKG in DMG app {url}: {str(e)}")
-
-    # Run custom scrapers and update apps_info accordingly
-    for scraper in custom_scrapers:
-        try:
-            subprocess.run([scraper], check=True)
-            # Get the app name from the JSON file created by the scraper
-            json_file = os.path.join(apps_folder, os.path.basename(scraper).replace('.sh', '.json'))
-            if os.path.exists(json_file):
-                with open(json_file, 'r') as f:
-                    app_data = json.load(f)
-                    supported_apps.append(app_data['name'])
-        except Exception as e:
-            print(f"Error running scraper {scraper}: {str(e)}")
+    def unchanged_app(list_name, url):
+        if args.full:
+            return None
+        existing_data = find_unchanged_app(apps_folder, list_name, url)
+        if existing_data is not None:
+            unchanged_urls.append(url)
+        return existing_data
+
+    process_catalog(apps_folder, supported_apps, apps_info, unchanged_app)
+
+    cask_stream.join()
+
+    # Custom scrapers ran alongside the list passes; their hashes share the pool.
+    print("\n📊 Collecting custom scraper outputs...")
+    finish_scrapers(scraper_executor, scraper_runs, apps_folder, supported_apps)
+    hash_pool.close()
+    # Every download is done; nothing should hold a socket to a vendor from here.
+    download_client.close()
+    total_apps = sum(len(urls) for _, urls, _ in catalog_lists())
+    print(
+        f"\nVersion check: {total_apps - len(unchanged_urls)} apps changed or need attention, "
+        f"{len(unchanged_urls)} unchanged and skipped"
+    )
 
-    # After custom scrapers run, calculate hashes for direct downloads
-    print("\n📊 Checking custom scraper outputs for missing hashes...")
-    for scraper in custom_scrapers:
-        json_file = os.path.join(apps_folder, os.path.basename(scraper).replace('.sh', '.json'))
-        if os.path.exists(json_file):
-            with open(json_file, 'r') as f:
-                app_data = json.load(f)
-            
-            # Check if it's a direct download (DMG/PKG) without a hash
-            if ('url' in app_data and 
-                'sha' not in app_data and 
-                (app_data['url'].endswith('.dmg') or app_data['url'].endswith('.pkg'))):
-                
-                print(f"🔍 Calculating SHA256 hash for {app_data['name']}...")
-                file_hash = calculate_file_hash(app_data['url'])
-                if file_hash:
-                    app_data['sha'] = file_hash
-                    # Write back the updated JSON
-                    with open(json_file, 'w') as f:
-                        json.dump(app_data, f, indent=2)
-                    print(f"✅ SHA256 hash added for {app_data['name']}: {file_hash}")
-                else:
-                    print(f"⚠️ Could not calculate SHA256 hash for {app_data['name']}")
+    agent_table.save()
+    content_ledger.save()
+    deferred_work.save()
+    if deferred_work.entries:
+        print(
+            f"\n⏰ Run deadline of {RUN_DEADLINE_SECONDS:.0f}s reached: "
+            f"{len(deferred_work.entries)} artifacts deferred to the next run"
+        )
+    report_hash_stats()
+    download_client.report()
+    print(app_catalog.summary())
 
     # Update the README with both the apps table and latest changes
-    update_readme_apps(supported_apps)
-    update_readme_with_latest_changes(apps_info)
+    with run_report.phase("readme"):
+        update_readme_apps(supported_apps)
+        update_readme_with_latest_changes(apps_info)
+
+    # The run got to the end, so the journal only needs what this run matched.
+    hash_journal.compact()
+    publish_run_report()
 
     # A collision is catalog corruption in the making and needs a human decision,
     # so the run must go red before anything is committed.
@@ -2379,4 +2954,4 @@ def main():
         sys.exit(1)
 
 if __name__ == "__main__":
-    main()
+    main(sys.argv[1:])
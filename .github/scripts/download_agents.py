@@ -0,0 +1,106 @@
+#!/usr/bin/env python3
+"""User agents for vendor downloads and the per-host table of which one works.
+
+Shared by collect_app_info.py, which downloads artifacts to hash them, and
+check_download_urls.py, which probes the same URLs for rot. Both present the
+same agents, so they look alike to a vendor allowlist, and both read and write
+the same table in COLLECTOR_CACHE_DIR, so a host one of them learned is tried
+with the right agent by the other.
+"""
+
+import json
+import os
+import threading
+import time
+from urllib.parse import urlparse
+
+# Different CDNs block different clients, so a single agent leaves apps
+# permanently unhashable: existential.audio answers 406 to the default
+# python-requests agent, douyin.com 444, frdic.com 429, mobirise/syncovery/
+# amarsagoo 403, and hopperapp.com serves only a browser agent. SourceForge
+# rejects browser agents from non-browser TLS stacks and Tableau's CDN only
+# allows curl-style ones. Try them in order and give up only when every
+# attempt fails.
+DOWNLOAD_USER_AGENTS = (
+    "IntuneBrew-URL-Health-Check/1.0",
+    "curl/8.4.0",
+    "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36 "
+    "(KHTML, like Gecko) Chrome/126.0 Safari/537.36",
+)
+
+# Hosts that reject the first agents (hopperapp.com, existential.audio,
+# mobirise) reject them on every run, so the agent that last worked for a host
+# is tried first next time.
+AGENT_TABLE_FILE = "download-agents.json"
+# An entry not confirmed for this long is dropped and its host starts from the
+# top of the list again, so a vendor that lifts a block is noticed.
+AGENT_TABLE_MAX_AGE_DAYS = 30
+
+
+class AgentTable:
+    """host -> the user agent that last got a usable answer, persisted across runs.
+
+    Only hosts where a later agent won are stored: for everything else the
+    default order already tries the winner first.
+    """
+
+    def __init__(self, max_age_days=AGENT_TABLE_MAX_AGE_DAYS):
+        self.max_age_days = max_age_days
+        self.path = None
+        self.hosts = {}
+        self._lock = threading.Lock()
+
+    def load(self, path):
+        self.path = path
+        self.hosts = {}
+        try:
+            with open(path, "r") as f:
+                hosts = json.load(f).get("hosts", {})
+        except (OSError, ValueError, AttributeError):
+            return
+        cutoff = time.time() - self.max_age_days * 86400
+        for host, entry in hosts.items():
+            if (
+                isinstance(entry, dict)
+                and isinstance(entry.get("agent"), str)
+                and isinstance(entry.get("seen"), (int, float))
+                and entry["seen"] >= cutoff
+            ):
+                self.hosts[host] = entry
+
+    def preferred(self, url):
+        """The agent that last worked for url's host, or None."""
+        with self._lock:
+            entry = self.hosts.get(urlparse(url).hostname or "")
+        return entry["agent"] if entry else None
+
+    def order(self, url, agents):
+        """agents with the host's last winner moved to the front."""
+        preferred = self.preferred(url)
+        if preferred not in agents:
+            return list(agents)
+        return [preferred] + [agent for agent in agents if agent != preferred]
+
+    def record(self, url, agent, default_agent):
+        """Remember agent as the winner for url's host."""
+        host = urlparse(url).hostname or ""
+        with self._lock:
+            if agent == default_agent:
+                self.hosts.pop(host, None)
+            else:
+                self.hosts[host] = {"agent": agent, "seen": int(time.time())}
+
+    def save(self):
+        if self.path is None:
+            return
+        with self._lock:
+            payload = {"version": 1, "hosts": dict(sorted(self.hosts.items()))}
+        try:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            temp_path = f"{self.path}.tmp"
+            with open(temp_path, "w") as f:
+                json.dump(payload, f, indent=2)
+            os.replace(temp_path, self.path)
+        except OSError as error:
+            # A lost table only costs the next run its failed first attempts.
+            print(f"Warning: could not save the user agent table to {self.path}: {error}")
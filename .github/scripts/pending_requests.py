@@ -1,7 +1,7 @@
 #!/usr/bin/env python3
 """Track app requests from approval until the app is actually live.
 
-An approved request is committed to collect_app_info.py within seconds, but the
+An approved request is committed to .github/catalog.jsonl within seconds, but the
 app is not downloadable until the build workflow has packaged it roughly twenty
 minutes later. Nothing connected those two events, so the requester had to poll
 the Actions tab to find out whether their app had landed.
@@ -0,0 +1,183 @@
+"""End-to-end benchmark of collect_app_info.main() against fake_brew_server.
+
+Builds a synthetic catalog on a local stand-in for formulae.brew.sh and the
+vendor CDNs, then runs the collector on it three times in one work directory:
+
+    cold    empty Apps folder and collector cache, like a fresh clone
+    warm    the same catalog again, like a night where nothing moved
+    bump    after a share of the casks released a new version
+
+and reports wall time, apps per second, requests by kind and bytes moved.
+
+    python tests/bench_collector.py --apps 200 --size 4194304 --latency 0.02
+    python tests/bench_collector.py --hash-mode download --throughput 52428800
+    python tests/bench_collector.py --faults 0.1 --json bench.json
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+from fake_brew_server import FakeBrewServer
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPTS = ROOT / ".github/scripts"
+LIST_NAMES = ("app_urls", "homebrew_cask_urls", "pkg_in_pkg_urls", "pkg_urls", "pkg_in_dmg_urls")
+# Artifact behaviours handed out, in turn, to the share of casks --faults selects.
+FAULTS = ("missing", "reject-default-agent", "rate-limited", "html", "no-length")
+
+
+def load_collector():
+    """A fresh copy of collect_app_info, loaded by path like the tests do."""
+    # Its sibling modules resolve as they do when the script runs directly.
+    if str(SCRIPTS) not in sys.path:
+        sys.path.insert(0, str(SCRIPTS))
+    spec = importlib.util.spec_from_file_location(
+        "collect_app_info", ROOT / ".github/scripts/collect_app_info.py"
+    )
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def build_catalog(server, apps, size, faults=0.0, pkg_share=0.2):
+    """Add apps casks to server. Returns list name -> cask urls, as main() reads them.
+
+    Every fifth cask is a direct PKG, the rest are plain casks. A faults share of
+    them gets a misbehaving artifact, cycling through FAULTS.
+    """
+    catalog = {name: [] for name in LIST_NAMES}
+    fault_every = int(round(1 / faults)) if faults else 0
+    pkg_every = int(round(1 / pkg_share)) if pkg_share else 0
+    for index in range(apps):
+        is_pkg = bool(pkg_every) and index % pkg_every == pkg_every - 1
+        behavior = "ok"
+        if fault_every and index % fault_every == 0:
+            behavior = FAULTS[(index // fault_every) % len(FAULTS)]
+        url = server.add_cask(
+            f"bench-app-{index:05d}",
+            size=size,
+            artifact_behavior=behavior,
+            extension="pkg" if is_pkg else "dmg",
+        )
+        catalog["pkg_urls" if is_pkg else "homebrew_cask_urls"].append(url)
+    return catalog
+
+
+def run_collector(collector, server, catalog, work_dir, argv=(), settings=None, update_readme=False):
+    """Run collector.main(argv) in work_dir against server. Returns its metrics.
+
+    The lists come from catalog and the cask index from server. The README
+    updaters are switched off so the repository's README is never touched;
+    update_readme keeps them, for a work_dir with its own README.md, which they
+    then find through a patched __file__. settings overrides module constants
+    such as HASH_MODE or CASK_SOURCE.
+    """
+    output = io.StringIO()
+    previous_dir = os.getcwd()
+    os.makedirs(os.path.join(work_dir, "Apps"), exist_ok=True)
+    server.reset_stats()
+    with contextlib.ExitStack() as stack:
+        for name in LIST_NAMES:
+            stack.enter_context(patch.object(collector, name, list(catalog.get(name, []))))
+        stack.enter_context(patch.object(collector, "custom_scrapers", []))
+        stack.enter_context(patch.object(collector, "CASK_INDEX_URL", server.index_url))
+        if update_readme:
+            script = os.path.join(os.path.abspath(work_dir), ".github", "scripts", "collect_app_info.py")
+            stack.enter_context(patch.object(collector, "__file__", script))
+        else:
+            stack.enter_context(patch.object(collector, "update_readme_apps", lambda *args: None))
+            stack.enter_context(
+                patch.object(collector, "update_readme_with_latest_changes", lambda *args: None)
+            )
+        for name, value in (settings or {}).items():
+            stack.enter_context(patch.object(collector, name, value))
+        stack.enter_context(contextlib.redirect_stdout(output))
+        os.chdir(work_dir)
+        started = time.monotonic()
+        try:
+            collector.main(list(argv))
+        finally:
+            seconds = time.monotonic() - started
+            os.chdir(previous_dir)
+
+    report_path = Path(work_dir) / ".collector-cache" / "run-report.json"
+    report = json.loads(report_path.read_text(encoding="utf-8")) if report_path.exists() else {}
+    return {
+        "seconds": seconds,
+        "server": dict(server.stats),
+        "report": report,
+        "log": output.getvalue(),
+    }
+
+
+def summarize(label, apps, metrics):
+    server = metrics["server"]
+    seconds = max(metrics["seconds"], 1e-9)
+    mib = server["bytes_sent"] / (1024 * 1024)
+    return (
+        f"{label:<6} {metrics['seconds']:8.2f}s {apps / seconds:9.1f} apps/s "
+        f"{server['requests']:6d} req (cask {server['cask_requests']}, index {server['index_requests']}, "
+        f"GET {server['artifact_gets']}, HEAD {server['artifact_heads']}, range {server['range_requests']}, "
+        f"304 {server['not_modified']}) {mib:9.1f} MiB {mib / seconds:8.1f} MiB/s"
+    )
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--apps", type=int, default=100, help="casks in the synthetic catalog")
+    parser.add_argument("--size", type=int, default=1024 * 1024, help="artifact size in bytes")
+    parser.add_argument("--latency", type=float, default=0.0, help="seconds added to every response")
+    parser.add_argument("--throughput", type=int, default=0, help="bytes per second per artifact response, 0 for no cap")
+    parser.add_argument("--faults", type=float, default=0.0, help="share of artifacts that misbehave")
+    parser.add_argument("--bump", type=float, default=0.1, help="share of casks that release a new version before the last run")
+    parser.add_argument("--hash-mode", choices=("trust", "download"), default="trust")
+    parser.add_argument("--cask-source", choices=("index", "per-cask"), default="index")
+    parser.add_argument("--workers", type=int, default=None, help="hash workers, defaults to COLLECTOR_HASH_WORKERS")
+    parser.add_argument("--json", help="also write every run's metrics to this file")
+    args = parser.parse_args(argv)
+
+    collector = load_collector()
+    settings = {
+        "HASH_MODE": args.hash_mode,
+        "CASK_SOURCE": args.cask_source,
+        # Random audits would make request counts differ between identical runs.
+        "HASH_AUDIT_RATE": 0.0,
+    }
+    if args.workers:
+        settings["HASH_WORKERS"] = args.workers
+
+    results = {}
+    with FakeBrewServer(latency=args.latency, throughput=args.throughput) as server:
+        catalog = build_catalog(server, args.apps, args.size, faults=args.faults)
+        with tempfile.TemporaryDirectory() as work_dir:
+            for label in ("cold", "warm", "bump"):
+                if label == "bump":
+                    bump_every = int(round(1 / args.bump)) if args.bump else 0
+                    for index, token in enumerate(sorted(server.casks)):
+                        if bump_every and index % bump_every == 0:
+                            server.bump(token, "2.0.0")
+                results[label] = run_collector(collector, server, catalog, work_dir, settings=settings)
+                print(summarize(label, args.apps, results[label]))
+
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump(
+                {label: {key: value for key, value in metrics.items() if key != "log"} for label, metrics in results.items()},
+                f,
+                indent=2,
+            )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,285 @@
+"""Scaling benchmark of the catalog scripts on synthetic Apps/, Logos/ and CVE/ trees.
+
+Generates a repository-shaped tree per catalog size, times the functions that
+walk the catalog and prints one row per function with its growth exponent
+between the two largest sizes: 1.0 means time grows with the catalog, 2.0
+means it grows with its square. Every benchmark declares the exponent it is
+expected to have; a row growing clearly faster is flagged, and the run exits 1,
+so a per-app directory scan is caught long before the real catalog gets there.
+
+Lookups are timed as the scripts make them, and every catalog walk is expected
+to be linear. The collector resolves every app once per run, so its indexed
+lookup is timed over a whole pass. check_cask_tokens looks up one vanished cask
+per LOOKUP_EVERY apps, since their number grows with the catalog. A scan-based
+lookup the scripts make once per run (reclassifying one app, or find_app_file
+without the index) is timed once. A benchmark whose optional dependencies are
+missing is still listed, as skipped.
+
+    python tests/bench_scaling.py
+    python tests/bench_scaling.py --sizes 1000,5000 --repeat 1 --json scaling.json
+"""
+
+import argparse
+import contextlib
+import importlib.util
+import io
+import json
+import math
+import os
+import shutil
+import sys
+import tempfile
+import time
+from pathlib import Path
+from unittest.mock import patch
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPTS = ROOT / ".github/scripts"
+# Apps per vanished cask in the check_cask_tokens benchmark.
+LOOKUP_EVERY = 1000
+# Allowed excess over a benchmark's expected exponent before it is flagged.
+TOLERANCE = 0.35
+# Both timings below this many seconds are dominated by noise, not growth.
+NOISE_SECONDS = 0.002
+
+
+def load_script(name):
+    # Its sibling modules resolve as they do when the script runs directly.
+    if str(SCRIPTS) not in sys.path:
+        sys.path.insert(0, str(SCRIPTS))
+    spec = importlib.util.spec_from_file_location(name, SCRIPTS / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_optional_script(name):
+    """The script, or None when its optional dependencies are not installed."""
+    try:
+        with contextlib.redirect_stdout(io.StringIO()):
+            return load_script(name)
+    except (ImportError, SystemExit):
+        return None
+
+
+def lookup_count(size):
+    """Vanished casks looked up for a catalog of size apps."""
+    return max(1, size // LOOKUP_EVERY)
+
+
+def app_record(index):
+    token = f"bench-app-{index:05d}"
+    return {
+        "name": f"Bench App {index:05d}",
+        "description": "Synthetic catalog entry",
+        "version": f"{index % 7}.{index % 13}.0",
+        "previous_version": f"{index % 7}.{index % 13}.0-beta",
+        "url": f"https://example.com/{token}.dmg",
+        "vendor_url": f"https://example.com/{token}.dmg",
+        "bundleId": f"com.example.{token}",
+        "homepage": f"https://example.com/{token}",
+        "homebrew_cask": token,
+        "fileName": f"{token}.dmg",
+        "sha": "0" * 64,
+        "type": "app" if index % 5 == 0 else None,
+    }
+
+
+def build_tree(root, size):
+    """A repository-shaped tree with size apps, logos for 90% of them and CVE
+    files for every tenth. Every app keeps a renamed cask token, so resolving
+    it by token cannot shortcut through the file name."""
+    apps = root / "Apps"
+    logos = root / "Logos"
+    cves = root / "CVE"
+    for folder in (apps, logos, cves, root / ".github/scripts"):
+        folder.mkdir(parents=True)
+    shutil.copy(ROOT / "README.md", root / "README.md")
+    for index in range(size):
+        record = {key: value for key, value in app_record(index).items() if value is not None}
+        record["homebrew_cask"] = f"renamed-cask-{index:05d}"
+        stem = f"bench_app_{index:05d}"
+        (apps / f"{stem}.json").write_text(json.dumps(record, indent=2) + "\n", encoding="utf-8")
+        if index % 10:
+            (logos / f"{stem}.png").write_bytes(b"\x89PNG")
+        else:
+            (cves / f"{stem}.json").write_text(
+                json.dumps(
+                    {
+                        "app_name": record["name"],
+                        "app_key": stem,
+                        "summary": {"critical": 0, "high": 1, "medium": 1, "low": 0},
+                        "vulnerabilities": [
+                            {"cve_id": f"CVE-2024-{index:05d}", "severity": "HIGH", "base_score": 7.5},
+                            {"cve_id": f"CVE-2025-{index:05d}", "severity": "MEDIUM", "base_score": 5.0},
+                        ],
+                    }
+                ),
+                encoding="utf-8",
+            )
+
+
+def benchmarks(size):
+    """(name, expected exponent, call) for one catalog of size apps. Calls run
+    with the tree's root as working directory; call is None for a skipped one."""
+    collector = load_script("collect_app_info")
+    tokens = load_script("check_cask_tokens")
+    reclassify = load_script("reclassify_app")
+    cve_sync = load_optional_script("sync_cves_to_supabase")
+
+    every_token = [f"renamed-cask-{index:05d}" for index in range(size)]
+    renamed = every_token[-1]
+    missing = [f"gone-cask-{index}" for index in range(lookup_count(size))] + every_token[:1]
+    changed = [{"name": f"Bench App {index:05d}"} for index in range(0, size, 10)]
+
+    def loaded_catalog():
+        catalog = collector.CatalogIndex()
+        catalog.load("Apps")
+        return catalog
+
+    def find_indexed():
+        with patch.object(collector, "app_catalog", loaded_catalog()):
+            for token in every_token:
+                collector.find_app_file("Apps", cask_token=token)
+
+    def readme_apps():
+        with patch.object(collector, "app_catalog", loaded_catalog()):
+            collector.update_readme_apps([])
+
+    def readme_changes():
+        with patch.object(collector, "app_catalog", loaded_catalog()):
+            collector.update_readme_with_latest_changes(changed)
+
+    rows = [
+        ("collect_app_info.CatalogIndex.load", 1.0, loaded_catalog),
+        ("collect_app_info.find_app_file, every app (indexed, incl. load)", 1.0, find_indexed),
+        (
+            "collect_app_info.find_app_file, one lookup (no index)",
+            1.0,
+            lambda: collector.find_app_file("Apps", cask_token=renamed),
+        ),
+        ("collect_app_info.build_logo_index", 1.0, lambda: collector.build_logo_index("Logos")),
+        ("collect_app_info.update_readme_apps", 1.0, readme_apps),
+        ("collect_app_info.update_readme_with_latest_changes", 1.0, readme_changes),
+        (
+            f"check_cask_tokens.affected_apps, 1 missing per {LOOKUP_EVERY:,} apps",
+            1.0,
+            lambda: tokens.affected_apps(missing),
+        ),
+        (
+            "reclassify_app.update_app_type, one app",
+            1.0,
+            lambda: reclassify.update_app_type(renamed, "dmg"),
+        ),
+    ]
+    # Without supabase-py the rows stay in the table, marked skipped, rather
+    # than vanish from it.
+    rows += [
+        (
+            "sync_cves_to_supabase.load_app_versions",
+            1.0,
+            None if cve_sync is None else lambda: cve_sync.load_app_versions("Apps"),
+        ),
+        (
+            "sync_cves_to_supabase.load_cve_files",
+            1.0,
+            None if cve_sync is None else lambda: cve_sync.load_cve_files("CVE"),
+        ),
+    ]
+    return collector, rows
+
+
+def measure(sizes, repeat):
+    """name -> {"expected": exponent, "seconds": {size: best of repeat, or None
+    when skipped}}."""
+    results = {}
+    previous_dir = os.getcwd()
+    for size in sizes:
+        with tempfile.TemporaryDirectory() as directory:
+            root = Path(directory)
+            started = time.perf_counter()
+            build_tree(root, size)
+            print(f"Built a {size}-app tree in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+            collector, rows = benchmarks(size)
+            os.chdir(root)
+            try:
+                # The README helpers resolve the repository from the script path.
+                with patch.object(collector, "__file__", str(root / ".github/scripts/collect_app_info.py")):
+                    for name, expected, call in rows:
+                        best = None
+                        for _ in range(repeat if call is not None else 0):
+                            shutil.copy(ROOT / "README.md", root / "README.md")
+                            with contextlib.redirect_stdout(io.StringIO()):
+                                started = time.perf_counter()
+                                call()
+                                seconds = time.perf_counter() - started
+                            best = seconds if best is None else min(best, seconds)
+                        entry = results.setdefault(name, {"expected": expected, "seconds": {}})
+                        entry["seconds"][size] = best
+            finally:
+                os.chdir(previous_dir)
+    return results
+
+
+def growth(entry, sizes):
+    """Exponent between the two largest sizes, or None when both are noise or
+    the benchmark was skipped."""
+    if len(sizes) < 2:
+        return None
+    small, large = sizes[-2], sizes[-1]
+    before, after = entry["seconds"][small], entry["seconds"][large]
+    if before is None or after is None or max(before, after) < NOISE_SECONDS or before <= 0:
+        return None
+    return math.log(after / before) / math.log(large / small)
+
+
+def scaling_table(results, sizes):
+    """Markdown table of the results and the names of the flagged benchmarks."""
+    header = "| Benchmark | " + " | ".join(f"{size:,} apps" for size in sizes) + " | Exponent | Expected | Verdict |"
+    lines = [header, "| --- |" + " ---: |" * len(sizes) + " ---: | ---: | --- |"]
+    flagged = []
+    for name, entry in results.items():
+        exponent = growth(entry, sizes)
+        if None in entry["seconds"].values():
+            verdict, shown = "skipped (optional dependency missing)", "n/a"
+        elif exponent is None:
+            verdict, shown = "noise", "n/a"
+        else:
+            shown = f"{exponent:.2f}"
+            verdict = "ok"
+            if exponent > entry["expected"] + TOLERANCE:
+                verdict = "SUPER-LINEAR" if entry["expected"] >= 1 else "GROWS"
+                flagged.append(name)
+        cells = " | ".join(
+            "skipped" if entry["seconds"][size] is None else f"{entry['seconds'][size] * 1000:.1f} ms"
+            for size in sizes
+        )
+        lines.append(f"| {name} | {cells} | {shown} | {entry['expected']:.1f} | {verdict} |")
+    return "\n".join(lines), flagged
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--sizes", default="1000,10000,50000", help="comma separated catalog sizes")
+    parser.add_argument("--repeat", type=int, default=3, help="runs per measurement, the fastest counts")
+    parser.add_argument("--json", help="also write the raw timings to this file")
+    args = parser.parse_args(argv)
+
+    sizes = sorted(int(size) for size in args.sizes.split(","))
+    if sizes[0] < 1:
+        parser.error("every size must be at least 1 app")
+    results = measure(sizes, max(args.repeat, 1))
+    table, flagged = scaling_table(results, sizes)
+    print(table)
+    if args.json:
+        with open(args.json, "w") as f:
+            json.dump({"sizes": sizes, "results": results}, f, indent=2)
+    if flagged:
+        print(f"\nGrowing faster than expected: {', '.join(flagged)}", file=sys.stderr)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,300 @@
+"""Local stand-in for formulae.brew.sh and the vendor CDNs behind its casks.
+
+Serves synthetic cask documents, the cask index and artifact bodies of any size
+over real HTTP, so collect_app_info.py can run end to end without the network.
+Used by the end-to-end tests and by bench_collector.py.
+
+Artifact behaviours mirror what the collector meets in the wild:
+
+    ok                    binary body with Content-Length, ETag and Range support
+    missing               404
+    reject-default-agent  406 for the first DOWNLOAD_USER_AGENTS entry (existential.audio)
+    rate-limited          429 for every request
+    html                  an HTML page served as the binary
+    no-length             body without Content-Length; Range still reveals the size
+"""
+
+import hashlib
+import http.server
+import json
+import threading
+import time
+from urllib.parse import urlparse
+
+
+ARTIFACT_BEHAVIORS = ("ok", "missing", "reject-default-agent", "rate-limited", "html", "no-length")
+CASK_BEHAVIORS = ("ok", "removed", "deprecated")
+# Bodies are streamed in blocks of this size, so a multi-GB artifact never sits in memory.
+BLOCK_BYTES = 64 * 1024
+HTML_PAGE = b"<!DOCTYPE html><html><body>Please enable JavaScript</body></html>"
+# The collector's first agent, refused by "reject-default-agent" artifacts.
+DEFAULT_AGENT_PREFIX = "IntuneBrew-URL-Health-Check/"
+LAST_MODIFIED = "Mon, 01 Jan 2024 00:00:00 GMT"
+
+
+class FakeArtifact:
+    """A deterministic body of size bytes, generated on the fly from its name."""
+
+    def __init__(self, name, size, behavior="ok"):
+        if behavior not in ARTIFACT_BEHAVIORS:
+            raise ValueError(f"unknown artifact behaviour: {behavior}")
+        self.name = name
+        self.size = size
+        self.behavior = behavior
+        self._block = hashlib.sha256(name.encode("utf-8")).digest() * (BLOCK_BYTES // 32)
+        self._sha256 = None
+
+    def blocks(self, limit=None):
+        remaining = self.size if limit is None else min(limit, self.size)
+        while remaining > 0:
+            block = self._block[:remaining]
+            remaining -= len(block)
+            yield block
+
+    @property
+    def sha256(self):
+        if self._sha256 is None:
+            digest = hashlib.sha256()
+            for block in self.blocks():
+                digest.update(block)
+            self._sha256 = digest.hexdigest()
+        return self._sha256
+
+    @property
+    def etag(self):
+        return f'"{self.sha256[:16]}"'
+
+
+class FakeBrewServer:
+    """formulae.brew.sh and a vendor CDN on one local port.
+
+    latency delays every response by that many seconds; throughput caps each
+    artifact response at that many bytes per second (0 for no cap). stats counts
+    requests per kind and bytes sent, for the benchmark report and the budget
+    tests.
+    """
+
+    def __init__(self, latency=0.0, throughput=0):
+        self.latency = latency
+        self.throughput = throughput
+        self.casks = {}
+        self.artifacts = {}
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+        self.reset_stats()
+
+    # Catalog -----------------------------------------------------------------
+
+    def add_cask(
+        self,
+        token,
+        version="1.0.0",
+        size=1024,
+        behavior="ok",
+        artifact_behavior="ok",
+        extension="dmg",
+        publish_sha=True,
+    ):
+        """Add one cask and its artifact. Returns the cask's API url."""
+        if behavior not in CASK_BEHAVIORS:
+            raise ValueError(f"unknown cask behaviour: {behavior}")
+        artifact = FakeArtifact(f"{token}-{version}.{extension}", size, artifact_behavior)
+        self.artifacts[artifact.name] = artifact
+        document = {
+            "token": token,
+            "name": [token.replace("-", " ").title()],
+            "desc": f"Synthetic cask {token}",
+            "homepage": f"https://example.com/{token}",
+            "version": version,
+            "url": self.artifact_url(artifact.name),
+            "sha256": artifact.sha256 if publish_sha else "no_check",
+            "artifacts": [{"uninstall": [{"quit": f"com.example.{token.replace('-', '')}"}]}],
+        }
+        if behavior == "deprecated":
+            document["deprecated"] = True
+            document["deprecation_reason"] = "discontinued"
+        self.casks[token] = {"document": document, "behavior": behavior}
+        return self.cask_url(token)
+
+    def bump(self, token, version):
+        """Release a new version of token: new artifact, new document."""
+        entry = self.casks[token]
+        old = self.artifacts[urlparse(entry["document"]["url"]).path.rsplit("/", 1)[1]]
+        extension = old.name.rsplit(".", 1)[1]
+        self.add_cask(
+            token,
+            version=version,
+            size=old.size,
+            behavior=entry["behavior"],
+            artifact_behavior=old.behavior,
+            extension=extension,
+            publish_sha=entry["document"]["sha256"] != "no_check",
+        )
+
+    # Urls --------------------------------------------------------------------
+
+    @property
+    def base_url(self):
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    @property
+    def index_url(self):
+        return f"{self.base_url}/api/cask.json"
+
+    def cask_url(self, token):
+        return f"{self.base_url}/api/cask/{token}.json"
+
+    def artifact_url(self, name):
+        return f"{self.base_url}/downloads/{name}"
+
+    # Lifecycle ---------------------------------------------------------------
+
+    def start(self):
+        self._server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+        self._server.daemon_threads = True
+        self._server.fake = self
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        if self._server is not None:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
+
+    # Stats -------------------------------------------------------------------
+
+    def reset_stats(self):
+        with self._lock:
+            self.stats = {
+                "requests": 0,
+                "cask_requests": 0,
+                "index_requests": 0,
+                "artifact_gets": 0,
+                "artifact_heads": 0,
+                "range_requests": 0,
+                "not_modified": 0,
+                "bytes_sent": 0,
+            }
+
+    def count(self, key, amount=1):
+        with self._lock:
+            self.stats[key] += amount
+
+
+class _Handler(http.server.BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    @property
+    def fake(self):
+        return self.server.fake
+
+    def do_GET(self):
+        self.route(head=False)
+
+    def do_HEAD(self):
+        self.route(head=True)
+
+    def route(self, head):
+        self.fake.count("requests")
+        if self.fake.latency:
+            time.sleep(self.fake.latency)
+        path = urlparse(self.path).path
+        if path == "/api/cask.json":
+            self.fake.count("index_requests")
+            documents = [
+                entry["document"]
+                for entry in self.fake.casks.values()
+                if entry["behavior"] != "removed"
+            ]
+            self.send_json(documents, head)
+        elif path.startswith("/api/cask/") and path.endswith(".json"):
+            self.fake.count("cask_requests")
+            entry = self.fake.casks.get(path[len("/api/cask/"):-len(".json")])
+            if entry is None or entry["behavior"] == "removed":
+                self.send_bytes(404, b"", head=head)
+            else:
+                self.send_json(entry["document"], head)
+        elif path.startswith("/downloads/"):
+            artifact = self.fake.artifacts.get(path[len("/downloads/"):])
+            self.send_artifact(artifact, head)
+        else:
+            self.send_bytes(404, b"", head=head)
+
+    def send_json(self, payload, head):
+        body = json.dumps(payload).encode("utf-8")
+        etag = f'"{hashlib.sha256(body).hexdigest()[:16]}"'
+        if self.headers.get("If-None-Match") == etag:
+            self.fake.count("not_modified")
+            self.send_bytes(304, b"", head=True, headers={"ETag": etag})
+            return
+        self.send_bytes(200, body, head=head, headers={"Content-Type": "application/json", "ETag": etag})
+
+    def send_artifact(self, artifact, head):
+        self.fake.count("artifact_heads" if head else "artifact_gets")
+        behavior = artifact.behavior if artifact is not None else "missing"
+        agent = self.headers.get("User-Agent", "")
+        if behavior == "missing":
+            self.send_bytes(404, b"", head=head)
+            return
+        if behavior == "rate-limited":
+            self.send_bytes(429, b"", head=head, headers={"Retry-After": "60"})
+            return
+        if behavior == "reject-default-agent" and agent.startswith(DEFAULT_AGENT_PREFIX):
+            self.send_bytes(406, b"", head=head)
+            return
+        if behavior == "html":
+            self.send_bytes(200, HTML_PAGE, head=head, headers={"Content-Type": "text/html"})
+            return
+
+        headers = {
+            "Content-Type": "application/octet-stream",
+            "ETag": artifact.etag,
+            "Last-Modified": LAST_MODIFIED,
+            "Accept-Ranges": "bytes",
+        }
+        if self.headers.get("Range") == "bytes=0-0" and artifact.size:
+            self.fake.count("range_requests")
+            headers["Content-Range"] = f"bytes 0-0/{artifact.size}"
+            self.send_stream(206, artifact.blocks(limit=1), 1, head, headers)
+            return
+        length = None if behavior == "no-length" else artifact.size
+        self.send_stream(200, artifact.blocks(), length, head, headers)
+
+    def send_bytes(self, status, body, head=False, headers=None):
+        self.send_stream(status, [body] if body else [], len(body), head, headers or {})
+
+    def send_stream(self, status, blocks, length, head, headers):
+        self.send_response(status)
+        for name, value in headers.items():
+            self.send_header(name, value)
+        if length is None:
+            # No length to announce: the body ends when the connection does.
+            self.send_header("Connection", "close")
+            self.close_connection = True
+        else:
+            self.send_header("Content-Length", str(length))
+        self.end_headers()
+        if head:
+            return
+        throughput = self.fake.throughput
+        try:
+            for block in blocks:
+                if throughput:
+                    time.sleep(len(block) / throughput)
+                self.wfile.write(block)
+                self.fake.count("bytes_sent", len(block))
+        except (BrokenPipeError, ConnectionResetError):
+            self.close_connection = True
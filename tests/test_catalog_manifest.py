@@ -0,0 +1,188 @@
+import contextlib
+import importlib.util
+import io
+import json
+import os
+import sys
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+
+ROOT = Path(__file__).resolve().parents[1]
+SCRIPTS = ROOT / ".github/scripts"
+# The scripts import catalog_manifest as a sibling, as they do when run directly.
+sys.path.insert(0, str(SCRIPTS))
+
+
+def load_script(name):
+    spec = importlib.util.spec_from_file_location(name, SCRIPTS / f"{name}.py")
+    module = importlib.util.module_from_spec(spec)
+    spec.loader.exec_module(module)
+    return module
+
+
+catalog_manifest = load_script("catalog_manifest")
+reclassify_app = load_script("reclassify_app")
+add_new_app = load_script("add_new_app")
+check_cask_tokens = load_script("check_cask_tokens")
+
+RECORDS = (
+    '{"cask": "signal", "type": "app"}\n'
+    '{"formula": "vim", "type": "app"}\n'
+    '{"cask": "firefox", "type": "dmg"}\n'
+    '{"cask": "mist", "type": "pkg", "note": "Ships a flat PKG"}\n'
+    '{"cask": "medis", "type": "app"}\n'
+)
+
+
+@contextlib.contextmanager
+def catalog_checkout(records=RECORDS):
+    """A scratch checkout holding .github/catalog.jsonl and Apps/, as cwd."""
+    previous_dir = os.getcwd()
+    with tempfile.TemporaryDirectory() as directory:
+        os.makedirs(os.path.join(directory, ".github"))
+        os.makedirs(os.path.join(directory, "Apps"))
+        Path(directory, ".github", "catalog.jsonl").write_text(records, encoding="utf-8")
+        os.chdir(directory)
+        try:
+            yield Path(directory)
+        finally:
+            os.chdir(previous_dir)
+
+
+class CatalogManifestTests(unittest.TestCase):
+    def load(self, records=RECORDS):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "catalog.jsonl")
+            Path(path).write_text(records, encoding="utf-8")
+            return catalog_manifest.CatalogManifest().load(path)
+
+    def test_lists_keep_catalog_order_and_formula_urls(self):
+        catalog = self.load()
+
+        self.assertEqual(
+            catalog.urls("app_urls"),
+            [
+                "https://formulae.brew.sh/api/cask/signal.json",
+                "https://formulae.brew.sh/api/formula/vim.json",
+                "https://formulae.brew.sh/api/cask/medis.json",
+            ],
+        )
+        self.assertEqual(catalog.urls("pkg_in_pkg_urls"), [])
+        self.assertEqual(catalog.tokens(), ["signal", "firefox", "mist", "medis"])
+        self.assertEqual(catalog.list_name("mist"), "pkg_urls")
+        self.assertIsNone(catalog.list_name("vim"))
+        self.assertIn("firefox", catalog)
+        self.assertNotIn("vim", catalog)
+
+    def test_malformed_or_duplicate_records_name_their_line(self):
+        for records, message in (
+            (RECORDS + '{"cask": "signal", "type": "dmg"}\n', ":6: cask signal is listed twice"),
+            (RECORDS + '{"cask": "zoom", "type": "zip"}\n', ":6: unknown type 'zip'"),
+            ('{"type": "app"}\n', ":1: record needs one of cask, formula"),
+            ('{"cask": "zoom",\n', ":1: "),
+        ):
+            with self.subTest(message):
+                with self.assertRaises(ValueError) as raised:
+                    self.load(records)
+                self.assertIn(message, str(raised.exception))
+
+    def test_add_and_move_save_one_line_per_record(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "catalog.jsonl")
+            Path(path).write_text(RECORDS, encoding="utf-8")
+            catalog = catalog_manifest.CatalogManifest().load(path)
+
+            catalog.add("zoom", "pkg_urls")
+            self.assertEqual(catalog.move("mist", "pkg_in_pkg_urls"), "pkg_urls")
+            with self.assertRaises(ValueError):
+                catalog.add("signal", "homebrew_cask_urls")
+            catalog.save(path)
+
+            lines = Path(path).read_text(encoding="utf-8").splitlines()
+            self.assertEqual(
+                lines[-2:],
+                ['{"cask": "zoom", "type": "pkg"}', '{"cask": "mist", "type": "pkg_in_pkg", "note": "Ships a flat PKG"}'],
+            )
+            self.assertEqual(len(lines), 6)
+            reloaded = catalog_manifest.CatalogManifest().load(path)
+            self.assertEqual(reloaded.urls("pkg_urls"), ["https://formulae.brew.sh/api/cask/zoom.json"])
+
+    def test_repository_catalog_is_what_the_collector_processes(self):
+        catalog = catalog_manifest.CatalogManifest().load(ROOT / ".github/catalog.jsonl")
+        spec = importlib.util.spec_from_file_location("collect_app_info", SCRIPTS / "collect_app_info.py")
+        collect_app_info = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(collect_app_info)
+
+        self.assertEqual(
+            [name for name, _, _ in collect_app_info.catalog_lists()],
+            list(catalog_manifest.LIST_TYPES),
+        )
+        for name, urls, _ in collect_app_info.catalog_lists():
+            self.assertEqual(urls, catalog.urls(name))
+        self.assertEqual(check_cask_tokens.referenced_tokens(ROOT / ".github/catalog.jsonl"), catalog.tokens())
+
+
+class CatalogScriptTests(unittest.TestCase):
+    def test_reclassify_moves_the_record_and_corrects_the_app_type(self):
+        with catalog_checkout() as root:
+            app_path = root / "Apps" / "mist.json"
+            app_path.write_text(json.dumps({"name": "Mist", "homebrew_cask": "mist", "type": "pkg"}), encoding="utf-8")
+
+            with patch.dict(os.environ, {"CASK_NAME": "mist", "TARGET_LIST": "pkg_in_pkg_urls"}), \
+                    contextlib.redirect_stdout(io.StringIO()) as output:
+                reclassify_app.main()
+
+            catalog = catalog_manifest.CatalogManifest().load(catalog_manifest.CATALOG_FILE)
+            self.assertEqual(catalog.list_name("mist"), "pkg_in_pkg_urls")
+            self.assertEqual(json.loads(app_path.read_text(encoding="utf-8"))["type"], "pkg_in_pkg")
+            self.assertIn("Output: from_list=pkg_urls", output.getvalue())
+
+    def test_reclassify_refuses_an_unlisted_cask(self):
+        with catalog_checkout() as root:
+            with patch.dict(os.environ, {"CASK_NAME": "zoom", "TARGET_LIST": "pkg_urls"}), \
+                    contextlib.redirect_stdout(io.StringIO()) as output:
+                reclassify_app.main()
+
+            self.assertIn("Output: moved=false", output.getvalue())
+            self.assertEqual((root / ".github/catalog.jsonl").read_text(encoding="utf-8"), RECORDS)
+
+    def test_affected_apps_reads_the_catalog_once_for_every_missing_token(self):
+        with catalog_checkout() as root:
+            for name, token in (("Mist", "mist"), ("Signal", "signal"), ("Medis", "medis")):
+                (root / "Apps" / f"{token}.json").write_text(
+                    json.dumps({"name": name, "homebrew_cask": token, "version": "1.0"}), encoding="utf-8"
+                )
+
+            with patch.object(check_cask_tokens.os, "listdir", wraps=os.listdir) as listdir:
+                apps = check_cask_tokens.affected_apps(["mist", "medis", "gone"])
+
+            listdir.assert_called_once_with(check_cask_tokens.APPS_FOLDER)
+            self.assertEqual(sorted(apps), ["medis", "mist"])
+            self.assertEqual(apps["mist"], {"name": "Mist", "version": "1.0", "deprecated": False})
+
+    def test_approved_casks_are_appended_once(self):
+        homebrew = {
+            "zoom": {"name": ["Zoom"], "url": "https://example.com/zoom.pkg", "artifacts": [{"pkg": ["zoom.pkg"]}]},
+            "raycast": {"name": ["Raycast"], "url": "https://example.com/raycast.dmg", "artifacts": [{"app": ["Raycast.app"]}]},
+        }
+        environment = {"COMMENT_BODY": "/approve zoom, signal, raycast, zoom", "GITHUB_OUTPUT": ""}
+        with catalog_checkout() as root:
+            with patch.dict(os.environ, environment), \
+                    patch.object(add_new_app, "fetch_homebrew_info", homebrew.get), \
+                    contextlib.redirect_stdout(io.StringIO()) as output:
+                add_new_app.main()
+
+            lines = (root / ".github/catalog.jsonl").read_text(encoding="utf-8").splitlines()
+            self.assertEqual(
+                lines[-2:],
+                ['{"cask": "zoom", "type": "pkg"}', '{"cask": "raycast", "type": "dmg"}'],
+            )
+            self.assertEqual(len(lines), 7)
+            self.assertIn("Skipping signal: already exists", output.getvalue())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -1,10 +1,15 @@
 import importlib.util
+import os
+import sys
+import tempfile
 import unittest
 from pathlib import Path
 from unittest.mock import Mock, patch
 
 
 ROOT = Path(__file__).resolve().parents[1]
+# The script imports download_agents as a sibling, as it does when run directly.
+sys.path.insert(0, str(ROOT / ".github/scripts"))
 SPEC = importlib.util.spec_from_file_location(
     "check_download_urls",
     ROOT / ".github/scripts/check_download_urls.py",
@@ -14,6 +19,11 @@ SPEC.loader.exec_module(check_download_urls)
 
 
 class DownloadUrlHealthTests(unittest.TestCase):
+    def setUp(self):
+        patcher = patch.object(check_download_urls, "agent_table", check_download_urls.AgentTable())
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
     def response(self, status_code=200, content_type="application/octet-stream"):
         response = Mock()
         response.status_code = status_code
@@ -60,6 +70,63 @@ class DownloadUrlHealthTests(unittest.TestCase):
         self.assertEqual(verdict, "request_failed")
         self.assertEqual(detail, "ConnectionError")
 
+    def test_learned_agent_is_tried_first_and_remembered(self):
+        curl = "curl/8.4.0"
+        check_download_urls.agent_table.record(
+            "https://existential.audio/old.pkg", curl, check_download_urls.ATTEMPTS[0]["user_agent"]
+        )
+        request = Mock(return_value=self.response(status_code=206))
+
+        with patch.object(check_download_urls.requests, "request", request):
+            verdict, _ = check_download_urls.check_url("https://existential.audio/new.pkg")
+
+        self.assertEqual(verdict, "ok")
+        self.assertEqual(request.call_args.kwargs["headers"]["User-Agent"], curl)
+        self.assertEqual(check_download_urls.agent_table.preferred("https://existential.audio/"), curl)
+
+    def test_default_agent_success_keeps_the_learned_agent(self):
+        curl = "curl/8.4.0"
+        check_download_urls.agent_table.record(
+            "https://existential.audio/old.pkg", curl, check_download_urls.ATTEMPTS[0]["user_agent"]
+        )
+        request = Mock(side_effect=[self.response(status_code=403), self.response(status_code=206)])
+
+        with patch.object(check_download_urls.requests, "request", request):
+            verdict, _ = check_download_urls.check_url("https://existential.audio/new.pkg")
+
+        self.assertEqual(verdict, "ok")
+        self.assertEqual(
+            request.call_args.kwargs["headers"]["User-Agent"], check_download_urls.ATTEMPTS[0]["user_agent"]
+        )
+        self.assertEqual(check_download_urls.agent_table.preferred("https://existential.audio/"), curl)
+
+    def test_unknown_host_keeps_the_default_attempt_order(self):
+        self.assertEqual(
+            check_download_urls.ordered_attempts("https://downloads.example.test/app.dmg"),
+            check_download_urls.ATTEMPTS,
+        )
+
+    def test_agents_learned_by_the_collector_are_used(self):
+        collector_spec = importlib.util.spec_from_file_location(
+            "collect_app_info", ROOT / ".github/scripts/collect_app_info.py"
+        )
+        collect_app_info = importlib.util.module_from_spec(collector_spec)
+        collector_spec.loader.exec_module(collect_app_info)
+        browser = check_download_urls.DOWNLOAD_USER_AGENTS[2]
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, check_download_urls.AGENT_TABLE_FILE)
+            collector_table = collect_app_info.AgentTable()
+            collector_table.load(path)
+            collector_table.record("https://hopperapp.com/a.dmg", browser, collect_app_info.DOWNLOAD_USER_AGENTS[0])
+            collector_table.save()
+            check_download_urls.agent_table.load(path)
+
+        self.assertEqual(collect_app_info.AGENT_TABLE_FILE, check_download_urls.AGENT_TABLE_FILE)
+        self.assertEqual(
+            check_download_urls.ordered_attempts("https://hopperapp.com/b.dmg")[0]["user_agent"], browser
+        )
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -1,17 +1,29 @@
 import contextlib
 import hashlib
+import http.server
 import importlib.util
 import io
 import json
 import os
 import re
+import shutil
+import sys
 import tempfile
+import threading
+import time
 import unittest
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 from unittest.mock import Mock, patch
 
+import bench_collector
+import bench_scaling
+from fake_brew_server import FakeBrewServer
+
 
 ROOT = Path(__file__).resolve().parents[1]
+# The scripts import their siblings, as they do when run directly.
+sys.path.insert(0, str(ROOT / ".github/scripts"))
 SPEC = importlib.util.spec_from_file_location(
     "collect_app_info",
     ROOT / ".github/scripts/collect_app_info.py",
@@ -193,6 +205,36 @@ def run_collector(work_dir, cask_urls, session=None):
             stack.enter_context(patch.object(collect_app_info, "pkg_in_dmg_urls", []))
             stack.enter_context(patch.object(collect_app_info, "custom_scrapers", []))
             stack.enter_context(patch.dict(collect_app_info.cask_cache, {}, clear=True))
+            stack.enter_context(patch.dict(collect_app_info.hash_cache, {}, clear=True))
+            stack.enter_context(
+                patch.object(collect_app_info, "cask_http_cache", collect_app_info.CaskHttpCache())
+            )
+            stack.enter_context(
+                patch.object(collect_app_info, "app_catalog", collect_app_info.CatalogIndex())
+            )
+            stack.enter_context(
+                patch.object(collect_app_info, "agent_table", collect_app_info.AgentTable())
+            )
+            stack.enter_context(
+                patch.object(collect_app_info, "hash_journal", collect_app_info.HashJournal())
+            )
+            stack.enter_context(
+                patch.object(collect_app_info, "content_ledger", collect_app_info.ContentLedger())
+            )
+            stack.enter_context(patch.object(collect_app_info, "probe_headers", Mock(return_value=None)))
+            stack.enter_context(patch.object(collect_app_info, "probe_size", Mock(return_value=None)))
+            stack.enter_context(
+                patch.object(collect_app_info, "download_flights", collect_app_info.SingleFlight())
+            )
+            stack.enter_context(
+                patch.object(collect_app_info, "deferred_work", collect_app_info.DeferredWork())
+            )
+            stack.enter_context(
+                patch.object(collect_app_info, "run_deadline", collect_app_info.RunDeadline())
+            )
+            stack.enter_context(
+                patch.object(collect_app_info, "run_report", collect_app_info.RunReport())
+            )
             if session is None:
                 stack.enter_context(patch.object(collect_app_info, "prefetch_cask_data", Mock()))
                 stack.enter_context(
@@ -389,6 +431,304 @@ class FilenameCollisionTests(unittest.TestCase):
             self.assertEqual(collect_app_info.filename_collisions, [])
 
 
+class CatalogIndexTests(unittest.TestCase):
+    """Lookups answered from one parse of the Apps folder."""
+
+    def setUp(self):
+        del collect_app_info.filename_collisions[:]
+        self.catalog = collect_app_info.CatalogIndex()
+        patcher = patch.object(collect_app_info, "app_catalog", self.catalog)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        del collect_app_info.filename_collisions[:]
+
+    def write_app(self, directory, name, data):
+        path = Path(directory) / name
+        path.write_text(json.dumps(data), encoding="utf-8")
+        return os.path.join(directory, name)
+
+    def test_cask_lookup_does_not_rescan_the_folder(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = self.write_app(directory, "custom_name.json", {"name": "Custom", "homebrew_cask": "foo"})
+            self.write_app(directory, "other.json", {"name": "Other", "homebrew_cask": "bar"})
+            self.catalog.load(directory)
+
+            with patch.object(collect_app_info.os, "listdir", Mock(side_effect=AssertionError)):
+                self.assertEqual(
+                    collect_app_info.find_app_file(directory, display_name="Foo App", cask_token="foo"),
+                    path,
+                )
+                self.assertIsNone(collect_app_info.find_app_file(directory, cask_token="missing"))
+
+    def test_writes_keep_the_index_current(self):
+        with tempfile.TemporaryDirectory() as directory:
+            self.catalog.load(directory)
+            path = os.path.join(directory, "renamed.json")
+
+            collect_app_info.write_app_json(path, {"name": "Renamed", "homebrew_cask": "old-token"})
+            self.assertEqual(collect_app_info.find_app_file(directory, cask_token="old-token"), path)
+
+            collect_app_info.write_app_json(path, {"name": "Renamed", "homebrew_cask": "new-token"})
+            self.assertIsNone(collect_app_info.find_app_file(directory, cask_token="old-token"))
+            self.assertEqual(collect_app_info.find_app_file(directory, cask_token="new-token"), path)
+            self.assertEqual(json.loads(Path(path).read_text(encoding="utf-8"))["homebrew_cask"], "new-token")
+
+    def test_claim_and_deprecation_use_the_indexed_data(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = self.write_app(directory, "tailscale.json", {"name": "Tailscale", "homebrew_cask": "tailscale"})
+            self.catalog.load(directory)
+
+            self.assertFalse(collect_app_info.claim_app_file(path, "tailscale-app"))
+            self.assertTrue(
+                collect_app_info.mark_app_deprecated(directory, "Tailscale", "removed", "tailscale")
+            )
+            self.assertTrue(self.catalog.get(path)["deprecated"])
+            self.assertTrue(json.loads(Path(path).read_text(encoding="utf-8"))["deprecated"])
+
+
+class AppJsonStoreTests(unittest.TestCase):
+    """Each app file is read once and only rewritten when its bytes change."""
+
+    url = "https://formulae.brew.sh/api/cask/tailscale.json"
+
+    def setUp(self):
+        del collect_app_info.filename_collisions[:]
+
+    def tearDown(self):
+        del collect_app_info.filename_collisions[:]
+
+    def test_identical_serialization_is_not_written(self):
+        with tempfile.TemporaryDirectory() as directory:
+            os.makedirs(os.path.join(directory, "Apps"))
+            app_path = Path(directory) / "Apps" / "tailscale.json"
+            settled = dict(CASK_INFO[self.url], sha="1" * 64, previous_version="1.80.0")
+            app_path.write_text(json.dumps(settled, indent=2) + "\n", encoding="utf-8")
+            before = app_path.read_bytes()
+
+            with patch.object(collect_app_info.os, "replace", wraps=os.replace) as replace:
+                with run_collector(directory, [self.url]) as output:
+                    collect_app_info.main(["--full"])
+
+            replaced = [call.args[1] for call in replace.call_args_list]
+            self.assertNotIn(os.path.join("Apps", "tailscale.json"), replaced)
+            self.assertEqual(app_path.read_bytes(), before)
+            self.assertIn("0 files written, 1 left untouched", output.getvalue())
+
+    def test_changed_file_is_replaced_and_keeps_its_newline(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "app.json")
+            Path(path).write_text(json.dumps({"version": "1"}, indent=2) + "\n", encoding="utf-8")
+
+            self.assertTrue(collect_app_info.write_app_json(path, {"version": "2"}))
+            self.assertFalse(collect_app_info.write_app_json(path, {"version": "2"}))
+
+            self.assertEqual(Path(path).read_text(encoding="utf-8"), '{\n  "version": "2"\n}\n')
+            self.assertEqual(os.listdir(directory), ["app.json"])
+
+    def test_new_file_matches_the_collector_format(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "app.json")
+
+            self.assertTrue(collect_app_info.write_app_json(path, {"version": "1"}))
+
+            self.assertEqual(Path(path).read_text(encoding="utf-8"), '{\n  "version": "1"\n}')
+
+
+class LogoIndexTests(unittest.TestCase):
+    def test_logos_resolve_case_insensitively_with_png_first(self):
+        with tempfile.TemporaryDirectory() as directory:
+            for filename in ["Google_Chrome.PNG", "google_chrome.ico", "zoom.ico"]:
+                Path(directory, filename).write_bytes(b"")
+
+            with patch.object(collect_app_info.os, "listdir", wraps=os.listdir) as listdir:
+                logo_index = collect_app_info.build_logo_index(directory)
+                resolved = [
+                    collect_app_info.resolve_logo(logo_index, name)
+                    for name in ["Google Chrome", "Zoom", "Slack"]
+                ]
+
+            self.assertEqual(listdir.call_count, 1)
+            self.assertEqual(resolved, ["Logos/Google_Chrome.PNG", "Logos/zoom.ico", None])
+
+    def test_missing_logos_folder_resolves_nothing(self):
+        with tempfile.TemporaryDirectory() as directory:
+            logo_index = collect_app_info.build_logo_index(os.path.join(directory, "Logos"))
+
+        self.assertIsNone(collect_app_info.resolve_logo(logo_index, "Zoom"))
+
+
+class VersionPrepassTests(unittest.TestCase):
+    """Apps whose cask did not move are skipped unless --full is given."""
+
+    url = "https://formulae.brew.sh/api/cask/tailscale.json"
+
+    def setUp(self):
+        del collect_app_info.filename_collisions[:]
+
+    def tearDown(self):
+        del collect_app_info.filename_collisions[:]
+
+    def settled_app(self, directory):
+        """An app file exactly as a run that found no version change leaves it."""
+        os.makedirs(os.path.join(directory, "Apps"))
+        app_path = Path(directory) / "Apps" / "tailscale.json"
+        settled = dict(CASK_INFO[self.url], sha="1" * 64, previous_version="1.80.0")
+        # Compact separators: any rewrite would reformat the file.
+        app_path.write_text(json.dumps(settled, separators=(",", ":")), encoding="utf-8")
+        return app_path
+
+    def test_unchanged_app_is_not_rewritten_or_hashed(self):
+        with tempfile.TemporaryDirectory() as directory:
+            app_path = self.settled_app(directory)
+            before = app_path.read_bytes()
+
+            with run_collector(directory, [self.url]) as output:
+                collect_app_info.main()
+                download = collect_app_info.calculate_file_hash
+
+            self.assertEqual(app_path.read_bytes(), before)
+            download.assert_not_called()
+            self.assertIn("0 apps changed or need attention, 1 unchanged", output.getvalue())
+
+    def test_full_run_processes_unchanged_apps(self):
+        with tempfile.TemporaryDirectory() as directory:
+            app_path = self.settled_app(directory)
+            before = app_path.read_bytes()
+
+            with run_collector(directory, [self.url]):
+                collect_app_info.main(["--full"])
+
+            self.assertNotEqual(app_path.read_bytes(), before)
+            app_data = json.loads(app_path.read_text(encoding="utf-8"))
+            self.assertEqual(app_data["sha"], "1" * 64)
+            self.assertEqual(app_data["previous_version"], "1.80.0")
+
+    def test_deprecated_app_that_recovered_is_processed(self):
+        app_info = dict(CASK_INFO[self.url])
+        stored = dict(
+            app_info,
+            sha="1" * 64,
+            previous_version="1.80.0",
+            deprecated=True,
+            deprecation_reason="cask removed from Homebrew",
+        )
+
+        self.assertFalse(
+            collect_app_info.app_is_unchanged("homebrew_cask_urls", app_info, stored)
+        )
+        del stored["deprecated"], stored["deprecation_reason"]
+        self.assertTrue(
+            collect_app_info.app_is_unchanged("homebrew_cask_urls", app_info, stored)
+        )
+
+    def test_repackaged_app_compares_the_vendor_url(self):
+        app_info = dict(CASK_INFO[self.url], type="app")
+        stored = dict(
+            app_info,
+            url="https://intunebrew.blob.core.windows.net/pkg/tailscale_1.80.0.pkg",
+            previous_version="1.80.0",
+        )
+
+        self.assertTrue(collect_app_info.app_is_unchanged("app_urls", app_info, stored))
+        stored["vendor_url"] = "https://example.com/tailscale-1.79.0.dmg"
+        self.assertFalse(collect_app_info.app_is_unchanged("app_urls", app_info, stored))
+
+
+class ListPolicyTests(unittest.TestCase):
+    """process_app() applies each list's policy to the same stored app."""
+
+    url = "https://formulae.brew.sh/api/cask/tailscale.json"
+
+    def setUp(self):
+        del collect_app_info.filename_collisions[:]
+
+    def tearDown(self):
+        del collect_app_info.filename_collisions[:]
+
+    def process(self, list_name, payload):
+        stored = {
+            "name": "Tailscale",
+            "description": "Stored description",
+            "version": "1.79.0",
+            "url": "https://intunebrew.blob.core.windows.net/pkg/tailscale_1.79.0.pkg",
+            "vendor_url": "https://example.com/tailscale-1.79.0.dmg",
+            "homebrew_cask": "tailscale",
+            "fileName": "Tailscale_repackaged.pkg",
+            "sha": "1" * 64,
+            "type": "app",
+            "deprecated": True,
+            "deprecation_reason": "cask removed from Homebrew",
+        }
+        with tempfile.TemporaryDirectory() as directory:
+            apps_folder = os.path.join(directory, "Apps")
+            os.makedirs(apps_folder)
+            app_path = Path(apps_folder) / "tailscale.json"
+            app_path.write_text(json.dumps(stored, indent=2), encoding="utf-8")
+            catalog = collect_app_info.CatalogIndex()
+            catalog.load(apps_folder)
+            hash_pool = Mock()
+            hash_pool.result.return_value = "2" * 64
+            supported_apps, apps_info = [], []
+            with patch.object(collect_app_info, "app_catalog", catalog), \
+                    patch.object(collect_app_info, "hash_pool", hash_pool), \
+                    patch.dict(collect_app_info.cask_cache, {self.url: payload}, clear=True), \
+                    contextlib.redirect_stdout(io.StringIO()):
+                collect_app_info.process_app(
+                    collect_app_info.list_policy(list_name),
+                    self.url,
+                    apps_folder,
+                    supported_apps,
+                    apps_info,
+                )
+            self.assertEqual(supported_apps, ["Tailscale"])
+            return json.loads(app_path.read_text(encoding="utf-8"))
+
+    def test_table_covers_every_list_in_processing_order(self):
+        self.assertEqual(
+            [policy.name for policy in collect_app_info.LIST_POLICIES],
+            ["app_urls", "homebrew_cask_urls", "pkg_in_pkg_urls", "pkg_urls", "pkg_in_dmg_urls"],
+        )
+        with patch.object(collect_app_info, "app_urls", ["a"]), \
+                patch.object(collect_app_info, "homebrew_cask_urls", ["b"]), \
+                patch.object(collect_app_info, "pkg_in_pkg_urls", ["c"]), \
+                patch.object(collect_app_info, "pkg_urls", ["d", "a"]), \
+                patch.object(collect_app_info, "pkg_in_dmg_urls", ["e"]):
+            policies = collect_app_info.hash_policies()
+        # PKG-in-PKG and PKG-in-DMG apps are hashed by the build after repackaging.
+        self.assertEqual(
+            {url: [policy.name for policy in entries] for url, entries in policies.items()},
+            {"a": ["app_urls", "pkg_urls"], "b": ["homebrew_cask_urls"], "d": ["pkg_urls"]},
+        )
+
+    def test_each_list_owns_type_and_merges_the_stored_data_its_own_way(self):
+        for list_name, expected_type, expected_sha, expected_file in (
+            ("app_urls", "app", "2" * 64, "Tailscale_repackaged.pkg"),
+            ("homebrew_cask_urls", None, "2" * 64, "tailscale-1.80.0.dmg"),
+            ("pkg_in_pkg_urls", "pkg_in_pkg", "1" * 64, "tailscale-1.80.0.dmg"),
+            ("pkg_urls", "pkg", "2" * 64, "tailscale-1.80.0.dmg"),
+            ("pkg_in_dmg_urls", "pkg_in_dmg", "1" * 64, "tailscale-1.80.0.dmg"),
+        ):
+            with self.subTest(list_name):
+                app_data = self.process(list_name, dict(TAILSCALE_PAYLOAD))
+
+                self.assertEqual(app_data.get("type"), expected_type)
+                self.assertEqual(app_data["sha"], expected_sha)
+                self.assertEqual(app_data["fileName"], expected_file)
+                self.assertEqual(app_data["description"], "Stored description")
+                self.assertEqual(app_data["version"], "1.80.0")
+                self.assertEqual(app_data["previous_version"], "1.79.0")
+                self.assertEqual(app_data["vendor_url"], TAILSCALE_PAYLOAD["url"])
+                self.assertNotIn("deprecated", app_data)
+
+    def test_direct_pkg_list_names_extensionless_downloads_pkg(self):
+        payload = dict(TAILSCALE_PAYLOAD, url="https://example.com/download?platform=mac")
+
+        self.assertTrue(self.process("pkg_urls", payload)["fileName"].endswith(".pkg"))
+        self.assertTrue(self.process("homebrew_cask_urls", payload)["fileName"].endswith(".dmg"))
+
+
 TAILSCALE_PAYLOAD = {
     "name": ["Tailscale"],
     "desc": "Mesh VPN",
@@ -495,6 +835,1070 @@ class PrefetchTests(unittest.TestCase):
             self.assertEqual(collect_app_info.filename_collisions, [])
 
 
+class AdaptiveWindowTests(unittest.TestCase):
+    def test_window_grows_by_one_per_window_of_fast_answers(self):
+        window = collect_app_info.AdaptiveWindow(initial=4, minimum=2, maximum=6)
+
+        for _ in range(4 + 5 + 6 + 6):
+            window.on_success(0.05, window.epoch)
+
+        self.assertEqual(window.limit, 6)
+        self.assertEqual(window.peak, 6)
+
+    def test_a_burst_of_errors_from_one_window_halves_it_once(self):
+        window = collect_app_info.AdaptiveWindow(initial=16, minimum=2, maximum=64)
+        started_epoch = window.epoch
+
+        for _ in range(10):
+            window.on_congestion(started_epoch)
+        self.assertEqual(window.limit, 8)
+
+        window.on_success(collect_app_info.CASK_SLOW_SECONDS + 1, window.epoch)
+        self.assertEqual(window.limit, 4)
+        self.assertEqual(window.cuts, 2)
+
+    def test_server_errors_shrink_the_window_but_removed_casks_do_not(self):
+        urls = [f"https://formulae.brew.sh/api/cask/app-{index}.json" for index in range(6)]
+        responses = {url: cask_response(status_code=404) for url in urls[:3]}
+        responses.update({url: cask_response(status_code=503) for url in urls[3:]})
+        window = collect_app_info.AdaptiveWindow(initial=1, minimum=1, maximum=8)
+        histogram = collect_app_info.LatencyHistogram()
+
+        session = CountingSession(responses)
+
+        def get(url, **kwargs):
+            # The overloaded answers land after every removed cask started before them.
+            if url in urls[3:]:
+                time.sleep(0.05)
+            return CountingSession.get(session, url, **kwargs)
+
+        session.get = get
+        with patch.object(collect_app_info, "cask_session", session):
+            results = collect_app_info.asyncio.run(
+                collect_app_info._fetch_casks_adaptively(urls, window, histogram)
+            )
+
+        self.assertEqual(set(results), set(urls))
+        self.assertEqual(sum(histogram.counts), len(urls))
+        # The 404s grow a window of one to three; the three 503s, all started
+        # in that window, halve it once.
+        self.assertEqual(window.peak, 3)
+        self.assertEqual(window.cuts, 1)
+        self.assertEqual(window.limit, 1)
+
+    def test_histogram_buckets_latencies(self):
+        histogram = collect_app_info.LatencyHistogram(bounds=(0.1, 1.0))
+        for seconds in (0.05, 0.5, 0.7, 3.0):
+            histogram.add(seconds)
+
+        self.assertEqual(histogram.counts, [1, 2, 1])
+        self.assertIn("mean 1.062s over 4 fetches", histogram.lines()[-1])
+
+
+class CaskStreamTests(unittest.TestCase):
+    """Apps are processed in catalog order while their documents are still arriving."""
+
+    first = "https://formulae.brew.sh/api/cask/tailscale.json"
+    second = "https://formulae.brew.sh/api/cask/zoom.json"
+    third = "https://formulae.brew.sh/api/cask/slack.json"
+
+    def setUp(self):
+        collect_app_info.cask_cache.clear()
+        del collect_app_info.filename_collisions[:]
+
+    def tearDown(self):
+        collect_app_info.cask_cache.clear()
+        del collect_app_info.filename_collisions[:]
+
+    def test_documents_are_consumed_in_order_and_released(self):
+        def reversed_prefetch(json_urls, on_result=None):
+            for url in reversed(list(dict.fromkeys(json_urls))):
+                collect_app_info.cask_cache[url] = {"token": url}
+                on_result(url)
+
+        stream = collect_app_info.CaskStream()
+        consumed = []
+        with patch.object(collect_app_info, "prefetch_cask_data", reversed_prefetch):
+            stream.start([self.first, self.second, self.third, self.first])
+            for url in stream.consume([self.first, self.second]):
+                consumed.append((url, url in collect_app_info.cask_cache))
+            stream.join()
+
+            self.assertEqual(consumed, [(self.first, True), (self.second, True)])
+            # The first url has a second reader still to come, the others had one.
+            self.assertEqual(set(collect_app_info.cask_cache), {self.first, self.third})
+            list(stream.consume([self.first]))
+            self.assertNotIn(self.first, collect_app_info.cask_cache)
+
+    def test_first_app_is_written_before_the_prefetch_finishes(self):
+        zoom = dict(
+            CASK_INFO[self.first],
+            name="Zoom",
+            url="https://example.com/zoom.pkg",
+            vendor_url="https://example.com/zoom.pkg",
+            homebrew_cask="zoom",
+        )
+        written_early = []
+
+        with tempfile.TemporaryDirectory() as directory:
+            os.makedirs(os.path.join(directory, "Apps"))
+            first_file = Path(directory) / "Apps" / "tailscale.json"
+
+            def slow_prefetch(json_urls, on_result=None):
+                collect_app_info.cask_cache[self.first] = {}
+                on_result(self.first)
+                deadline = time.monotonic() + 5
+                while not first_file.exists() and time.monotonic() < deadline:
+                    time.sleep(0.01)
+                written_early.append(first_file.exists())
+                collect_app_info.cask_cache[self.second] = {}
+                on_result(self.second)
+
+            with patch.dict(CASK_INFO, {self.second: zoom}):
+                with run_collector(directory, [self.first, self.second]):
+                    with patch.object(collect_app_info, "prefetch_cask_data", slow_prefetch):
+                        collect_app_info.main()
+
+            self.assertEqual(written_early, [True])
+            self.assertTrue((Path(directory) / "Apps" / "zoom.json").exists())
+
+
+class HashJournalTests(unittest.TestCase):
+    """Digests survive a run that never got to write or commit its app files."""
+
+    url = "https://formulae.brew.sh/api/cask/tailscale.json"
+
+    def setUp(self):
+        del collect_app_info.filename_collisions[:]
+
+    def tearDown(self):
+        del collect_app_info.filename_collisions[:]
+
+    def test_interrupted_run_is_resumed_from_the_journal(self):
+        with tempfile.TemporaryDirectory() as directory:
+            os.makedirs(os.path.join(directory, "Apps"))
+            app_path = Path(directory) / "Apps" / "tailscale.json"
+
+            with run_collector(directory, [self.url]):
+                interrupted = Mock(side_effect=RuntimeError("runner cancelled"))
+                with patch.object(collect_app_info, "update_readme_with_latest_changes", interrupted):
+                    with self.assertRaises(RuntimeError):
+                        collect_app_info.main()
+                first_download = collect_app_info.calculate_file_hash
+            # The cancelled job never commits, so its app file is lost.
+            app_path.unlink()
+
+            with run_collector(directory, [self.url]) as output:
+                collect_app_info.main()
+                second_download = collect_app_info.calculate_file_hash
+
+            first_download.assert_called_once()
+            second_download.assert_not_called()
+            self.assertEqual(json.loads(app_path.read_text(encoding="utf-8"))["sha"], "0" * 64)
+            self.assertIn("Replayed from journal: 1", output.getvalue())
+
+    def test_only_matching_entries_replay_and_survive_compaction(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "journal.jsonl")
+            lines = [
+                {"cask": "zoom", "version": "6.0", "url": "https://example.com/zoom.pkg", "sha": "a" * 64},
+                {"cask": "slack", "version": "4.1", "url": "https://example.com/slack.dmg", "sha": "b" * 64},
+            ]
+            Path(path).write_text(
+                "".join(json.dumps(line) + "\n" for line in lines) + '{"cask": "trunc',
+                encoding="utf-8",
+            )
+            journal = collect_app_info.HashJournal()
+            journal.load(path)
+
+            self.assertEqual(journal.lookup("zoom", "6.0", "https://example.com/zoom.pkg"), "a" * 64)
+            self.assertIsNone(journal.lookup("slack", "4.2", "https://example.com/slack.dmg"))
+            journal.compact()
+
+            self.assertEqual(
+                [json.loads(line) for line in Path(path).read_text(encoding="utf-8").splitlines()],
+                lines[:1],
+            )
+
+
+class RunDeadlineTests(unittest.TestCase):
+    """Past the run deadline, apps keep their previous state and their hashing is deferred."""
+
+    url = "https://formulae.brew.sh/api/cask/tailscale.json"
+
+    def setUp(self):
+        del collect_app_info.filename_collisions[:]
+
+    def tearDown(self):
+        del collect_app_info.filename_collisions[:]
+
+    def test_expired_run_keeps_previous_state_and_defers_the_artifact(self):
+        with tempfile.TemporaryDirectory() as directory:
+            os.makedirs(os.path.join(directory, "Apps"))
+            app_path = Path(directory) / "Apps" / "tailscale.json"
+            previous = json.dumps(dict(CASK_INFO[self.url], version="1.78.0", sha="1" * 64), indent=2)
+            app_path.write_text(previous, encoding="utf-8")
+
+            with patch.object(collect_app_info, "RUN_DEADLINE_SECONDS", 1e-9):
+                with run_collector(directory, [self.url]) as output:
+                    collect_app_info.main()
+                    download = collect_app_info.calculate_file_hash
+                    readme = collect_app_info.update_readme_apps
+
+            download.assert_not_called()
+            self.assertEqual(app_path.read_text(encoding="utf-8"), previous)
+            readme.assert_called_once_with(["Tailscale"])
+            deferred = json.loads(
+                (Path(directory) / ".collector-cache" / "deferred-work.json").read_text(encoding="utf-8")
+            )
+            self.assertEqual(
+                deferred["artifacts"],
+                [{"url": CASK_INFO[self.url]["url"], "app": "Tailscale", "cask": "tailscale", "version": "1.80.0"}],
+            )
+            self.assertIn("1 artifacts deferred to the next run", output.getvalue())
+
+            # The next run has time again: it hashes the app and clears the file.
+            with run_collector(directory, [self.url]) as output:
+                collect_app_info.main()
+
+            self.assertEqual(json.loads(app_path.read_text(encoding="utf-8"))["sha"], "0" * 64)
+            self.assertIn("1 artifacts deferred by the last run go first", output.getvalue())
+            self.assertFalse((Path(directory) / ".collector-cache" / "deferred-work.json").exists())
+
+    def test_new_app_is_not_listed_until_it_is_hashed(self):
+        with tempfile.TemporaryDirectory() as directory:
+            os.makedirs(os.path.join(directory, "Apps"))
+
+            with patch.object(collect_app_info, "RUN_DEADLINE_SECONDS", 1e-9):
+                with run_collector(directory, [self.url]):
+                    collect_app_info.main()
+                    readme = collect_app_info.update_readme_apps
+
+            self.assertFalse((Path(directory) / "Apps" / "tailscale.json").exists())
+            readme.assert_called_once_with([])
+
+    def test_ledger_head_is_skipped_past_the_deadline(self):
+        deadline = collect_app_info.RunDeadline()
+        deadline.expires = time.monotonic() - 1
+        probe = Mock()
+
+        with patch.object(collect_app_info, "run_deadline", deadline):
+            with patch.object(collect_app_info, "probe_headers", probe):
+                with self.assertRaises(collect_app_info.DeadlineExceeded):
+                    collect_app_info.download_file_hash("https://example.com/late.dmg")
+
+        probe.assert_not_called()
+
+    def test_running_download_stops_at_the_deadline(self):
+        deadline = collect_app_info.RunDeadline()
+        response = Mock(status_code=200)
+        response.iter_content.return_value = iter([b"\x00" * 16, b"\x00" * 16])
+        get = Mock(return_value=response)
+
+        def expire(amount):
+            deadline.expires = time.monotonic() - 1
+
+        with patch.object(collect_app_info, "run_deadline", deadline):
+            with patch.object(collect_app_info, "agent_table", collect_app_info.AgentTable()):
+                with patch.object(collect_app_info.download_client, "get", get):
+                    with patch.object(collect_app_info.download_limiter, "consume", expire):
+                        with contextlib.redirect_stdout(io.StringIO()):
+                            with self.assertRaises(collect_app_info.DeadlineExceeded):
+                                collect_app_info.calculate_file_hash("https://example.com/slow.dmg")
+
+        # No other user agent is tried once the budget is spent.
+        get.assert_called_once()
+        response.close.assert_called_once_with()
+
+
+class ScraperTests(unittest.TestCase):
+    """Custom scrapers run side by side, bounded by a timeout, with their output captured."""
+
+    url = "https://formulae.brew.sh/api/cask/tailscale.json"
+
+    def setUp(self):
+        del collect_app_info.filename_collisions[:]
+
+    def tearDown(self):
+        del collect_app_info.filename_collisions[:]
+
+    def write_scraper(self, directory, name, body):
+        path = Path(directory) / f"{name}.sh"
+        path.write_text("#!/bin/bash\n" + body, encoding="utf-8")
+        path.chmod(0o755)
+        return str(path)
+
+    def scraper_body(self, name, app_name, delay):
+        app_json = json.dumps(
+            {"name": app_name, "version": "1.0", "url": f"https://example.com/{name}.pkg"}
+        )
+        return f"sleep {delay}\necho 'fetched {app_name}'\necho '{app_json}' > Apps/{name}.json\n"
+
+    def test_scrapers_run_in_parallel_and_hash_through_the_pool(self):
+        with tempfile.TemporaryDirectory() as directory:
+            os.makedirs(os.path.join(directory, "Apps"))
+            scrapers = [
+                self.write_scraper(directory, "first", self.scraper_body("first", "First", 0.6)),
+                self.write_scraper(directory, "second", self.scraper_body("second", "Second", 0.6)),
+            ]
+
+            started = time.monotonic()
+            with run_collector(directory, [self.url]) as output:
+                with patch.object(collect_app_info, "custom_scrapers", scrapers):
+                    collect_app_info.main()
+                    download = collect_app_info.calculate_file_hash
+                    readme = collect_app_info.update_readme_apps
+            elapsed = time.monotonic() - started
+
+            self.assertLess(elapsed, 1.1)
+            self.assertEqual(readme.call_args.args[0], ["Tailscale", "First", "Second"])
+            self.assertEqual(
+                sorted(call.args[0] for call in download.call_args_list),
+                ["https://example.com/first.pkg", "https://example.com/second.pkg", CASK_INFO[self.url]["url"]],
+            )
+            for name in ("first", "second"):
+                app_data = json.loads((Path(directory) / "Apps" / f"{name}.json").read_text(encoding="utf-8"))
+                self.assertEqual(app_data["sha"], "0" * 64)
+            log = output.getvalue()
+            self.assertLess(log.index("fetched First"), log.index("fetched Second"))
+            self.assertIn(f"Scraper {scrapers[0]} (ok,", log)
+
+    def test_hung_scraper_is_killed_with_its_children(self):
+        with tempfile.TemporaryDirectory() as directory:
+            os.makedirs(os.path.join(directory, "Apps"))
+            previous = json.dumps({"name": "Hung", "version": "0.9", "url": "https://example.com/hung.pkg", "sha": "1" * 64})
+            (Path(directory) / "Apps" / "hung.json").write_text(previous, encoding="utf-8")
+            # The child sleep keeps stdout open after the script itself is gone.
+            scraper = self.write_scraper(directory, "hung", "echo 'waiting on vendor'\nsleep 30 &\nwait\n")
+
+            started = time.monotonic()
+            with patch.object(collect_app_info, "SCRAPER_TIMEOUT", 0.5):
+                with run_collector(directory, []) as output:
+                    with patch.object(collect_app_info, "custom_scrapers", [scraper]):
+                        collect_app_info.main()
+                        readme = collect_app_info.update_readme_apps
+
+            self.assertLess(time.monotonic() - started, 5)
+            self.assertIn("failed, timed out after 0.5s", output.getvalue())
+            self.assertIn("   waiting on vendor", output.getvalue())
+            self.assertEqual((Path(directory) / "Apps" / "hung.json").read_text(encoding="utf-8"), previous)
+            readme.assert_called_once_with([])
+
+
+class RunReportTests(unittest.TestCase):
+    """Every run leaves phase timings and counters as JSON and as a step summary table."""
+
+    url = "https://formulae.brew.sh/api/cask/tailscale.json"
+
+    def setUp(self):
+        del collect_app_info.filename_collisions[:]
+
+    def tearDown(self):
+        del collect_app_info.filename_collisions[:]
+
+    def test_run_writes_report_and_compares_with_the_previous_run(self):
+        with tempfile.TemporaryDirectory() as directory:
+            os.makedirs(os.path.join(directory, "Apps"))
+            summary_path = Path(directory) / "step-summary.md"
+
+            with patch.dict(os.environ, {"GITHUB_STEP_SUMMARY": str(summary_path)}):
+                for _ in range(2):
+                    with run_collector(directory, [self.url]):
+                        collect_app_info.main()
+
+            report = json.loads(
+                (Path(directory) / ".collector-cache" / "run-report.json").read_text(encoding="utf-8")
+            )
+            self.assertEqual(report["phases"]["loop:homebrew_cask_urls"]["calls"], 1)
+            self.assertIn("readme", report["phases"])
+            # The first run started from an empty Apps folder, the second read its file.
+            self.assertEqual(report["counters"]["files_read"], 1)
+            self.assertEqual(report["counters"]["files_written"], 1)
+
+            summary = summary_path.read_text(encoding="utf-8")
+            self.assertEqual(summary.count("### Collector run report"), 2)
+            self.assertIn("| files_read | 1 | 0 |", summary)
+
+    def test_markdown_leaves_previous_blank_for_new_phases(self):
+        payload = {
+            "seconds": 12.5,
+            "phases": {"download": {"seconds": 9.25, "calls": 3}, "readme": {"seconds": 0.5, "calls": 1}},
+            "counters": {"bytes_downloaded": 2048},
+        }
+        previous = {"seconds": 20, "phases": {"download": {"seconds": 15.5, "calls": 4}}, "counters": {}}
+
+        markdown = collect_app_info.run_report_markdown(payload, previous)
+
+        self.assertIn("Total: 12.5s (previous run: 20s)", markdown)
+        self.assertIn("| download | 9.2 | 3 | 15.5 |", markdown)
+        self.assertIn("| readme | 0.5 | 1 |  |", markdown)
+        self.assertIn("| bytes_downloaded | 2048 |  |", markdown)
+
+
+def fresh_run_settings(**settings):
+    """settings for bench_collector.run_collector, on top of unloaded copies of the
+    persistent singletons, so no run reads the state an earlier test left behind.
+    Audits are off: a random download would change the request counts."""
+    fresh = {
+        "cask_http_cache": collect_app_info.CaskHttpCache(),
+        "app_catalog": collect_app_info.CatalogIndex(),
+        "agent_table": collect_app_info.AgentTable(),
+        "hash_journal": collect_app_info.HashJournal(),
+        "content_ledger": collect_app_info.ContentLedger(),
+        "deferred_work": collect_app_info.DeferredWork(),
+        "run_report": collect_app_info.RunReport(),
+        "HASH_AUDIT_RATE": 0.0,
+    }
+    fresh.update(settings)
+    return fresh
+
+
+class EndToEndTests(unittest.TestCase):
+    """main() against the local Homebrew API and CDN stand-in, over real HTTP."""
+
+    def setUp(self):
+        del collect_app_info.filename_collisions[:]
+
+    def tearDown(self):
+        del collect_app_info.filename_collisions[:]
+
+    def collect(self, server, catalog, directory, **settings):
+        fresh = fresh_run_settings(**settings)
+        return bench_collector.run_collector(collect_app_info, server, catalog, directory, settings=fresh)
+
+    def test_downloaded_digests_match_the_served_artifacts(self):
+        with FakeBrewServer() as server, tempfile.TemporaryDirectory() as directory:
+            catalog = {
+                "homebrew_cask_urls": [
+                    server.add_cask("plain-app", size=300 * 1024),
+                    server.add_cask("picky-cdn", size=1024, artifact_behavior="reject-default-agent"),
+                    server.add_cask("html-page", artifact_behavior="html"),
+                    server.add_cask("old-app", behavior="deprecated"),
+                ],
+            }
+
+            metrics = self.collect(server, catalog, directory, HASH_MODE="download", CASK_SOURCE="per-cask")
+
+            apps = Path(directory) / "Apps"
+            for token in ("plain-app", "picky-cdn"):
+                app_data = json.loads((apps / f"{token.replace('-', '_')}.json").read_text(encoding="utf-8"))
+                self.assertEqual(app_data["sha"], server.artifacts[f"{token}-1.0.0.dmg"].sha256)
+            self.assertNotIn("sha", json.loads((apps / "html_page.json").read_text(encoding="utf-8")))
+            self.assertFalse((apps / "old_app.json").exists())
+            self.assertEqual(metrics["server"]["cask_requests"], 4)
+            self.assertIn("Refusing to hash HTML page", metrics["log"])
+
+    def test_warm_run_is_answered_by_the_index_alone(self):
+        with FakeBrewServer() as server, tempfile.TemporaryDirectory() as directory:
+            catalog = {"homebrew_cask_urls": [server.add_cask(f"app-{index}") for index in range(5)]}
+
+            cold = self.collect(server, catalog, directory, CASK_SOURCE="index")
+            # The second run records previous_version, after which the files settle.
+            self.collect(server, catalog, directory, CASK_SOURCE="index")
+            warm = self.collect(server, catalog, directory, CASK_SOURCE="index")
+
+            self.assertEqual(cold["server"]["index_requests"], 1)
+            self.assertEqual(cold["server"]["cask_requests"], 0)
+            self.assertEqual(warm["server"]["requests"], 1)
+            self.assertIn("0 apps changed or need attention, 5 unchanged", warm["log"])
+
+
+class IoCounter:
+    """Counts the collector's file opens and directory listings below root."""
+
+    def __init__(self, root):
+        self.root = os.path.realpath(root)
+        self.opens = {}
+        self.listings = []
+        self._lock = threading.Lock()
+
+    def relative(self, path):
+        return os.path.relpath(os.path.realpath(os.path.abspath(os.fspath(path))), self.root)
+
+    def open(self, file, mode="r", *args, **kwargs):
+        if not isinstance(file, int):
+            path = self.relative(file)
+            kind = "app_json" if path.startswith("Apps" + os.sep) else path.replace(".tmp", "")
+            key = (kind, "read" if mode.startswith("r") else "write")
+            with self._lock:
+                self.opens[key] = self.opens.get(key, 0) + 1
+        return open(file, mode, *args, **kwargs)
+
+    def listdir(self, path="."):
+        with self._lock:
+            self.listings.append(self.relative(path))
+        return self.real_listdir(path)
+
+    @contextlib.contextmanager
+    def installed(self):
+        self.real_listdir = os.listdir
+        with patch.object(collect_app_info, "open", self.open, create=True):
+            with patch.object(collect_app_info.os, "listdir", self.listdir):
+                yield self
+
+
+class RunBudgetTests(unittest.TestCase):
+    """Upper bounds on the requests and file I/O of a whole main() run.
+
+    A change that adds one request, one app JSON read or one directory scan per
+    app fails here instead of showing up as a slower nightly run.
+    """
+
+    def setUp(self):
+        del collect_app_info.filename_collisions[:]
+
+    def tearDown(self):
+        del collect_app_info.filename_collisions[:]
+
+    def fixture_catalog(self, server):
+        return {
+            "homebrew_cask_urls": [server.add_cask(f"cask-{index}") for index in range(6)]
+            + [server.add_cask("gone", behavior="removed")],
+            "pkg_urls": [server.add_cask(f"pkg-{index}", extension="pkg") for index in range(3)],
+            "app_urls": [server.add_cask(f"archive-{index}") for index in range(3)],
+        }
+
+    def collect(self, server, catalog, directory, **settings):
+        fresh = fresh_run_settings(**settings)
+        with IoCounter(directory).installed() as io_counter:
+            metrics = bench_collector.run_collector(
+                collect_app_info, server, catalog, directory, settings=fresh, update_readme=True
+            )
+        return metrics, io_counter
+
+    def assert_io_budget(self, io_counter, apps, app_writes):
+        opens = io_counter.opens
+        self.assertLessEqual(opens.get(("app_json", "read"), 0), apps)
+        self.assertLessEqual(opens.get(("app_json", "write"), 0), app_writes)
+        self.assertLessEqual(opens.get(("README.md", "read"), 0), 2)
+        self.assertLessEqual(opens.get(("README.md", "write"), 0), 2)
+        # State files are read once at the start and saved once at the end; the
+        # hash journal is also held open for appends while the run goes.
+        for (path, mode), count in opens.items():
+            if path.startswith(".collector-cache"):
+                limit = 2 if mode == "write" and path.endswith(collect_app_info.HASH_JOURNAL_FILE) else 1
+                self.assertLessEqual(count, limit, f"{path} opened {count} times for {mode}")
+        # One listing each for Apps/ and Logos/, however large the catalog.
+        self.assertEqual(len(io_counter.listings), len(set(io_counter.listings)))
+        self.assertLessEqual(set(io_counter.listings), {"Apps", "Logos"})
+
+    def test_cold_and_settled_runs_stay_within_budget(self):
+        with FakeBrewServer() as server, tempfile.TemporaryDirectory() as directory:
+            catalog = self.fixture_catalog(server)
+            casks = sum(len(urls) for urls in catalog.values())
+            apps = casks - 1
+            hashed = len(catalog["homebrew_cask_urls"]) - 1 + len(catalog["pkg_urls"])
+            shutil.copy(ROOT / "README.md", Path(directory) / "README.md")
+            os.makedirs(os.path.join(directory, "Logos"))
+
+            cold, cold_io = self.collect(server, catalog, directory, CASK_SOURCE="per-cask")
+            self.collect(server, catalog, directory, CASK_SOURCE="per-cask")
+            settled, settled_io = self.collect(server, catalog, directory, CASK_SOURCE="per-cask")
+
+            # One fetch per cask; in trust mode one HEAD per artifact that needs a digest.
+            self.assertLessEqual(cold["server"]["cask_requests"], casks)
+            self.assertLessEqual(cold["server"]["artifact_heads"], hashed)
+            self.assertEqual(cold["server"]["artifact_gets"], 0)
+            self.assert_io_budget(cold_io, apps=0, app_writes=apps)
+
+            # Nothing moved: validators answer every cask and no app file is written.
+            self.assertLessEqual(settled["server"]["requests"], casks)
+            self.assertEqual(settled["server"]["not_modified"], apps)
+            self.assert_io_budget(settled_io, apps=apps, app_writes=0)
+
+    def test_download_mode_fetches_each_artifact_once(self):
+        with FakeBrewServer() as server, tempfile.TemporaryDirectory() as directory:
+            catalog = self.fixture_catalog(server)
+            # A variant sharing its artifact with cask-0 must not cost a second download.
+            variant = server.add_cask("cask-0-variant")
+            server.casks["cask-0-variant"]["document"]["url"] = server.casks["cask-0"]["document"]["url"]
+            catalog["homebrew_cask_urls"].append(variant)
+            hashed = len(catalog["homebrew_cask_urls"]) - 2 + len(catalog["pkg_urls"])
+            shutil.copy(ROOT / "README.md", Path(directory) / "README.md")
+
+            metrics, _ = self.collect(
+                server, catalog, directory, CASK_SOURCE="index", HASH_MODE="download"
+            )
+
+            self.assertEqual(metrics["server"]["index_requests"], 1)
+            self.assertEqual(metrics["server"]["cask_requests"], 1)
+            self.assertLessEqual(metrics["server"]["artifact_gets"], hashed)
+            self.assertLessEqual(metrics["server"]["artifact_heads"], hashed)
+
+
+class ScalingBenchmarkTests(unittest.TestCase):
+    """The scaling suite runs every catalog walker and flags growth beyond its budget."""
+
+    def test_every_benchmark_runs_on_a_tiny_tree(self):
+        sizes = [30, 60]
+        results = bench_scaling.measure(sizes, repeat=1)
+
+        self.assertIn("check_cask_tokens.affected_apps, 1 missing per 1,000 apps", results)
+        self.assertIn("reclassify_app.update_app_type, one app", results)
+        self.assertIn("sync_cves_to_supabase.load_cve_files", results)
+        for entry in results.values():
+            self.assertEqual(entry["expected"], 1.0)
+        self.assertEqual(bench_scaling.lookup_count(60), 1)
+        self.assertEqual(bench_scaling.lookup_count(50000), 50)
+        for entry in results.values():
+            self.assertEqual(sorted(entry["seconds"]), sizes)
+
+    def test_quadratic_growth_is_flagged(self):
+        results = {
+            "linear": {"expected": 1.0, "seconds": {1000: 0.01, 10000: 0.1}},
+            "quadratic": {"expected": 1.0, "seconds": {1000: 0.01, 10000: 1.0}},
+            "tiny": {"expected": 1.0, "seconds": {1000: 0.0001, 10000: 0.001}},
+        }
+
+        table, flagged = bench_scaling.scaling_table(results, [1000, 10000])
+
+        self.assertEqual(flagged, ["quadratic"])
+        self.assertIn("| linear | 10.0 ms | 100.0 ms | 1.00 | 1.0 | ok |", table)
+        self.assertIn("| quadratic | 10.0 ms | 1000.0 ms | 2.00 | 1.0 | SUPER-LINEAR |", table)
+        self.assertIn("| tiny | 0.1 ms | 1.0 ms | n/a | 1.0 | noise |", table)
+
+    def test_skipped_benchmarks_stay_in_the_table(self):
+        results = {"needs-supabase": {"expected": 1.0, "seconds": {1000: None, 10000: None}}}
+
+        table, flagged = bench_scaling.scaling_table(results, [1000, 10000])
+
+        self.assertEqual(flagged, [])
+        self.assertIn(
+            "| needs-supabase | skipped | skipped | n/a | 1.0 | skipped (optional dependency missing) |", table
+        )
+
+
+class ContentLedgerTests(unittest.TestCase):
+    """A digest is reused anywhere in the catalog while HEAD shows the same content."""
+
+    url = "https://example.com/shared-installer.pkg"
+
+    def setUp(self):
+        self.ledger = collect_app_info.ContentLedger()
+        patcher = patch.object(collect_app_info, "content_ledger", self.ledger)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.directory = tempfile.TemporaryDirectory()
+        self.addCleanup(self.directory.cleanup)
+        self.ledger.load(os.path.join(self.directory.name, collect_app_info.CONTENT_LEDGER_FILE))
+
+    def hash_with_headers(self, headers):
+        download = Mock(return_value="c" * 64)
+        # Each call stands for a separate run, so nothing is shared in between.
+        collect_app_info.download_flights.reset()
+        with patch.object(collect_app_info, "probe_headers", Mock(return_value=headers)):
+            with patch.object(collect_app_info, "calculate_file_hash", download):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    digest = collect_app_info.download_file_hash(self.url)
+        return digest, download
+
+    def test_unchanged_validators_skip_the_download(self):
+        headers = {"ETag": '"abc"', "Content-Length": "4096"}
+        self.hash_with_headers(headers)
+        self.ledger.save()
+        self.ledger.load(self.ledger.path)
+
+        digest, download = self.hash_with_headers(headers)
+
+        self.assertEqual(digest, "c" * 64)
+        download.assert_not_called()
+
+    def test_changed_content_or_missing_validators_download_again(self):
+        self.hash_with_headers({"ETag": '"abc"', "Content-Length": "4096"})
+
+        _, download = self.hash_with_headers({"ETag": '"abc"', "Content-Length": "8192"})
+        download.assert_called_once()
+
+        _, download = self.hash_with_headers({"Content-Length": "8192"})
+        download.assert_called_once()
+        _, download = self.hash_with_headers({"Content-Length": "8192"})
+        download.assert_called_once()
+
+    def test_least_recently_used_entries_expire_on_save(self):
+        self.ledger.max_entries = 1
+        validators = {"etag": '"abc"'}
+        self.ledger.store("https://example.com/old.dmg", validators, "a" * 64)
+        self.ledger.entries["https://example.com/old.dmg"]["used"] = 0
+        self.ledger.store(self.url, validators, "b" * 64)
+        self.ledger.save()
+
+        reloaded = collect_app_info.ContentLedger()
+        reloaded.load(self.ledger.path)
+        self.assertEqual(list(reloaded.entries), [self.url])
+
+    def test_corrupt_entries_are_dropped_on_load(self):
+        validators = {"etag": '"abc"'}
+        entries = {
+            self.url: {"validators": validators, "sha": "b" * 64, "used": 1},
+            "https://example.com/short-sha.dmg": {"validators": validators, "sha": "b" * 12, "used": 1},
+            "https://example.com/no-validators.dmg": {"sha": "b" * 64, "used": 1},
+            "https://example.com/bad-time.dmg": {"validators": validators, "sha": "b" * 64, "used": None},
+            "https://example.com/not-a-dict.dmg": "b" * 64,
+        }
+        Path(self.ledger.path).write_text(json.dumps({"version": 1, "entries": entries}), encoding="utf-8")
+
+        self.ledger.load(self.ledger.path)
+
+        self.assertEqual(list(self.ledger.entries), [self.url])
+
+
+class SingleFlightTests(unittest.TestCase):
+    def test_concurrent_callers_share_one_download(self):
+        flights = collect_app_info.SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def slow_download():
+            calls.append(1)
+            started.set()
+            release.wait(5)
+            return "d" * 64
+
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            first = executor.submit(flights.do, "https://example.com/a.dmg", slow_download)
+            started.wait(5)
+            others = [
+                executor.submit(flights.do, "https://example.com/a.dmg", slow_download)
+                for _ in range(3)
+            ]
+            time.sleep(0.05)
+            release.set()
+            results = [first.result()] + [future.result() for future in others]
+
+        self.assertEqual(results, ["d" * 64] * 4)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flights.shared, 3)
+
+    def test_apps_sharing_a_vendor_url_download_it_once(self):
+        url = "https://formulae.brew.sh/api/cask/tailscale.json"
+        variant = "https://formulae.brew.sh/api/cask/tailscale-variant.json"
+        variant_info = dict(CASK_INFO[url], name="Tailscale Variant", homebrew_cask="tailscale-variant")
+
+        with tempfile.TemporaryDirectory() as directory:
+            os.makedirs(os.path.join(directory, "Apps"))
+            with patch.dict(CASK_INFO, {variant: variant_info}):
+                with run_collector(directory, [url, variant]) as output:
+                    collect_app_info.main()
+                    download = collect_app_info.calculate_file_hash
+
+            download.assert_called_once_with(CASK_INFO[url]["url"])
+            for name in ("tailscale.json", "tailscale_variant.json"):
+                app_data = json.loads((Path(directory) / "Apps" / name).read_text(encoding="utf-8"))
+                self.assertEqual(app_data["sha"], "0" * 64)
+            self.assertIn("Duplicates avoided   : 1", output.getvalue())
+
+
+class HashSchedulerTests(unittest.TestCase):
+    """Queued artifacts are sized first and the largest is hashed first."""
+
+    def setUp(self):
+        self.pool = collect_app_info.HashPool()
+        self.hashed = []
+        self.first_taken = threading.Event()
+        self.release = threading.Event()
+
+    def journaled(self, url, cask=None, version=None):
+        if url.endswith("first.dmg"):
+            self.first_taken.set()
+            self.release.wait(5)
+        self.hashed.append(url)
+        return "0" * 64
+
+    @contextlib.contextmanager
+    def running_pool(self, sizes, workers=1):
+        urls = [f"https://example.com/{name}" for name in sizes]
+        with patch.object(collect_app_info, "probe_size", lambda url: sizes[url.rsplit("/", 1)[1]]):
+            with patch.object(collect_app_info, "journaled_file_hash", self.journaled):
+                with patch.dict(collect_app_info.hash_cache, {}, clear=True):
+                    with contextlib.redirect_stdout(io.StringIO()) as output:
+                        self.pool.start(workers)
+                        for url in urls:
+                            self.pool.submit(url)
+                            if url.endswith("first.dmg"):
+                                self.first_taken.wait(5)
+                        try:
+                            yield urls, output
+                        finally:
+                            self.release.set()
+                            self.pool.close()
+
+    def test_largest_artifact_is_hashed_first(self):
+        sizes = {"first.dmg": 1, "small.dmg": 10, "large.dmg": 3000, "medium.dmg": 200, "hidden.dmg": None}
+
+        with patch.object(collect_app_info, "HASH_SLOW_LANE_BYTES", 0):
+            with self.running_pool(sizes):
+                # The only worker is busy until every other artifact is sized.
+                deadline = time.monotonic() + 5
+                while self.pool.backlog() < 4 and time.monotonic() < deadline:
+                    time.sleep(0.01)
+
+        self.assertEqual(
+            [url.rsplit("/", 1)[1] for url in self.hashed],
+            ["first.dmg", "large.dmg", "medium.dmg", "small.dmg", "hidden.dmg"],
+        )
+
+    def test_slow_lane_keeps_small_artifacts_moving(self):
+        sizes = {"first.dmg": 5000, "small.dmg": 10, "tiny.dmg": 1}
+
+        with patch.object(collect_app_info, "HASH_SLOW_LANE_BYTES", 1000):
+            with patch.object(collect_app_info, "HASH_SLOW_LANE_WORKERS", 1):
+                with self.running_pool(sizes) as (urls, output):
+                    # The slow lane holds the large artifact; the regular worker finishes the rest.
+                    self.assertEqual(self.pool.result(urls[1]), "0" * 64)
+                    self.assertEqual(self.pool.result(urls[2]), "0" * 64)
+                    self.assertNotIn(urls[0], self.hashed)
+
+        self.assertEqual(self.hashed[-1], urls[0])
+        self.assertEqual(self.pool.slow_jobs, 1)
+        self.assertIn("1 artifacts over", output.getvalue())
+
+    def test_artifacts_deferred_by_the_last_run_go_first(self):
+        sizes = {"first.dmg": 1, "small.dmg": 10, "large.dmg": 3000}
+
+        with patch.object(collect_app_info, "HASH_SLOW_LANE_BYTES", 0):
+            with patch.object(collect_app_info.deferred_work, "previous", {"https://example.com/small.dmg"}):
+                with self.running_pool(sizes):
+                    deadline = time.monotonic() + 5
+                    while self.pool.backlog() < 2 and time.monotonic() < deadline:
+                        time.sleep(0.01)
+
+        self.assertEqual(
+            [url.rsplit("/", 1)[1] for url in self.hashed],
+            ["first.dmg", "small.dmg", "large.dmg"],
+        )
+
+    def test_trusted_artifacts_are_not_probed(self):
+        url = "https://example.com/trusted.dmg"
+        probe = Mock(return_value=10)
+
+        with patch.object(collect_app_info, "HASH_MODE", "trust"):
+            with patch.dict(collect_app_info.published_hashes, {url: PUBLISHED_SHA}):
+                with patch.object(collect_app_info, "probe_size", probe):
+                    self.assertEqual(self.pool._size(url, None, None), 0)
+                    self.assertEqual(self.pool._size("https://example.com/other.dmg", None, None), 10)
+
+        probe.assert_called_once_with("https://example.com/other.dmg")
+
+    def test_expired_deadline_defers_without_probing(self):
+        deadline = collect_app_info.RunDeadline()
+        deadline.expires = time.monotonic() - 1
+        probe = Mock(return_value=10)
+        url = "https://example.com/late.dmg"
+
+        with patch.object(collect_app_info, "run_deadline", deadline):
+            with patch.object(collect_app_info, "probe_size", probe):
+                with patch.object(collect_app_info, "journaled_file_hash", self.journaled):
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        self.pool.start(1)
+                        try:
+                            self.pool.submit(url)
+                            with self.assertRaises(collect_app_info.DeadlineExceeded):
+                                self.pool.result(url)
+                        finally:
+                            self.pool.close()
+
+        probe.assert_not_called()
+        self.assertEqual(self.hashed, [])
+
+    def test_zero_workers_still_starts_one(self):
+        with patch.object(collect_app_info, "HASH_SLOW_LANE_BYTES", 0):
+            with self.running_pool({"small.dmg": 10}, workers=0) as (urls, _):
+                self.assertEqual(self.pool.result(urls[0]), "0" * 64)
+        self.assertEqual(self.pool.workers, 1)
+        self.assertEqual(self.hashed, [urls[0]])
+
+    def test_probe_size_falls_back_to_a_range_request(self):
+        ranged = Mock(status_code=206, headers={"Content-Range": "bytes 0-0/123456"})
+        get = Mock(return_value=ranged)
+
+        with patch.object(collect_app_info, "probe_content_length", Mock(return_value=None)):
+            with patch.object(collect_app_info.download_client, "get", get):
+                size = collect_app_info.probe_size("https://example.com/app.dmg")
+
+        self.assertEqual(size, 123456)
+        self.assertEqual(get.call_args.kwargs["headers"]["Range"], "bytes=0-0")
+        ranged.close.assert_called_once_with()
+
+    def test_probe_size_ignores_servers_without_range_support(self):
+        full = Mock(status_code=200, headers={"Content-Length": "999"})
+
+        with patch.object(collect_app_info, "probe_content_length", Mock(return_value=None)):
+            with patch.object(collect_app_info.download_client, "get", Mock(return_value=full)):
+                self.assertIsNone(collect_app_info.probe_size("https://example.com/app.dmg"))
+
+
+class CaskIndexTests(unittest.TestCase):
+    """One index request replaces the per-cask fetches it can answer."""
+
+    def setUp(self):
+        collect_app_info.cask_cache.clear()
+        del collect_app_info.filename_collisions[:]
+
+    def tearDown(self):
+        collect_app_info.cask_cache.clear()
+        del collect_app_info.filename_collisions[:]
+
+    def test_index_resolves_known_tokens_and_fetches_only_the_rest(self):
+        indexed_url = "https://formulae.brew.sh/api/cask/tailscale.json"
+        removed_url = "https://formulae.brew.sh/api/cask/removed-app.json"
+        formula_url = "https://formulae.brew.sh/api/formula/tailscale.json"
+        session = CountingSession(
+            {
+                collect_app_info.CASK_INDEX_URL: cask_response(
+                    [dict(TAILSCALE_PAYLOAD, token="tailscale")]
+                ),
+                removed_url: cask_response(status_code=404),
+                formula_url: cask_response({"name": ["formula"]}),
+            }
+        )
+
+        with patch.object(collect_app_info, "CASK_SOURCE", "index"):
+            with patch.object(collect_app_info, "cask_session", session):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    cache = collect_app_info.prefetch_cask_data(
+                        [indexed_url, removed_url, formula_url]
+                    )
+
+        self.assertEqual(cache[indexed_url]["version"], "1.80.0")
+        self.assertIsInstance(cache[removed_url], collect_app_info.CaskUnavailableError)
+        self.assertEqual(cache[formula_url], {"name": ["formula"]})
+        self.assertEqual(session.requested[0], collect_app_info.CASK_INDEX_URL)
+        self.assertEqual(sorted(session.requested[1:]), sorted([removed_url, formula_url]))
+
+    def test_unreachable_index_falls_back_to_per_cask_fetches(self):
+        url = "https://formulae.brew.sh/api/cask/tailscale.json"
+        session = CountingSession(
+            {
+                collect_app_info.CASK_INDEX_URL: cask_response(status_code=503),
+                url: cask_response(TAILSCALE_PAYLOAD),
+            }
+        )
+
+        with patch.object(collect_app_info, "CASK_SOURCE", "index"):
+            with patch.object(collect_app_info, "cask_session", session):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    cache = collect_app_info.prefetch_cask_data([url])
+
+        self.assertEqual(cache[url], TAILSCALE_PAYLOAD)
+        self.assertEqual(session.requested, [collect_app_info.CASK_INDEX_URL, url])
+
+
+class CaskHttpCacheTests(unittest.TestCase):
+    """Cask JSON is revalidated with stored validators instead of re-downloaded."""
+
+    url = "https://formulae.brew.sh/api/cask/tailscale.json"
+
+    def cache_in(self, directory, **kwargs):
+        cache = collect_app_info.CaskHttpCache(**kwargs)
+        cache.load(os.path.join(directory, collect_app_info.CASK_HTTP_CACHE_FILE))
+        return cache
+
+    def test_etag_is_stored_and_a_304_reuses_the_body(self):
+        with tempfile.TemporaryDirectory() as directory:
+            first = cask_response(TAILSCALE_PAYLOAD)
+            first.headers = {"ETag": '"v1"'}
+            session = CountingSession({self.url: first})
+            cache = self.cache_in(directory)
+
+            with patch.object(collect_app_info, "cask_session", session):
+                with patch.object(collect_app_info, "cask_http_cache", cache):
+                    collect_app_info.fetch_cask_data(self.url)
+            cache.save()
+
+            reloaded = self.cache_in(directory)
+            get = Mock(return_value=Mock(status_code=304))
+            with patch.object(collect_app_info, "cask_session", Mock(get=get)):
+                with patch.object(collect_app_info, "cask_http_cache", reloaded):
+                    data = collect_app_info.fetch_cask_data(self.url)
+
+            self.assertEqual(data, TAILSCALE_PAYLOAD)
+            self.assertEqual(get.call_args.kwargs["headers"], {"If-None-Match": '"v1"'})
+            self.assertEqual(reloaded.stats, {"hits": 1, "misses": 0, "not_modified": 1})
+            # Only the validators stay in memory; the body waits on disk for its 304.
+            self.assertNotIn("body", reloaded.entries[self.url])
+
+    def test_304_without_a_stored_body_fetches_again(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = self.cache_in(directory)
+            cache.entries[self.url] = {"etag": '"v1"', "used": 1}
+            fresh = cask_response(TAILSCALE_PAYLOAD)
+            fresh.headers = {"ETag": '"v2"'}
+            get = Mock(side_effect=[Mock(status_code=304), fresh])
+
+            with patch.object(collect_app_info, "cask_session", Mock(get=get)):
+                with patch.object(collect_app_info, "cask_http_cache", cache):
+                    data = collect_app_info.fetch_cask_data(self.url)
+
+            self.assertEqual(data, TAILSCALE_PAYLOAD)
+            self.assertEqual(get.call_args_list[1].kwargs, {})
+            self.assertEqual(cache.entries[self.url]["etag"], '"v2"')
+            self.assertTrue(os.path.exists(cache.body_path(self.url)))
+
+    def test_404_drops_the_entry_and_still_deprecates(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = self.cache_in(directory)
+            cache.entries[self.url] = {"etag": '"v1"', "body": TAILSCALE_PAYLOAD, "used": 1}
+            session = CountingSession({self.url: cask_response(status_code=404)})
+
+            with patch.object(collect_app_info, "cask_session", session):
+                with patch.object(collect_app_info, "cask_http_cache", cache):
+                    with self.assertRaises(collect_app_info.CaskUnavailableError):
+                        collect_app_info.fetch_cask_data(self.url)
+
+            self.assertNotIn(self.url, cache.entries)
+
+    def test_least_recently_used_entries_are_evicted_on_save(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = self.cache_in(directory, max_entries=2)
+            for used, token in enumerate(["old", "middle", "new"]):
+                cache.entries[f"https://formulae.brew.sh/api/cask/{token}.json"] = {
+                    "etag": f'"{token}"',
+                    "body": {},
+                    "used": used,
+                }
+            cache.save()
+
+            reloaded = self.cache_in(directory)
+            self.assertEqual(
+                sorted(reloaded.entries),
+                [
+                    "https://formulae.brew.sh/api/cask/middle.json",
+                    "https://formulae.brew.sh/api/cask/new.json",
+                ],
+            )
+
+    def test_corrupt_entries_are_dropped_on_load(self):
+        with tempfile.TemporaryDirectory() as directory:
+            entries = {
+                self.url: {"etag": '"v1"', "used": 1},
+                "https://formulae.brew.sh/api/cask/no-validator.json": {"body": {}, "used": 1},
+                "https://formulae.brew.sh/api/cask/bad-time.json": {"etag": '"v1"', "body": {}, "used": "now"},
+                "https://formulae.brew.sh/api/cask/not-a-dict.json": ["etag", "body"],
+            }
+            path = os.path.join(directory, collect_app_info.CASK_HTTP_CACHE_FILE)
+            Path(path).write_text(json.dumps({"version": 2, "entries": entries}), encoding="utf-8")
+
+            cache = self.cache_in(directory)
+            self.assertEqual(list(cache.entries), [self.url])
+
+    def test_evicted_and_discarded_entries_remove_their_body(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = self.cache_in(directory, max_entries=1)
+            response = Mock(headers={"ETag": '"v1"'})
+            urls = [f"https://formulae.brew.sh/api/cask/{token}.json" for token in ("old", "new", "gone")]
+            for used, url in enumerate(urls):
+                cache.store(url, response, {"token": url})
+                cache.entries[url]["used"] = used
+            cache.discard(urls[2])
+            cache.save()
+
+            self.assertEqual(list(cache.entries), [urls[1]])
+            self.assertEqual(
+                os.listdir(cache.bodies_dir), [os.path.basename(cache.body_path(urls[1]))]
+            )
+
+
 def download_response(body=b"", status_code=200):
     """Build a fake streaming response for one calculate_file_hash attempt."""
     response = Mock(status_code=status_code)
@@ -509,27 +1913,19 @@ def download_response(body=b"", status_code=200):
 
 
 class CalculateFileHashTests(unittest.TestCase):
-    """The agent cascade mirrors ATTEMPTS in check_download_urls.py."""
+    """The download agent cascade and the per-host agent table."""
 
-    def test_agents_stay_in_sync_with_the_url_health_checker(self):
-        spec = importlib.util.spec_from_file_location(
-            "check_download_urls", ROOT / ".github/scripts/check_download_urls.py"
-        )
-        health_check = importlib.util.module_from_spec(spec)
-        spec.loader.exec_module(health_check)
-
-        sibling_agents = []
-        for attempt in health_check.ATTEMPTS:
-            if attempt["user_agent"] not in sibling_agents:
-                sibling_agents.append(attempt["user_agent"])
-
-        self.assertEqual(list(collect_app_info.DOWNLOAD_USER_AGENTS), sibling_agents)
+    def setUp(self):
+        # A host learned by one test must not reorder the agents of the next.
+        patcher = patch.object(collect_app_info, "agent_table", collect_app_info.AgentTable())
+        patcher.start()
+        self.addCleanup(patcher.stop)
 
     def test_request_carries_a_user_agent_header(self):
         payload = b"payload bytes"
         get = Mock(return_value=download_response(payload))
 
-        with patch.object(collect_app_info.requests, "get", get):
+        with patch.object(collect_app_info.download_client, "get", get):
             digest = collect_app_info.calculate_file_hash("https://example.test/app.dmg")
 
         self.assertEqual(digest, hashlib.sha256(payload).hexdigest())
@@ -547,7 +1943,7 @@ class CalculateFileHashTests(unittest.TestCase):
         ]
         get = Mock(side_effect=responses)
 
-        with patch.object(collect_app_info.requests, "get", get):
+        with patch.object(collect_app_info.download_client, "get", get):
             digest = collect_app_info.calculate_file_hash("https://example.test/app.dmg")
 
         # The rejection is retried, not swallowed, and the digest is the real file's.
@@ -559,7 +1955,7 @@ class CalculateFileHashTests(unittest.TestCase):
     def test_every_agent_rejected_yields_no_hash(self):
         get = Mock(side_effect=lambda *a, **kw: download_response(status_code=403))
 
-        with patch.object(collect_app_info.requests, "get", get):
+        with patch.object(collect_app_info.download_client, "get", get):
             digest = collect_app_info.calculate_file_hash("https://example.test/app.dmg")
 
         self.assertIsNone(digest)
@@ -574,7 +1970,7 @@ class CalculateFileHashTests(unittest.TestCase):
             ]
         )
 
-        with patch.object(collect_app_info.requests, "get", get):
+        with patch.object(collect_app_info.download_client, "get", get):
             digest = collect_app_info.calculate_file_hash("https://example.test/app.dmg")
 
         self.assertEqual(digest, hashlib.sha256(payload).hexdigest())
@@ -584,7 +1980,7 @@ class CalculateFileHashTests(unittest.TestCase):
             side_effect=lambda *a, **kw: download_response(b"<html>blocked</html>")
         )
 
-        with patch.object(collect_app_info.requests, "get", get):
+        with patch.object(collect_app_info.download_client, "get", get):
             digest = collect_app_info.calculate_file_hash("https://example.test/app.dmg")
 
         self.assertIsNone(digest)
@@ -592,17 +1988,32 @@ class CalculateFileHashTests(unittest.TestCase):
     def test_empty_body_is_refused_after_every_agent(self):
         get = Mock(side_effect=lambda *a, **kw: download_response(b""))
 
-        with patch.object(collect_app_info.requests, "get", get):
+        with patch.object(collect_app_info.download_client, "get", get):
             digest = collect_app_info.calculate_file_hash("https://example.test/app.dmg")
 
         self.assertIsNone(digest)
         self.assertEqual(get.call_count, len(collect_app_info.DOWNLOAD_USER_AGENTS))
 
+    def test_chunks_are_hashed_as_they_stream(self):
+        chunks = [b"first chunk ", b"", b"second chunk ", b"third chunk"]
+        response = download_response(b"unused")
+        response.iter_content.return_value = iter(chunks)
+        get = Mock(return_value=response)
+
+        with patch.object(collect_app_info.download_client, "get", get):
+            digest = collect_app_info.calculate_file_hash("https://example.test/app.dmg")
+
+        self.assertEqual(digest, hashlib.sha256(b"".join(chunks)).hexdigest())
+        response.iter_content.assert_called_once_with(
+            chunk_size=collect_app_info.DOWNLOAD_CHUNK_BYTES
+        )
+        response.close.assert_called_once()
+
     def test_oversized_body_aborts_without_trying_more_agents(self):
         get = Mock(side_effect=lambda *a, **kw: download_response(b"x" * 64))
 
         with patch.object(collect_app_info, "MAX_DOWNLOAD_BYTES", 8):
-            with patch.object(collect_app_info.requests, "get", get):
+            with patch.object(collect_app_info.download_client, "get", get):
                 digest = collect_app_info.calculate_file_hash(
                     "https://example.test/app.dmg"
                 )
@@ -611,6 +2022,374 @@ class CalculateFileHashTests(unittest.TestCase):
         self.assertEqual(get.call_count, 1)
 
 
+class DownloadClientTests(unittest.TestCase):
+    def serve(self, payload, delay=0.0):
+        """A keep-alive HTTP/1.1 server on localhost answering every GET with payload,
+        and every HEAD with its length, after delay seconds."""
+
+        class Handler(http.server.BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                self.do_HEAD()
+                self.wfile.write(payload)
+
+            def do_HEAD(self):
+                time.sleep(delay)
+                self.send_response(200)
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+
+            def log_message(self, *args):
+                pass
+
+        server = http.server.ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        self.addCleanup(server.server_close)
+        self.addCleanup(server.shutdown)
+        return f"http://127.0.0.1:{server.server_address[1]}"
+
+    def test_downloads_from_one_host_reuse_a_connection(self):
+        payload = b"installer bytes"
+        base_url = self.serve(payload)
+        client = collect_app_info.DownloadClient(pool_size=2)
+
+        with patch.object(collect_app_info, "download_client", client):
+            with contextlib.redirect_stdout(io.StringIO()):
+                digests = [
+                    collect_app_info.calculate_file_hash(f"{base_url}/first.dmg"),
+                    collect_app_info.calculate_file_hash(f"{base_url}/second.pkg"),
+                ]
+
+        self.assertEqual(digests, [hashlib.sha256(payload).hexdigest()] * 2)
+        self.assertEqual(client.reuse_stats(), {"127.0.0.1": (2, 1)})
+
+    def test_counts_survive_pool_eviction(self):
+        first_url = self.serve(b"first")
+        second_url = self.serve(b"second")
+        client = collect_app_info.DownloadClient()
+
+        # One pool per session: every switch of server evicts the other's pool.
+        with patch.object(collect_app_info, "DOWNLOAD_POOL_HOSTS", 1):
+            for base_url in (first_url, second_url, first_url):
+                client.get(f"{base_url}/app.dmg").close()
+
+        self.assertEqual(client.reuse_stats(), {"127.0.0.1": (3, 3)})
+
+    def test_pool_holds_every_probe_and_worker_at_once(self):
+        base_url = self.serve(b"installer bytes", delay=0.2)
+        client = collect_app_info.DownloadClient()
+        threads = client.pool_size
+        self.assertGreaterEqual(
+            threads,
+            collect_app_info.HASH_WORKERS
+            + collect_app_info.HASH_SLOW_LANE_WORKERS
+            + collect_app_info.HASH_PROBE_WORKERS
+            + collect_app_info.TRUSTED_SIZE_PROBE_WORKERS,
+        )
+
+        def probe(index):
+            client.head(f"{base_url}/app-{index}.dmg").close()
+
+        # Two rounds of every thread probing at once: the second finds all the
+        # connections of the first back in the pool instead of discarded.
+        with self.assertNoLogs("urllib3.connectionpool", level="WARNING"):
+            with ThreadPoolExecutor(max_workers=threads) as executor:
+                for _ in range(2):
+                    list(executor.map(probe, range(threads)))
+
+        self.assertEqual(client.reuse_stats(), {"127.0.0.1": (2 * threads, threads)})
+        client.close()
+
+    def test_close_releases_every_session_and_keeps_the_counts(self):
+        base_url = self.serve(b"installer bytes")
+        client = collect_app_info.DownloadClient()
+        client.get(f"{base_url}/app.dmg").close()
+        session = client.session_for("127.0.0.1")
+
+        with patch.object(session, "close", wraps=session.close) as close:
+            client.close()
+
+        close.assert_called_once_with()
+        self.assertIsNot(client.session_for("127.0.0.1"), session)
+        self.assertEqual(client.reuse_stats(), {"127.0.0.1": (1, 1)})
+
+    def test_report_lists_reuse_per_host(self):
+        client = collect_app_info.DownloadClient()
+        stats = {"dl.google.com": (5, 2), "github.com": (1, 1)}
+
+        output = io.StringIO()
+        with patch.object(client, "reuse_stats", Mock(return_value=stats)):
+            with contextlib.redirect_stdout(output):
+                client.report()
+
+        self.assertIn("6 requests over 3 connections to 2 hosts", output.getvalue())
+        self.assertIn("dl.google.com: 5 requests, 2 connections, 3 reused", output.getvalue())
+
+
+class AgentTableTests(unittest.TestCase):
+    url = "https://www.hopperapp.com/downloader/Hopper.dmg"
+
+    def setUp(self):
+        self.table = collect_app_info.AgentTable()
+        patcher = patch.object(collect_app_info, "agent_table", self.table)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_last_winning_agent_is_tried_first(self):
+        browser = collect_app_info.DOWNLOAD_USER_AGENTS[2]
+        get = Mock(
+            side_effect=[
+                download_response(status_code=403),
+                download_response(status_code=403),
+                download_response(b"installer"),
+                download_response(b"installer"),
+            ]
+        )
+
+        with patch.object(collect_app_info.download_client, "get", get):
+            with contextlib.redirect_stdout(io.StringIO()):
+                collect_app_info.calculate_file_hash(self.url)
+                collect_app_info.calculate_file_hash("https://www.hopperapp.com/other.dmg")
+
+        used_agents = [call.kwargs["headers"]["User-Agent"] for call in get.call_args_list]
+        self.assertEqual(used_agents, list(collect_app_info.DOWNLOAD_USER_AGENTS) + [browser])
+
+    def test_default_agent_winning_drops_the_entry(self):
+        self.table.record(self.url, "curl/8.4.0", collect_app_info.DOWNLOAD_USER_AGENTS[0])
+        self.table.record(self.url, collect_app_info.DOWNLOAD_USER_AGENTS[0], collect_app_info.DOWNLOAD_USER_AGENTS[0])
+
+        self.assertEqual(self.table.hosts, {})
+
+    def test_table_round_trips_and_stale_entries_age_out(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "cache", collect_app_info.AGENT_TABLE_FILE)
+            self.table.load(path)
+            self.table.record(self.url, "curl/8.4.0", collect_app_info.DOWNLOAD_USER_AGENTS[0])
+            self.table.hosts["old.example.test"] = {"agent": "curl/8.4.0", "seen": 0}
+            self.table.save()
+
+            reloaded = collect_app_info.AgentTable()
+            reloaded.load(path)
+
+        self.assertEqual(reloaded.preferred(self.url), "curl/8.4.0")
+        self.assertEqual(list(reloaded.hosts), ["www.hopperapp.com"])
+
+
+class HashStageTests(unittest.TestCase):
+    """Digests are computed in a pool as cask documents arrive and consumed by the ordered loops."""
+
+    def setUp(self):
+        del collect_app_info.filename_collisions[:]
+
+    def tearDown(self):
+        del collect_app_info.filename_collisions[:]
+
+    def test_pending_urls_follow_the_loop_hash_rules(self):
+        cask_url = "https://formulae.brew.sh/api/cask/tailscale.json"
+        archive_url = "https://formulae.brew.sh/api/cask/tailscale-app.json"
+        with tempfile.TemporaryDirectory() as directory:
+            with patch.object(collect_app_info, "get_homebrew_app_info", fake_get_homebrew_app_info):
+                with patch.object(collect_app_info, "homebrew_cask_urls", [cask_url]):
+                    with patch.object(collect_app_info, "pkg_urls", []):
+                        with patch.object(collect_app_info, "app_urls", [archive_url]):
+                            # A new cask app needs a digest, a new archive app does not.
+                            self.assertEqual(
+                                collect_app_info.pending_hash_urls(directory),
+                                [CASK_INFO[cask_url]["url"]],
+                            )
+
+                            Path(directory, "tailscale.json").write_text(
+                                json.dumps(dict(CASK_INFO[cask_url], sha="0" * 64)),
+                                encoding="utf-8",
+                            )
+                            self.assertEqual(collect_app_info.pending_hash_urls(directory), [])
+
+    def test_loop_consumes_the_prefetched_digest(self):
+        with tempfile.TemporaryDirectory() as directory:
+            os.makedirs(os.path.join(directory, "Apps"))
+            url = "https://formulae.brew.sh/api/cask/tailscale.json"
+
+            with run_collector(directory, [url]):
+                collect_app_info.main()
+                download = collect_app_info.calculate_file_hash
+
+            download.assert_called_once_with(CASK_INFO[url]["url"])
+            app_data = json.loads(
+                (Path(directory) / "Apps" / "tailscale.json").read_text(encoding="utf-8")
+            )
+            self.assertEqual(app_data["sha"], "0" * 64)
+
+    def test_bandwidth_limiter_paces_shared_budget(self):
+        limiter = collect_app_info.BandwidthLimiter(bytes_per_second=1000)
+        sleep = Mock()
+
+        with patch.object(collect_app_info.time, "sleep", sleep):
+            limiter.consume(500)
+            limiter.consume(500)
+
+        delays = [call.args[0] for call in sleep.call_args_list]
+        self.assertEqual(len(delays), 2)
+        self.assertAlmostEqual(delays[0], 0.5, places=2)
+        self.assertAlmostEqual(delays[1], 1.0, places=2)
+
+    def test_unlimited_limiter_never_sleeps(self):
+        sleep = Mock()
+
+        with patch.object(collect_app_info.time, "sleep", sleep):
+            collect_app_info.BandwidthLimiter(bytes_per_second=0).consume(10 ** 9)
+
+        sleep.assert_not_called()
+
+
+PUBLISHED_SHA = "ab" * 32
+
+
+class TrustedHashTests(unittest.TestCase):
+    """Homebrew's published sha256 replaces the download when it matches the url."""
+
+    def setUp(self):
+        collect_app_info.cask_cache.clear()
+        collect_app_info.published_hashes.clear()
+        collect_app_info.hash_cache.clear()
+        collect_app_info.download_flights.reset()
+        collect_app_info.probe_flights.reset()
+        collect_app_info.hash_stats.update(collect_app_info.HASH_STATS_INITIAL)
+        collect_app_info.artifact_sizes.clear()
+        collect_app_info.trusted_urls.clear()
+
+    def tearDown(self):
+        collect_app_info.cask_cache.clear()
+        collect_app_info.published_hashes.clear()
+        collect_app_info.hash_cache.clear()
+        collect_app_info.download_flights.reset()
+        collect_app_info.probe_flights.reset()
+        collect_app_info.hash_stats.update(collect_app_info.HASH_STATS_INITIAL)
+        collect_app_info.artifact_sizes.clear()
+        collect_app_info.trusted_urls.clear()
+
+    def app_info_for(self, payload):
+        url = "https://formulae.brew.sh/api/cask/tailscale.json"
+        collect_app_info.cask_cache[url] = payload
+        return collect_app_info.get_homebrew_app_info(url)
+
+    def test_published_hash_is_used_without_downloading(self):
+        app_info = self.app_info_for(dict(TAILSCALE_PAYLOAD, sha256=PUBLISHED_SHA))
+        head = Mock()
+        download = Mock()
+
+        with patch.object(collect_app_info, "HASH_AUDIT_RATE", 0):
+            with patch.object(collect_app_info.download_client, "head", head):
+                with patch.object(collect_app_info, "calculate_file_hash", download):
+                    with contextlib.redirect_stdout(io.StringIO()):
+                        digest = collect_app_info.resolve_file_hash(app_info["url"])
+
+        self.assertEqual(digest, PUBLISHED_SHA)
+        download.assert_not_called()
+        head.assert_not_called()
+        self.assertEqual(collect_app_info.hash_stats["trusted"], 1)
+
+    def test_pool_reports_the_size_of_trusted_artifacts_aside(self):
+        app_info = self.app_info_for(dict(TAILSCALE_PAYLOAD, sha256=PUBLISHED_SHA))
+        head = Mock(return_value=Mock(status_code=200, headers={"Content-Length": "2048"}))
+        download = Mock()
+        pool = collect_app_info.HashPool()
+
+        with patch.object(collect_app_info, "HASH_AUDIT_RATE", 0):
+            with patch.object(collect_app_info.download_client, "head", head):
+                with patch.object(collect_app_info, "calculate_file_hash", download):
+                    with contextlib.redirect_stdout(io.StringIO()) as output:
+                        pool.start(1)
+                        pool.submit(app_info["url"])
+                        digest = pool.result(app_info["url"])
+                        pool.close()
+                        collect_app_info.report_hash_stats()
+
+        self.assertEqual(digest, PUBLISHED_SHA)
+        download.assert_not_called()
+        self.assertEqual(collect_app_info.trusted_bytes_avoided(), (2048, 0))
+        self.assertIn("Avoided by trust     : 0.0 MiB\n", output.getvalue())
+
+    def test_inline_trusted_artifacts_count_as_unknown_size(self):
+        app_info = self.app_info_for(dict(TAILSCALE_PAYLOAD, sha256=PUBLISHED_SHA))
+
+        with patch.object(collect_app_info, "HASH_AUDIT_RATE", 0):
+            with contextlib.redirect_stdout(io.StringIO()) as output:
+                collect_app_info.resolve_file_hash(app_info["url"])
+                collect_app_info.report_hash_stats()
+
+        self.assertEqual(collect_app_info.trusted_bytes_avoided(), (0, 1))
+        self.assertIn("(+1 artifacts of unknown size)", output.getvalue())
+
+    def test_seeded_audit_sample_is_repeatable(self):
+        app_info = self.app_info_for(dict(TAILSCALE_PAYLOAD, sha256=PUBLISHED_SHA))
+        download = Mock(return_value=PUBLISHED_SHA)
+
+        def audited_runs():
+            collect_app_info.audit_random.seed(7)
+            audited = []
+            for _ in range(20):
+                collect_app_info.download_flights.reset()
+                collect_app_info.hash_stats.update(collect_app_info.HASH_STATS_INITIAL)
+                collect_app_info.resolve_file_hash(app_info["url"])
+                audited.append(collect_app_info.hash_stats["audited"])
+            return audited
+
+        with patch.object(collect_app_info, "HASH_AUDIT_RATE", 0.5):
+            with patch.object(collect_app_info, "calculate_file_hash", download):
+                with contextlib.redirect_stdout(io.StringIO()):
+                    first = audited_runs()
+                    second = audited_runs()
+
+        self.assertEqual(first, second)
+        self.assertIn(0, first)
+        self.assertIn(1, first)
+
+    def test_no_check_cask_is_downloaded(self):
+        app_info = self.app_info_for(dict(TAILSCALE_PAYLOAD, sha256="no_check"))
+        download = Mock(return_value="0" * 64)
+
+        with patch.object(collect_app_info, "calculate_file_hash", download):
+            digest = collect_app_info.resolve_file_hash(app_info["url"])
+
+        self.assertEqual(digest, "0" * 64)
+        download.assert_called_once_with(app_info["url"])
+
+    def test_rewritten_url_is_not_trusted(self):
+        payload = dict(
+            TAILSCALE_PAYLOAD,
+            name=["Warp"],
+            version="0.2025.01.01",
+            url="https://app.warp.dev/download",
+            sha256=PUBLISHED_SHA,
+        )
+        app_info = self.app_info_for(payload)
+
+        self.assertEqual(
+            app_info["url"], "https://releases.warp.dev/stable/v0.2025.01.01/Warp.dmg"
+        )
+        self.assertEqual(collect_app_info.published_hashes, {})
+
+    def test_audit_mismatch_revokes_trust_for_the_rest_of_the_run(self):
+        app_info = self.app_info_for(dict(TAILSCALE_PAYLOAD, sha256=PUBLISHED_SHA))
+        download = Mock(return_value="cd" * 32)
+
+        with patch.object(collect_app_info, "calculate_file_hash", download):
+            with contextlib.redirect_stdout(io.StringIO()):
+                with patch.object(collect_app_info, "HASH_AUDIT_RATE", 1):
+                    audited = collect_app_info.resolve_file_hash(app_info["url"])
+                with patch.object(collect_app_info, "HASH_AUDIT_RATE", 0):
+                    after = collect_app_info.resolve_file_hash(app_info["url"])
+
+        self.assertEqual(audited, "cd" * 32)
+        self.assertEqual(after, "cd" * 32)
+        # The second lookup shares the audit's download instead of repeating it.
+        self.assertEqual(download.call_count, 1)
+        self.assertTrue(collect_app_info.hash_stats["trust_revoked"])
+        self.assertEqual(collect_app_info.hash_stats["audit_failures"], 1)
+
+
 class CatalogConsistencyTests(unittest.TestCase):
     def test_codex_uses_desktop_cask_instead_of_cli_cask(self):
         desktop_url = "https://formulae.brew.sh/api/cask/codex-app.json"